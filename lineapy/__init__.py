@@ -4,17 +4,18 @@ from lineapy.api.api import (
     artifact_store,
     create_pipeline,
     delete,
+    export_session,
     get,
     get_function,
     get_module_definition,
     get_pipeline,
+    import_session,
     reload,
     save,
     to_pipeline,
 )
 from lineapy.data.graph import Graph
 from lineapy.data.types import SessionType, ValueType
-from lineapy.editors.ipython import start, stop, visualize
 from lineapy.execution.context import get_context
 from lineapy.instrumentation.tracer import Tracer
 from lineapy.utils.analytics.usage_tracking import tag
@@ -32,6 +33,8 @@ __all__ = [
     "get_module_definition",
     "artifact_store",
     "delete",
+    "export_session",
+    "import_session",
     "reload",
     "to_pipeline",
     "create_pipeline",
@@ -53,14 +56,28 @@ __all__ = [
 
 
 def load_ipython_extension(ipython):
+    from lineapy.editors.ipython import start, stop
+
     atexit.register(stop)
     start(ipython=ipython)
 
 
 def unload_ipython_extension(ipython):
+    from lineapy.editors.ipython import stop
+
     stop()
 
 
+def __getattr__(name: str):
+    # The IPython integration is only imported when it is first used, since
+    # importing IPython takes longer than importing the rest of lineapy
+    if name in ("start", "stop", "visualize"):
+        from lineapy.editors import ipython
+
+        return getattr(ipython, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def _is_executing() -> bool:
     try:
         get_context()
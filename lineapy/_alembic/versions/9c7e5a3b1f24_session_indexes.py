@@ -0,0 +1,35 @@
+"""session_indexes
+
+Revision ID: 9c7e5a3b1f24
+Revises: 07d0db31e15f
+Create Date: 2026-10-18 19:05:12.481532
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9c7e5a3b1f24"
+down_revision = "07d0db31e15f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f("ix_node_session_id"), "node", ["session_id"], unique=False
+    )
+    op.create_index(
+        "ix_source_code_jupyter_session_id_execution_count",
+        "source_code",
+        ["jupyter_session_id", "jupyter_execution_count"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_source_code_jupyter_session_id_execution_count",
+        table_name="source_code",
+    )
+    op.drop_index(op.f("ix_node_session_id"), table_name="node")
@@ -18,6 +18,8 @@ from lineapy.api.models.linea_artifact import (
 from lineapy.api.models.linea_artifact_store import LineaArtifactStore
 from lineapy.api.models.pipeline import Pipeline
 from lineapy.data.types import ARTIFACT_STORAGE_BACKEND, Artifact, NodeValue
+from lineapy.db.session_export import export_session as _export_session
+from lineapy.db.session_export import import_session as _import_session
 from lineapy.db.utils import parse_artifact_version
 from lineapy.exceptions.user_exception import UserException
 from lineapy.execution.context import get_context
@@ -71,9 +73,12 @@ def save(
         The name is used for later retrieving the artifact and creating new versions if an artifact of the name has been created before.
     storage_backend: Optional[ARTIFACT_STORAGE_BACKEND]
         The storage backend used to save the artifact. Currently support
-        lineapy and mlflow(for mlflow supported model flavors). In case of
-        mlflow, lineapy will use `mlflow.sklearn.log_model` or other supported
-        flavors equivalent to save artifacts into mlflow.
+        lineapy, mlflow(for mlflow supported model flavors) and columnar(for
+        numpy arrays and pandas DataFrames). In case of mlflow, lineapy will
+        use `mlflow.sklearn.log_model` or other supported flavors equivalent
+        to save artifacts into mlflow. In case of columnar, arrays are saved
+        as ``.npy`` and DataFrames as Arrow IPC files, which are
+        memory-mapped when the value is read back.
     **kwargs:
         Keyword arguments passed into underlying storage mechanism to overwrite
         default behavior. For `storage_backend='mlflow'`, this can overwrite
@@ -89,6 +94,8 @@ def save(
     execution_context = get_context()
     executor = execution_context.executor
     db = executor.db
+    # make sure the nodes traced so far are persisted before saving on them
+    db.flush_writes()
     call_node = execution_context.node
 
     # If this value is stored as a global in the executor (meaning its an external side effect)
@@ -231,7 +238,10 @@ def delete(artifact_name: str, version: Union[int, str]) -> None:
     except ValueError:
         logging.debug(f"No valid storage path found for {node_id}")
 
-    if lineapy_metadata.storage_backend == ARTIFACT_STORAGE_BACKEND.lineapy:
+    if lineapy_metadata.storage_backend in (
+        ARTIFACT_STORAGE_BACKEND.lineapy,
+        ARTIFACT_STORAGE_BACKEND.columnar,
+    ):
         storage_path = lineapy_metadata.storage_path
         pickled_path = (
             str(options.safe_get("artifact_storage_dir")).rstrip("/")
@@ -277,6 +287,7 @@ def get(artifact_name: str, version: Optional[int] = None) -> LineaArtifact:
 
     execution_context = get_context()
     db = execution_context.executor.db
+    db.flush_writes()
     artifactorm = db.get_artifactorm_by_name(artifact_name, final_version)
     linea_artifact = LineaArtifact(
         db=db,
@@ -366,6 +377,49 @@ def artifact_store() -> LineaArtifactStore:
     return cat
 
 
+def export_session(
+    path: Union[str, Path], session_id: Optional[str] = None
+) -> None:
+    """
+    Writes a session, with its artifacts' metadata, to a single file, which
+    can be added to another LineaPy DB with `import_session`.
+
+    The artifact values are not included, the artifact storage has to be
+    shared or copied separately.
+
+    Parameters
+    ----------
+    path: Union[str, Path]
+        file to write the session to
+    session_id: Optional[str]
+        session to export, defaults to the current session
+    """
+    execution_context = get_context()
+    if session_id is None:
+        session_id = execution_context.node.session_id
+    _export_session(execution_context.executor.db, session_id, path)
+
+
+def import_session(path: Union[str, Path]) -> str:
+    """
+    Adds a session written by `export_session` to the DB, so its artifacts
+    can be retrieved with `get`.
+
+    Parameters
+    ----------
+    path: Union[str, Path]
+        file the session was exported to
+
+    Returns
+    -------
+    str
+        the ID of the imported session
+    """
+    execution_context = get_context()
+    export = _import_session(execution_context.executor.db, path)
+    return export.session_context.id
+
+
 # TODO - this piece needs to test more than just the output of jupyter cell.
 # we need to ensure all the required files (python module and the dag file) get written to the right place.
 def to_pipeline(
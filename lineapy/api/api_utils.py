@@ -5,12 +5,13 @@ import warnings
 from pathlib import Path
 
 import cloudpickle
-from pandas.io.common import get_handle
 
+from lineapy.api.chunk_store import read_chunked_pickle
 from lineapy.db.db import RelationalLineaDB
 from lineapy.utils.analytics.event_schemas import ErrorType, ExceptionEvent
 from lineapy.utils.analytics.usage_tracking import track
 from lineapy.utils.config import options
+from lineapy.utils.constants import ARTIFACT_MANIFEST_SUFFIX
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +70,10 @@ def to_pickle(
     filepath_or_buffer,
     storage_options=None,
 ):
+    # pandas is only imported when an artifact is saved, to not slow down
+    # `import lineapy`
+    from pandas.io.common import get_handle
+
     with get_handle(
         filepath_or_buffer,
         "wb",
@@ -94,7 +99,8 @@ def to_pickle(
 
 def read_pickle(pickle_filename):
     """
-    Read pickle file from artifact storage dir
+    Read pickle file from artifact storage dir, or reassemble the value
+    from the chunk store if the file is a manifest
     """
     # TODO - set unicode etc here
     artifact_storage_dir = options.safe_get("artifact_storage_dir")
@@ -107,6 +113,12 @@ def read_pickle(pickle_filename):
         logger.debug(
             f"Retriving pickle file from {filepath} ",
         )
+        if str(pickle_filename).endswith(ARTIFACT_MANIFEST_SUFFIX):
+            return read_chunked_pickle(
+                pickle_filename,
+                artifact_storage_dir,
+                storage_options=options.get("storage_options"),
+            )
         return _try_pickle_read(
             filepath, storage_options=options.get("storage_options")
         )
@@ -121,6 +133,7 @@ def read_pickle(pickle_filename):
 
 
 def _try_pickle_read(filepath_or_buffer, storage_options=None):
+    from pandas.io.common import get_handle
 
     with get_handle(
         filepath_or_buffer,
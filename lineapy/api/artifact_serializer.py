@@ -4,13 +4,19 @@ from pathlib import Path
 from typing import Any, Dict, Optional
 
 from lineapy.api.api_utils import to_pickle
+from lineapy.api.chunk_store import to_chunked_pickle
 from lineapy.data.types import ARTIFACT_STORAGE_BACKEND, LineaID
 from lineapy.exceptions.db_exceptions import ArtifactSaveException
+from lineapy.plugins.serializers.columnar_io import (
+    columnar_suffix,
+    try_write_to_columnar,
+)
 from lineapy.plugins.serializers.mlflow_io import try_write_to_mlflow
 from lineapy.plugins.utils import slugify
 from lineapy.utils.analytics.event_schemas import ErrorType, ExceptionEvent
 from lineapy.utils.analytics.usage_tracking import track
 from lineapy.utils.config import options
+from lineapy.utils.constants import ARTIFACT_MANIFEST_SUFFIX
 from lineapy.utils.logging_config import configure_logging
 
 logger = logging.getLogger(__name__)
@@ -29,14 +35,18 @@ def serialize_artifact(
     Serialize artifact using various backend.
 
     Currently, most objects are using lineapy as the backend for serialization.
-    The only exception is mlflow supported model flavors. In order to use
-    mlflow for ml model serialization, following conditions need to be
-    satisified:
+    The exceptions are mlflow supported model flavors and columnar data. In
+    order to use mlflow for ml model serialization, following conditions need
+    to be satisified:
     1. the artifact(ML model) should be a mlflow supported flavor
     2. mlflow is installed
     3. storage_backend should be mlflow or storage_backend is None and
     `options.get("default_ARTIFACT_STORAGE_BACKEND")=='mlflow'`
 
+    Numpy arrays and pandas DataFrames (with pyarrow installed) are saved in
+    a columnar format, to be memory-mapped when read back, if storage_backend
+    is columnar. Other values fall back to lineapy.
+
     Parameters
     ----------
     value_node_id: LineaID
@@ -67,7 +77,20 @@ def serialize_artifact(
                 "metadata": model_info,
             }
 
-    pickle_name = _pickle_name(value_node_id, execution_id)
+    if storage_backend == ARTIFACT_STORAGE_BACKEND.columnar:
+        suffix = columnar_suffix(reference)
+        if suffix is not None:
+            columnar_name = _columnar_name(value_node_id, execution_id, suffix)
+            if try_write_to_columnar(reference, columnar_name):
+                return {
+                    "backend": "columnar",
+                    "metadata": {"pickle_name": columnar_name},
+                }
+
+    if str(options.get("artifact_storage_dedup")).lower() == "true":
+        pickle_name = _manifest_name(value_node_id, execution_id)
+    else:
+        pickle_name = _pickle_name(value_node_id, execution_id)
     _try_write_to_pickle(reference, pickle_name)
     return {
         "backend": "lineapy",
@@ -112,10 +135,30 @@ def _pickle_name(node_id: LineaID, execution_id: LineaID) -> str:
     return f"pre-{slugify(hash(node_id + execution_id))}-post.pkl"
 
 
+def _manifest_name(node_id: LineaID, execution_id: LineaID) -> str:
+    """
+    Manifest file for a value saved to the content-addressed store, named
+    like its pickle file.
+    """
+    return f"pre-{slugify(hash(node_id + execution_id))}-post{ARTIFACT_MANIFEST_SUFFIX}"
+
+
+def _columnar_name(
+    node_id: LineaID, execution_id: LineaID, suffix: str
+) -> str:
+    """
+    File for a value saved in a columnar format, named like its pickle file.
+    """
+    return f"pre-{slugify(hash(node_id + execution_id))}-post{suffix}"
+
+
 def _try_write_to_pickle(value: object, filename: str) -> None:
     """
     Saves the value to a random file inside linea folder. This file path is returned and eventually saved to the db.
 
+    If the filename is a manifest name, the value is written to the
+    content-addressed chunk store instead.
+
     :param value: data to pickle
     :param filename: name of pickle file
     """
@@ -133,9 +176,19 @@ def _try_write_to_pickle(value: object, filename: str) -> None:
     )
     try:
         logger.debug(f"Saving file to {filepath} ")
-        to_pickle(
-            value, filepath, storage_options=options.get("storage_options")
-        )
+        if filename.endswith(ARTIFACT_MANIFEST_SUFFIX):
+            to_chunked_pickle(
+                value,
+                filename,
+                artifact_storage_dir,
+                storage_options=options.get("storage_options"),
+            )
+        else:
+            to_pickle(
+                value,
+                filepath,
+                storage_options=options.get("storage_options"),
+            )
     except Exception as e:
         # Don't see an easy way to catch all possible exceptions from the to_pickle, so just catch everything for now
         logger.error(e)
@@ -0,0 +1,161 @@
+"""
+Content-addressed storage for pickled artifact values.
+
+The pickle stream of a value is cut into fixed size chunks, and every chunk
+is stored once, under the sha256 digest of its content, in the
+``ARTIFACT_CHUNK_DIR`` folder of the artifact storage dir. The artifact itself
+is stored as a small JSON manifest that lists its chunks in order. Saving a
+value that is already stored (or that shares leading chunks with one) only
+writes the new manifest and the chunks that are missing.
+
+Chunks are never deleted along with a manifest, since other artifacts may
+still refer to them.
+"""
+import hashlib
+import json
+import pickle
+import uuid
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import cloudpickle
+import fsspec
+from fsspec import AbstractFileSystem
+
+from lineapy.data.types import FilePath
+from lineapy.utils.constants import (
+    ARTIFACT_CHUNK_DIR,
+    ARTIFACT_CHUNK_READ_WORKERS,
+    ARTIFACT_CHUNK_SIZE,
+)
+
+MANIFEST_VERSION = 1
+HASH_ALGORITHM = "sha256"
+
+
+def to_chunked_pickle(
+    value: object,
+    manifest_filename: str,
+    storage_dir: FilePath,
+    storage_options: Optional[Dict[str, Any]] = None,
+    chunk_size: int = ARTIFACT_CHUNK_SIZE,
+) -> None:
+    """
+    Pickle ``value`` into content-addressed chunks and write its manifest
+    to ``manifest_filename`` inside ``storage_dir``.
+    """
+    fs, root = _get_fs(storage_dir, storage_options)
+    try:
+        writer = _ChunkWriter(fs, root, chunk_size)
+        cloudpickle.dump(value, writer, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        writer = _ChunkWriter(fs, root, chunk_size)
+        pickle.dump(value, writer, protocol=pickle.HIGHEST_PROTOCOL)
+    writer.close()
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "algorithm": HASH_ALGORITHM,
+        "size": writer.size,
+        "chunks": writer.digests,
+    }
+    with fs.open(f"{root}/{manifest_filename}", "w") as f:
+        json.dump(manifest, f)
+
+
+def read_chunked_pickle(
+    manifest_filename: str,
+    storage_dir: FilePath,
+    storage_options: Optional[Dict[str, Any]] = None,
+) -> object:
+    """
+    Load the value stored under ``manifest_filename``, reading its chunks
+    concurrently.
+    """
+    fs, root = _get_fs(storage_dir, storage_options)
+    with fs.open(f"{root}/{manifest_filename}", "r") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(
+            f"Unsupported artifact manifest version {manifest.get('version')}"
+        )
+
+    paths = [_chunk_path(root, digest) for digest in manifest["chunks"]]
+    if len(paths) <= 1:
+        chunks = [fs.cat_file(path) for path in paths]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=min(ARTIFACT_CHUNK_READ_WORKERS, len(paths))
+        ) as pool:
+            chunks = list(pool.map(fs.cat_file, paths))
+    data = b"".join(chunks)
+    if len(data) != manifest["size"]:
+        raise ValueError(
+            f"Artifact {manifest_filename} is truncated, expected {manifest['size']} bytes but read {len(data)}"
+        )
+
+    with warnings.catch_warnings(record=True):
+        # We want to silence any warnings about, e.g. moved modules.
+        warnings.simplefilter("ignore", Warning)
+        return cloudpickle.loads(data)
+
+
+class _ChunkWriter:
+    """
+    Write-only file object that stores everything written to it as
+    content-addressed chunks, skipping chunks that are already stored.
+    """
+
+    def __init__(self, fs: AbstractFileSystem, root: str, chunk_size: int):
+        self.fs = fs
+        self.root = root
+        self.chunk_size = chunk_size
+        self.digests: List[str] = []
+        self.size = 0
+        self._buffer = bytearray()
+        # digests known to be stored, to skip the existence check on chunks
+        # repeated within the same value
+        self._stored: Set[str] = set()
+
+    def write(self, data) -> int:
+        self._buffer += data
+        while len(self._buffer) >= self.chunk_size:
+            self._store(bytes(self._buffer[: self.chunk_size]))
+            del self._buffer[: self.chunk_size]
+        return len(data)
+
+    def close(self) -> None:
+        if self._buffer:
+            self._store(bytes(self._buffer))
+            self._buffer.clear()
+
+    def _store(self, chunk: bytes) -> None:
+        digest = hashlib.sha256(chunk).hexdigest()
+        if digest not in self._stored:
+            path = _chunk_path(self.root, digest)
+            if not self.fs.exists(path):
+                # write under a temporary name first, so a partially written
+                # chunk is never mistaken for a stored one
+                self.fs.makedirs(path.rsplit("/", 1)[0], exist_ok=True)
+                tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+                with self.fs.open(tmp_path, "wb") as f:
+                    f.write(chunk)
+                self.fs.mv(tmp_path, path)
+            self._stored.add(digest)
+        self.digests.append(digest)
+        self.size += len(chunk)
+
+
+def _get_fs(
+    storage_dir: FilePath, storage_options: Optional[Dict[str, Any]]
+) -> Tuple[AbstractFileSystem, str]:
+    fs, root = fsspec.core.url_to_fs(
+        str(storage_dir), **(storage_options or {})
+    )
+    return fs, root.rstrip("/")
+
+
+def _chunk_path(root: str, digest: str) -> str:
+    # fan out on the first two characters to keep folders small
+    return f"{root}/{ARTIFACT_CHUNK_DIR}/{digest[:2]}/{digest}"
@@ -3,8 +3,6 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, Set, Tuple, Union
 
-from IPython.display import display
-
 from lineapy.api.api_utils import de_lineate_code, read_pickle
 from lineapy.data.graph import Graph
 from lineapy.data.types import (
@@ -22,6 +20,10 @@ from lineapy.graph_reader.program_slice import (
     get_source_code_from_graph,
     get_subgraph_nodelist,
 )
+from lineapy.plugins.serializers.columnar_io import (
+    is_columnar_path,
+    read_columnar,
+)
 from lineapy.plugins.serializers.mlflow_io import read_mlflow
 from lineapy.utils.analytics.event_schemas import (
     GetCodeEvent,
@@ -118,6 +120,13 @@ class LineaArtifact:
             if "mlflow" in metadata.keys():
                 return read_mlflow(metadata["mlflow"])
 
+            # read columnar data, memory-mapped
+            if (
+                linea_metadata.storage_backend
+                == ARTIFACT_STORAGE_BACKEND.columnar
+            ):
+                return read_columnar(saved_filepath)
+
             # read from lineapy
             return read_pickle(saved_filepath)
 
@@ -133,6 +142,8 @@ class LineaArtifact:
         if isinstance(storage_path, str) and storage_path.startswith("runs:"):
             # MLflow log_model should return the model URI with prefix ``runs:``
             return ARTIFACT_STORAGE_BACKEND.mlflow
+        elif is_columnar_path(storage_path):
+            return ARTIFACT_STORAGE_BACKEND.columnar
         else:
             return ARTIFACT_STORAGE_BACKEND.lineapy
 
@@ -192,6 +203,14 @@ class LineaArtifact:
 
         return metadata
 
+    def _get_session_graph(self) -> Graph:
+        """
+        Return the graph of the artifact's session. It is shared, through
+        the session graph cache, by all the slices of artifacts from the
+        same session, so they reuse its memoized ancestors.
+        """
+        return Graph.create_session_graph(self.db, self._session_id)
+
     # Note that I removed the @properties because they were not working
     # well with the lru_cache
     @lru_cache(maxsize=None)
@@ -203,7 +222,7 @@ class LineaArtifact:
                 Defaults to ``False``.
 
         """
-        session_graph = Graph.create_session_graph(self.db, self._session_id)
+        session_graph = self._get_session_graph()
         return get_slice_graph(
             session_graph, [self._node_id], keep_lineapy_save
         )
@@ -212,7 +231,7 @@ class LineaArtifact:
     def _get_sessiongraph_and_subgraph_nodelist(
         self, keep_lineapy_save: bool = False
     ) -> Tuple[Graph, Set[LineaID]]:
-        session_graph = Graph.create_session_graph(self.db, self._session_id)
+        session_graph = self._get_session_graph()
         return session_graph, get_subgraph_nodelist(
             session_graph, [self._node_id], keep_lineapy_save
         )
@@ -292,22 +311,27 @@ class LineaArtifact:
         """
         # adding this inside function to lazy import graphviz.
         # This way we can import lineapy without having graphviz installed.
+        # IPython is imported here as well, since it is slow to import.
+        from IPython.display import display
+
         from lineapy.visualizer import Visualizer
 
-        session_graph = Graph.create_session_graph(self.db, self._session_id)
+        session_graph = self._get_session_graph()
         visualizer = Visualizer.for_public_node(session_graph, self._node_id)
         if path:
             visualizer.render_pdf_file(path)
         else:
             display(visualizer.ipython_display_object())
 
-    def execute(self) -> object:
+    def execute(self, parallel: bool = False) -> object:
         """
         Executes the artifact graph.
 
+        If `parallel` is set, independent calls in the graph are executed
+        concurrently on a thread pool.
         """
         slice_exec = Executor(self.db, globals())
-        slice_exec.execute_graph(self._get_subgraph())
+        slice_exec.execute_graph(self._get_subgraph(), parallel=parallel)
         return slice_exec.get_value(self._node_id)
 
     @staticmethod
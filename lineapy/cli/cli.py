@@ -31,6 +31,7 @@ from lineapy.api.models.linea_artifact import (
 )
 from lineapy.data.types import ARTIFACT_STORAGE_BACKEND, SessionType
 from lineapy.db.db import RelationalLineaDB
+from lineapy.db.session_export import export_session, import_session
 from lineapy.exceptions.excepthook import set_custom_excepthook
 from lineapy.graph_reader.artifact_collection import ArtifactCollection
 from lineapy.instrumentation.tracer import Tracer
@@ -125,6 +126,31 @@ logger = logging.getLogger(__name__)
     ),
     help="Default storage backend for ML models",
 )
+@click.option(
+    "--db-write-behind",
+    type=click.BOOL,
+    help="Batch graph writes to the LineaPy database at cell boundaries.",
+)
+@click.option(
+    "--db-background-writer",
+    type=click.BOOL,
+    help="Write the graph to the LineaPy database on a background thread.",
+)
+@click.option(
+    "--artifact-storage-dedup",
+    type=click.BOOL,
+    help="Save artifact values to a deduplicating content-addressed store.",
+)
+@click.option(
+    "--release-unreachable-values",
+    type=click.BOOL,
+    help="Free the values of traced nodes that no variable refers to.",
+)
+@click.option(
+    "--reuse-unchanged-cells",
+    type=click.BOOL,
+    help="Re-run unchanged notebook cells without tracing them again.",
+)
 def linea_cli(
     verbose: bool,
     home_dir: Optional[pathlib.Path],
@@ -137,6 +163,11 @@ def linea_cli(
     mlflow_registry_uri: Optional[str],
     mlflow_tracking_uri: Optional[str],
     default_ml_models_storage_backend: Optional[ARTIFACT_STORAGE_BACKEND],
+    db_write_behind: Optional[bool],
+    db_background_writer: Optional[bool],
+    artifact_storage_dedup: Optional[bool],
+    release_unreachable_values: Optional[bool],
+    reuse_unchanged_cells: Optional[bool],
 ):
     """
     Pass all configuration to lineapy_config
@@ -297,6 +328,56 @@ def file(
     logger.info(api_artifact.get_code())
 
 
+@linea_cli.command("export")
+@click.argument(
+    "output_file",
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+)
+@click.option("--session-id", help="ID of the session to export.")
+@click.option(
+    "--artifact-name",
+    help="Export the session which saved the latest version of this artifact.",
+)
+def export(
+    output_file: pathlib.Path,
+    session_id: Optional[str],
+    artifact_name: Optional[str],
+):
+    """
+    Writes a session, with its artifacts' metadata, to OUTPUT_FILE, to be
+    added to another LineaPy DB with ``lineapy import``.
+    """
+    if (session_id is None) == (artifact_name is None):
+        raise click.UsageError(
+            "Pass exactly one of --session-id and --artifact-name"
+        )
+    db = RelationalLineaDB.from_config(options)
+    if artifact_name is not None:
+        session_id = db.get_artifactorm_by_name(artifact_name).node.session_id
+    export_session(db, session_id, output_file)  # type: ignore
+    logger.info(f"Exported session {session_id} to {output_file}")
+
+
+@linea_cli.command("import")
+@click.argument(
+    "path",
+    type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path),
+)
+def import_(path: pathlib.Path):
+    """
+    Adds a session written by ``lineapy export`` to the LineaPy DB.
+    """
+    db = RelationalLineaDB.from_config(options)
+    export = import_session(db, path)
+    logger.info(
+        f"Imported session {export.session_context.id} with artifacts: "
+        + ", ".join(
+            f"{artifact.name} (version {artifact.version})"
+            for artifact in export.artifacts
+        )
+    )
+
+
 def generate_save_code(
     artifact_name: str,
     artifact_value: str,
@@ -1,18 +1,40 @@
-from queue import PriorityQueue, Queue
-from typing import Callable, Dict, Iterator, List, Optional, Set, TypeVar
-
-import networkx as nx
-
-from lineapy.data.types import IfNode, LineaID, Node, SessionContext
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import weakref
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+from lineapy.data.types import (
+    IfNode,
+    LineaID,
+    Node,
+    SessionContext,
+    SourceCode,
+)
 from lineapy.db.db import RelationalLineaDB
 from lineapy.graph_reader.graph_printer import GraphPrinter
 from lineapy.utils.analytics.event_schemas import CyclicGraphEvent
 from lineapy.utils.analytics.usage_tracking import track
+from lineapy.utils.constants import SESSION_GRAPH_CACHE_MAX_NODES
 from lineapy.utils.utils import listify, prettify
 
+if TYPE_CHECKING:
+    import networkx as nx
+
 
 class Graph(object):
-    def __init__(self, nodes: List[Node], session_context: SessionContext):
+    def __init__(
+        self,
+        nodes: List[Node],
+        session_context: SessionContext,
+        *,
+        _check_cycles: bool = True,
+    ):
         """
         Graph is the core abstraction in LineaPy that is automatically generated
         by capturing and analyzing user code. Nodes in Graph correspond to
@@ -29,25 +51,97 @@ class Graph(object):
         """
         self.nodes: List[Node] = nodes
         self.ids: Dict[LineaID, Node] = dict((n.id, n) for n in nodes)
-        self.nx_graph = nx.DiGraph()
-        self.nx_graph.add_nodes_from([node.id for node in nodes])
-
-        self.nx_graph.add_edges_from(
-            [
-                (parent_id, node.id)
-                for node in nodes
-                for parent_id in node.parents()
-                if parent_id in set(self.ids.keys())
-            ]
+
+        # The edges are kept in a compact CSR (compressed sparse row) layout:
+        # every node gets an integer index, and the parents of the node at
+        # index ``i`` are ``_parent_indices[_parent_offsets[i]:
+        # _parent_offsets[i + 1]]``, and likewise for its children.
+        self._id_list: List[LineaID] = list(self.ids)
+        self._index: Dict[LineaID, int] = {
+            node_id: i for i, node_id in enumerate(self._id_list)
+        }
+        self._parent_offsets = array("l", [0])
+        self._parent_indices = array("l")
+        for node in self.ids.values():
+            # Remove duplicate parents, e.g. a variable passed twice to a
+            # function, and skip parents which are not part of the graph
+            for parent_id in dict.fromkeys(node.parents()):
+                parent_index = self._index.get(parent_id)
+                if parent_index is not None:
+                    self._parent_indices.append(parent_index)
+            self._parent_offsets.append(len(self._parent_indices))
+        self._child_offsets, self._child_indices = _transpose(
+            self._parent_offsets, self._parent_indices
         )
 
+        # Memoized closures for get_ancestors and get_descendants, by node
+        # index. The nodes and edges of a graph never change once it is
+        # created, adding nodes means creating a new graph (like the tracer
+        # does on every access), so these never go stale.
+        self._ancestors_cache: Dict[int, "array[int]"] = {}
+        self._descendants_cache: Dict[int, "array[int]"] = {}
+
+        # Built lazily when accessed, for anything which needs networkx
+        self._nx_graph: Optional[nx.DiGraph] = None
+
         self.session_context = session_context
 
-        # Checking whether the linea graph created is cyclic or not
-        if not nx.is_directed_acyclic_graph(self.nx_graph):
+        # Built lazily by get_line_index
+        self._line_index: Optional[
+            Dict[SourceCode, Dict[int, List[LineaID]]]
+        ] = None
+
+        # Checking whether the linea graph created is cyclic or not.
+        # A subgraph can't have a cycle its graph doesn't, so we skip this
+        # for those.
+        if _check_cycles and not self._is_acyclic():
             track(CyclicGraphEvent(""))
 
+    @property
+    def nx_graph(self) -> nx.DiGraph:
+        """
+        A networkx copy of the graph, for algorithms not implemented on top of
+        the compact adjacency arrays. It is only built on first access.
+        """
+        if self._nx_graph is None:
+            import networkx as nx
+
+            self._nx_graph = nx.DiGraph()
+            self._nx_graph.add_nodes_from(self._id_list)
+            self._nx_graph.add_edges_from(
+                (self._id_list[parent_index], node_id)
+                for i, node_id in enumerate(self._id_list)
+                for parent_index in self._parent_indices[
+                    self._parent_offsets[i] : self._parent_offsets[i + 1]
+                ]
+            )
+        return self._nx_graph
+
+    def _is_acyclic(self) -> bool:
+        """
+        Kahn's algorithm, a graph is acyclic if removing the nodes without
+        parents one by one removes all of them.
+        """
+        remaining_parents = [
+            self._parent_offsets[i + 1] - self._parent_offsets[i]
+            for i in range(len(self._id_list))
+        ]
+        stack = [i for i, n in enumerate(remaining_parents) if n == 0]
+        n_removed = 0
+        while stack:
+            i = stack.pop()
+            n_removed += 1
+            for child_index in self._child_indices[
+                self._child_offsets[i] : self._child_offsets[i + 1]
+            ]:
+                remaining_parents[child_index] -= 1
+                if remaining_parents[child_index] == 0:
+                    stack.append(child_index)
+        return n_removed == len(self._id_list)
+
     def __eq__(self, other) -> bool:
+        import networkx as nx
+
         return nx.is_isomorphic(self.nx_graph, other.nx_graph)
 
     def print(self, **kwargs) -> str:
@@ -90,14 +184,14 @@ class Graph(object):
         # 1. All parents must be traversed before their children
         # 2. If permitted, nodes with smaller line numbers should come first
 
-        # To do this, we do a breadth first traversal, keeping our queue ordered
-        # by their line number. The sorting is done via the __lt__ method
-        # of the Node
-        queue: PriorityQueue[Node] = PriorityQueue()
-
-        # We also keep track of all nodes we have already added to the queue
-        # so that we don't add them again.
-        seen: Set[LineaID] = set()
+        # To do this, we keep a heap of the nodes which are ready to be
+        # visited, i.e. all of whose parents have been visited, ordered by
+        # their line number. The sorting is done via the __lt__ method of the
+        # Node. A node is only pushed onto the heap once its last parent has
+        # been visited, so every pop yields a node and each node and edge is
+        # processed once, instead of repeatedly popping and re-pushing nodes
+        # which are still waiting on their parents.
+        ready: List[_ReadyNode] = []
 
         # We also keep a mapping of each node to the number of parents left
         # which have not been visited yet.
@@ -117,13 +211,14 @@ class Graph(object):
         # in the execution graph.
         remaining_parents: Dict[str, int] = {}
 
+        # Tie-breaker for nodes which compare equal, so that they are visited
+        # in the order they became ready.
+        counter = itertools.count()
+
         for node in self.nodes:
-            n_remaining_parents = len(
-                [
-                    parent_id
-                    for parent_id in self.nx_graph.pred[node.id]
-                    if parent_id in self.ids
-                ]
+            i = self._index[node.id]
+            n_remaining_parents = (
+                self._parent_offsets[i + 1] - self._parent_offsets[i]
             )
 
             # Removing certain edges to ensure the graph for execution is
@@ -142,53 +237,137 @@ class Graph(object):
                 if node.companion_id is not None:
                     n_remaining_parents -= 1
 
-            # First we add all the nodes to the queue which have no parents.
+            # First we add all the nodes to the heap which have no parents.
             if n_remaining_parents == 0:
-                seen.add(node.id)
-                queue.put(node)
+                ready.append(_ReadyNode(node, next(counter)))
             remaining_parents[node.id] = n_remaining_parents
+        heapq.heapify(ready)
 
-        while queue.qsize():
-            # Find the first node in the queue which has all its parents removed
-            node = queue_get_when(
-                queue, lambda n: remaining_parents[n.id] == 0
-            )
+        while ready:
+            node = heapq.heappop(ready).node
 
-            # Then, we add all of its children to the queue, making sure to mark
-            # for each that we have seen one of its parents
+            # Then, we mark for each of its children that we have seen one of
+            # its parents, adding those which have no parents left to the heap
             yield node
             for child_id in self.get_children(node.id):
                 remaining_parents[child_id] -= 1
-                if child_id in seen:
-                    continue
-                child_node = self.ids[child_id]
-                queue.put(child_node)
-                seen.add(child_id)
+                if remaining_parents[child_id] == 0:
+                    heapq.heappush(
+                        ready, _ReadyNode(self.ids[child_id], next(counter))
+                    )
 
     def get_parents(self, node_id: LineaID) -> List[LineaID]:
-        return list(self.nx_graph.predecessors(node_id))
+        i = self._index[node_id]
+        return [
+            self._id_list[parent_index]
+            for parent_index in self._parent_indices[
+                self._parent_offsets[i] : self._parent_offsets[i + 1]
+            ]
+        ]
 
     def get_ancestors(self, node_id: LineaID) -> List[LineaID]:
-        return list(nx.ancestors(self.nx_graph, node_id))
+        return self._reachable(
+            node_id,
+            self._parent_offsets,
+            self._parent_indices,
+            self._ancestors_cache,
+        )
 
     def get_children(self, node_id: LineaID) -> List[LineaID]:
-        return list(self.nx_graph.successors(node_id))
+        i = self._index[node_id]
+        return [
+            self._id_list[child_index]
+            for child_index in self._child_indices[
+                self._child_offsets[i] : self._child_offsets[i + 1]
+            ]
+        ]
 
     def get_descendants(self, node_id: LineaID) -> List[LineaID]:
-        return list(nx.descendants(self.nx_graph, node_id))
+        return self._reachable(
+            node_id,
+            self._child_offsets,
+            self._child_indices,
+            self._descendants_cache,
+        )
 
     def get_leaf_nodes(self) -> List[LineaID]:
         return [
-            node
-            for node in self.nx_graph.nodes
-            if self.nx_graph.out_degree(node) == 0
+            node_id
+            for i, node_id in enumerate(self._id_list)
+            if self._child_offsets[i] == self._child_offsets[i + 1]
         ]
 
+    def _reachable(
+        self,
+        node_id: LineaID,
+        offsets: "array[int]",
+        indices: "array[int]",
+        cache: Dict[int, "array[int]"],
+    ) -> List[LineaID]:
+        """
+        Returns all nodes reachable from the node by following the given
+        edges, not including the node itself.
+
+        The result is memoized in ``cache``, and the search stops at any node
+        whose reachable set is already cached, reusing it instead. This way
+        slicing on many sinks of the same graph only walks each part of the
+        graph once.
+        """
+        start = self._index[node_id]
+        if start not in cache:
+            # The node itself starts off as visited, so like networkx, it
+            # isn't included even if it is part of a cycle
+            visited = bytearray(len(self._id_list))
+            visited[start] = 1
+            stack = [start]
+            reachable = array("l")
+            while stack:
+                i = stack.pop()
+                for j in indices[offsets[i] : offsets[i + 1]]:
+                    if visited[j]:
+                        continue
+                    visited[j] = 1
+                    reachable.append(j)
+                    cached = cache.get(j)
+                    if cached is None:
+                        stack.append(j)
+                        continue
+                    for k in cached:
+                        if not visited[k]:
+                            visited[k] = 1
+                            reachable.append(k)
+            cache[start] = reachable
+        return [self._id_list[i] for i in cache[start]]
+
     def get_node(self, node_id: Optional[LineaID]) -> Optional[Node]:
         if node_id is not None and node_id in self.ids:
             return self.ids[node_id]
         return None
 
+    def get_line_index(self) -> Dict[SourceCode, Dict[int, List[LineaID]]]:
+        """
+        Maps each source code to the lines in it, and each line to the nodes
+        whose source location spans that line.
+
+        The index is built on first use and kept, since the nodes of a graph
+        don't change after it is created.
+        """
+        if self._line_index is None:
+            line_index: Dict[SourceCode, Dict[int, List[LineaID]]] = {}
+            for node in self.nodes:
+                if not node.source_location:
+                    continue
+                nodes_by_line = line_index.setdefault(
+                    node.source_location.source_code, {}
+                )
+                for line in range(
+                    node.source_location.lineno,
+                    node.source_location.end_lineno + 1,
+                ):
+                    nodes_by_line.setdefault(line, []).append(node.id)
+            self._line_index = line_index
+        return self._line_index
+
     def get_subgraph(self, nodes: List[Node]) -> "Graph":
         """
         Get a subgraph of the current graph induced by the input nodes.
@@ -197,7 +376,7 @@ class Graph(object):
         :return: A new `Graph` that contains `nodes` and the edges between
         `nodes` in the current Graph and has the same session_context.
         """
-        return Graph(nodes, self.session_context)
+        return Graph(nodes, self.session_context, _check_cycles=False)
 
     def get_subgraph_from_id(self, nodeids: List[LineaID]) -> "Graph":
         """
@@ -211,10 +390,23 @@ class Graph(object):
         return self.get_subgraph(nodes)
 
     @classmethod
-    def create_session_graph(cls, db: RelationalLineaDB, session_id: LineaID):
-        session_context = db.get_session_context(session_id)
-        session_nodes = db.get_nodes_for_session(session_id)
-        return cls(session_nodes, session_context)
+    def create_session_graph(
+        cls, db: RelationalLineaDB, session_id: LineaID
+    ) -> Graph:
+        """
+        Returns the graph of all the nodes of the session.
+
+        Graphs are shared through ``session_graph_cache``, so they are only
+        loaded from the DB again once the session has new nodes, or once
+        they have been evicted.
+        """
+        graph, generation = session_graph_cache.get(db, session_id)
+        if graph is None:
+            session_context = db.get_session_context(session_id)
+            session_nodes = db.get_nodes_for_session(session_id)
+            graph = cls(session_nodes, session_context)
+            session_graph_cache.put(db, session_id, graph, generation)
+        return graph
 
     def __str__(self):
         return prettify(
@@ -229,23 +421,136 @@ class Graph(object):
         return prettify(self.print())
 
 
-T = TypeVar("T")
+def _transpose(
+    offsets: "array[int]", indices: "array[int]"
+) -> Tuple["array[int]", "array[int]"]:
+    """
+    Reverses the edges of a graph in CSR layout, i.e. turns the parents of
+    each node into the children of each node, keeping the children of each
+    node in index order.
+    """
+    n_nodes = len(offsets) - 1
+    transposed_offsets = array("l", [0] * (n_nodes + 1))
+    for j in indices:
+        transposed_offsets[j + 1] += 1
+    for i in range(n_nodes):
+        transposed_offsets[i + 1] += transposed_offsets[i]
+    transposed_indices = array("l", [0] * len(indices))
+    position = transposed_offsets[:-1]
+    for i in range(n_nodes):
+        for j in indices[offsets[i] : offsets[i + 1]]:
+            transposed_indices[position[j]] = i
+            position[j] += 1
+    return transposed_offsets, transposed_indices
+
+
+@dataclass
+class _ReadyNode:
+    """
+    Heap entry for a node in ``Graph.visit_order``, ordering nodes by
+    ``Node.__lt__`` and falling back to the order they were added to the heap
+    for nodes which compare equal.
+    """
+
+    node: Node
+    order: int
+
+    def __lt__(self, other: "_ReadyNode") -> bool:
+        if self.node < other.node:
+            return True
+        if other.node < self.node:
+            return False
+        return self.order < other.order
 
 
-def queue_get_when(queue: "Queue[T]", filter_fn: Callable[[T], bool]) -> T:
+class SessionGraphCache:
     """
-    Gets the first element in the queue that satisfies the filter function.
+    Process-wide LRU cache of session graphs, keyed by DB and session id.
+
+    It is bounded by the total number of nodes of the cached graphs instead
+    of their number, since a session can have a handful or many thousands
+    of nodes.
+
+    Sessions that are still being traced get new nodes, so the tracer calls
+    ``invalidate`` after writing each node. A generation counter per
+    session makes sure a graph that was loaded while the session changed is
+    not put back in the cache.
     """
-    # We have to pop off a number of elements, stopping when we find one that
-    # satisfies our conditional, since we can't iterate through a queue.
-
-    # Use a timeout of 0 for the gets. Otherwise, if we have some bug
-    # where we are trying to get off an empty queue, it will just
-    # block forever. With a timeout of 0, it will raise an exception instead.
-    popped_off = [queue.get(timeout=0)]
-    while not filter_fn(popped_off[-1]):
-        popped_off.append(queue.get(timeout=0))
-    *add_back_to_queue, found = popped_off
-    for tmp_node in add_back_to_queue:
-        queue.put(tmp_node)
-    return found
+
+    def __init__(self, max_nodes: int = SESSION_GRAPH_CACHE_MAX_NODES):
+        self.max_nodes = max_nodes
+        self._lock = threading.Lock()
+        # (id of the DB, session id) -> (weak reference to the DB, graph).
+        # The DB is kept by weak reference, so the cache does not keep it
+        # alive, and checked on lookup, in case its id was reused.
+        self._graphs: OrderedDict[
+            Tuple[int, LineaID],
+            Tuple[weakref.ReferenceType[RelationalLineaDB], Graph],
+        ] = OrderedDict()
+        self._n_nodes = 0
+        self._generations: Dict[LineaID, int] = {}
+
+    def get(
+        self, db: RelationalLineaDB, session_id: LineaID
+    ) -> Tuple[Optional[Graph], int]:
+        """
+        Returns the cached graph, or None, and the current generation of the
+        session, to pass to ``put`` when a new graph is loaded.
+        """
+        key = (id(db), session_id)
+        with self._lock:
+            generation = self._generations.get(session_id, 0)
+            entry = self._graphs.get(key)
+            if entry is None:
+                return None, generation
+            db_ref, graph = entry
+            if db_ref() is not db:
+                self._remove(key)
+                return None, generation
+            self._graphs.move_to_end(key)
+            return graph, generation
+
+    def put(
+        self,
+        db: RelationalLineaDB,
+        session_id: LineaID,
+        graph: Graph,
+        generation: int,
+    ) -> None:
+        size = len(graph.nodes)
+        with self._lock:
+            # The session was changed while the graph was loaded
+            if self._generations.get(session_id, 0) != generation:
+                return
+            if size > self.max_nodes:
+                return
+            key = (id(db), session_id)
+            self._remove(key)
+            self._graphs[key] = (weakref.ref(db), graph)
+            self._n_nodes += size
+            while self._n_nodes > self.max_nodes:
+                self._remove(next(iter(self._graphs)))
+
+    def invalidate(self, session_id: LineaID) -> None:
+        """
+        Drops the graphs of the session, which has new nodes.
+        """
+        with self._lock:
+            self._generations[session_id] = (
+                self._generations.get(session_id, 0) + 1
+            )
+            for key in [key for key in self._graphs if key[1] == session_id]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._graphs.clear()
+            self._n_nodes = 0
+
+    def _remove(self, key: Tuple[int, LineaID]) -> None:
+        entry = self._graphs.pop(key, None)
+        if entry is not None:
+            self._n_nodes -= len(entry[1].nodes)
+
+
+session_graph_cache = SessionGraphCache()
@@ -169,6 +169,17 @@ class SourceCode(BaseModel):
     class Config:
         orm_mode = True
 
+    @classmethod
+    def validate(cls, value: Any) -> SourceCode:
+        """
+        Reuse instances as they are instead of copying them, when they are
+        set on a ``SourceLocation``, so that all the nodes of a source share
+        one ``SourceCode``.
+        """
+        if isinstance(value, cls):
+            return value
+        return super().validate(value)
+
     def __hash__(self) -> int:
         return hash((self.id))
 
@@ -531,6 +542,7 @@ class ARTIFACT_STORAGE_BACKEND(str, Enum):
 
     lineapy = "lineapy"
     mlflow = "mlflow"
+    columnar = "columnar"
 
 
 class LineaArtifactDef(TypedDict):
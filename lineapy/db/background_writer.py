@@ -0,0 +1,88 @@
+"""
+A writer thread used to persist the graph off the tracer's critical path.
+
+Writes are submitted as callables on a bounded queue. When the queue is full,
+``submit`` blocks, so a slow database applies back-pressure on tracing instead
+of letting the queue grow without bound.
+
+Any exception raised while writing is kept and re-raised on the calling
+thread at the next barrier (``flush`` or ``raise_error``), so failed writes
+are never silently dropped.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from functools import partial
+from typing import Any, Callable, Optional
+
+from lineapy.utils.constants import DB_BACKGROUND_WRITER_MAX_QUEUE
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundDBWriter:
+    def __init__(self, max_queue_size: int = DB_BACKGROUND_WRITER_MAX_QUEUE):
+        # ``None`` is used as the sentinel to stop the thread
+        self._queue: queue.Queue[Optional[Callable[[], Any]]] = queue.Queue(
+            maxsize=max_queue_size
+        )
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(
+            target=self._run, name="lineapy-db-writer", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def on_writer_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> None:
+        """
+        Queue a write, blocking if the queue is full.
+        """
+        self._queue.put(partial(fn, *args))
+
+    def flush(self) -> None:
+        """
+        Block until all queued writes are done, then raise the first error
+        hit by any of them, if there was one.
+        """
+        self._queue.join()
+        self.raise_error()
+
+    def raise_error(self) -> None:
+        """
+        Raise (and clear) the error from a failed write, without waiting
+        on the queue.
+        """
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """
+        Flush and stop the writer thread.
+        """
+        try:
+            self.flush()
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    return
+                task()
+            except Exception as e:
+                logger.debug("Background DB write failed: %s", e)
+                # Keep the first error, later failures are most likely
+                # caused by it
+                if self._error is None:
+                    self._error = e
+            finally:
+                self._queue.task_done()
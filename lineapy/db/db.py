@@ -1,12 +1,20 @@
 from __future__ import annotations
 
 import logging
+import re
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union, cast
-
-from sqlalchemy.orm import defaultload, scoped_session, sessionmaker
+from typing import Any, Dict, List, Optional, Set, Tuple, Union, cast
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import (
+    defaultload,
+    scoped_session,
+    selectinload,
+    sessionmaker,
+    with_polymorphic,
+)
 from sqlalchemy.sql.expression import and_
 
 from lineapy.data.types import (
@@ -31,6 +39,7 @@ from lineapy.data.types import (
     SourceCode,
     SourceLocation,
 )
+from lineapy.db.background_writer import BackgroundDBWriter
 from lineapy.db.relational import (
     ArtifactDependencyORM,
     ArtifactORM,
@@ -63,7 +72,10 @@ from lineapy.exceptions.user_exception import UserException
 from lineapy.utils.analytics.event_schemas import ErrorType, ExceptionEvent
 from lineapy.utils.analytics.usage_tracking import track  # circular dep issues
 from lineapy.utils.config import lineapy_config, options
-from lineapy.utils.constants import DB_SQLITE_PREFIX
+from lineapy.utils.constants import (
+    DB_SQLITE_PREFIX,
+    DB_WRITE_BEHIND_MAX_PENDING,
+)
 from lineapy.utils.utils import get_literal_value_from_string
 
 if "mlflow" in sys.modules:
@@ -71,6 +83,30 @@ if "mlflow" in sys.modules:
 
 logger = logging.getLogger(__name__)
 
+# The alembic migration scripts of the lineapy package
+ALEMBIC_DIR = Path(__file__).resolve().parent.parent / "_alembic"
+
+_REVISION_PATTERN = re.compile(r"^(down_)?revision = (.*)$", re.MULTILINE)
+
+
+def get_alembic_head(versions_dir: Path) -> Optional[str]:
+    """
+    Returns the latest revision of the migration scripts in
+    ``versions_dir``, or None if there is not exactly one.
+
+    The scripts are read as text instead of through alembic, since importing
+    alembic takes longer than opening a database which is already up to date.
+    """
+    revisions: Set[str] = set()
+    down_revisions: Set[str] = set()
+    for script in versions_dir.glob("*.py"):
+        for down, value in _REVISION_PATTERN.findall(script.read_text()):
+            # Merge revisions have a tuple of down revisions
+            ids = re.findall(r"[\"'](\w+)[\"']", value)
+            (down_revisions if down else revisions).update(ids)
+    heads = revisions - down_revisions
+    return heads.pop() if len(heads) == 1 else None
+
 
 class RelationalLineaDB:
     """
@@ -84,29 +120,69 @@ class RelationalLineaDB:
       loaded, but that's low priority.
     """
 
-    def __init__(self, url: str):
+    def __init__(
+        self,
+        url: str,
+        write_behind: bool = False,
+        max_pending_writes: int = DB_WRITE_BEHIND_MAX_PENDING,
+        background_writer: bool = False,
+    ):
         """
         Create a linea DB, by connecting to a database url:
         https://docs.sqlalchemy.org/en/14/core/engines.html#database-urls
+
+        :param write_behind: If set, node, value, source code and variable
+            writes are queued in the session instead of being committed one
+            by one. They are flushed together (batched into bulk inserts by
+            the unit of work) on every ``commit``, which happens at cell/script
+            boundaries, on ``close`` and when an artifact is saved.
+        :param max_pending_writes: Bound on the number of queued writes in
+            write-behind mode, once reached the queue is flushed eagerly.
+        :param background_writer: If set, nodes, source code and assigned
+            variables coming from the tracer are persisted on a dedicated
+            writer thread. Any other use of the DB first waits for the queued
+            writes (see ``flush_writes``), and failed writes are raised there
+            or at the start of the next traced cell.
         """
         # create_engine params from
         # https://stackoverflow.com/questions/21766960/operationalerror-no-such-table-in-flask-with-sqlalchemy
         self.url: str = url
+        self.write_behind = write_behind
+        self.max_pending_writes = max_pending_writes
+        self._pending_writes = 0
+        # (node id, variable name) pairs already queued in write-behind mode,
+        # so that re-assignments do not fail the whole batch on flush
+        self._written_variables: Set[Tuple[LineaID, str]] = set()
+        # Source code is never changed once written, so each one is only
+        # turned into a SourceCode once and shared by all the nodes read
+        self._source_codes: Dict[LineaID, SourceCode] = {}
         self.engine = create_lineadb_engine(self.url)
-        self.session = scoped_session(sessionmaker())
-        self.session.configure(bind=self.engine)
-        from alembic import command
-        from alembic.config import Config
+        self._sessionmaker = sessionmaker(bind=self.engine)
+        self.session = scoped_session(self._sessionmaker)
+        self._background_writer: Optional[BackgroundDBWriter] = None
+        # Whether writes were queued on the writer since the last barrier
+        self._unflushed_background_writes = False
+        if background_writer:
+            self._background_writer = BackgroundDBWriter()
+            # Wait for queued writes before any read, so that reads always
+            # see them and never share the connection with the writer
+            event.listen(
+                self._sessionmaker, "do_orm_execute", self._before_read
+            )
         from sqlalchemy import inspect
 
-        lp_install_dir = Path(__file__).resolve().parent.parent
+        table_names = inspect(self.engine).get_table_names()
+        if "alembic_version" in table_names and self._is_up_to_date():
+            # Nothing to migrate, so alembic does not need to be loaded
+            return
 
-        alembic_cfg = Config((lp_install_dir / "alembic.ini").as_posix())
-        alembic_cfg.set_main_option(
-            "script_location", (lp_install_dir / "_alembic").as_posix()
-        )
+        from alembic import command
+        from alembic.config import Config
+
+        alembic_cfg = Config((ALEMBIC_DIR.parent / "alembic.ini").as_posix())
+        alembic_cfg.set_main_option("script_location", ALEMBIC_DIR.as_posix())
         alembic_cfg.set_main_option("sqlalchemy.url", self.url)
-        if not inspect(self.engine).get_table_names():
+        if not table_names:
             # No tables in the database, so create them
             Base.metadata.create_all(self.engine)
             # stamp the database with the latest alembic db version for migration
@@ -116,11 +192,31 @@ class RelationalLineaDB:
             # Tables exist, so upgrade the database
             command.upgrade(alembic_cfg, "head")
 
+    def _is_up_to_date(self) -> bool:
+        """
+        Whether the database was already migrated to the latest revision.
+        """
+        head = get_alembic_head(ALEMBIC_DIR / "versions")
+        if head is None:
+            return False
+        with self.engine.connect() as connection:
+            revisions = connection.execute(
+                text("SELECT version_num FROM alembic_version")
+            ).scalars()
+            return list(revisions) == [head]
+
     def renew_session(self):
         if self.url.startswith(DB_SQLITE_PREFIX):
             self.commit()
-            self.session = scoped_session(sessionmaker())
-            self.session.configure(bind=self.engine)
+            # The writer thread only commits its own thread local session,
+            # rebinding the shared registry would drop objects added by the
+            # main thread which are not committed yet
+            if (
+                self._background_writer is not None
+                and self._background_writer.on_writer_thread
+            ):
+                return
+            self.session = scoped_session(self._sessionmaker)
 
     @classmethod
     def from_config(cls, options: lineapy_config) -> RelationalLineaDB:
@@ -129,7 +225,12 @@ class RelationalLineaDB:
 
         If no url is provided, it will use the result of ``lineapy_config.safe_get("database_url")``
         """
-        return cls(str(options.safe_get("database_url")))
+        return cls(
+            str(options.safe_get("database_url")),
+            write_behind=str(options.get("db_write_behind")).lower() == "true",
+            background_writer=str(options.get("db_background_writer")).lower()
+            == "true",
+        )
 
     @classmethod
     def from_environment(cls, url: str) -> RelationalLineaDB:
@@ -168,10 +269,91 @@ class RelationalLineaDB:
             self.session.flush()
         self.renew_session()
 
-    def commit(self) -> None:
+    @property
+    def _defer_writes(self) -> bool:
+        """
+        Whether writes from this thread should go through the background writer.
+        """
+        return (
+            self._background_writer is not None
+            and not self._background_writer.on_writer_thread
+        )
+
+    def _write(self, orm_object: Base) -> None:
+        """
+        Persist an object built on the calling thread, on the background
+        writer if there is one.
+        """
+        if self._defer_writes:
+            self._unflushed_background_writes = True
+            self._background_writer.submit(self._add, orm_object)  # type: ignore
+        else:
+            self._add(orm_object)
+
+    def _before_read(self, orm_execute_state) -> None:
+        if self._defer_writes:
+            self.flush_writes()
+
+    def flush_writes(self) -> None:
+        """
+        Barrier for the background writer: blocks until everything queued so
+        far is committed, and raises the error of any write that failed.
+
+        It is a no-op if there is no background writer.
+        """
+        if not self._defer_writes:
+            return
+        writer = cast(BackgroundDBWriter, self._background_writer)
+        if self._unflushed_background_writes:
+            self._unflushed_background_writes = False
+            # Commit on the writer thread, since its session holds its writes
+            writer.submit(self.commit)
+        writer.flush()
+
+    def check_background_writes(self) -> None:
+        """
+        Raise the error of any background write that has failed so far,
+        without waiting for the rest of the queue.
+        """
+        if self._background_writer is not None:
+            self._background_writer.raise_error()
+
+    def _add(self, orm_object: Base) -> None:
+        """
+        Add an object to the session, committing it right away unless we are
+        in write-behind mode, in which case it is queued until the next flush.
+        """
+        self.session.add(orm_object)
+        if not self.write_behind:
+            self.renew_session()
+            return
+        self._pending_writes += 1
+        if self._pending_writes >= self.max_pending_writes:
+            self.flush_pending()
+
+    def flush_pending(self) -> None:
+        """
+        Write out all queued objects in one transaction. No-op if nothing is
+        queued, or if we are not in write-behind mode.
+        """
+        if self._pending_writes:
+            self.commit()
+            self.renew_session()
+
+    def commit(self, wait: bool = True) -> None:
         """
         End the transaction and commit the changes.
+
+        :param wait: Only used with a background writer. If false, the commit
+            is queued after the pending writes instead of waiting for them.
         """
+        if self._defer_writes:
+            if not wait:
+                self._unflushed_background_writes = False
+                self._background_writer.submit(self.commit)  # type: ignore
+                return
+            self.flush_writes()
+        self._pending_writes = 0
         try:
             self.session.commit()
         except Exception as e:
@@ -189,6 +371,12 @@ class RelationalLineaDB:
         try:
             self.commit()
         finally:
+            if self._background_writer is not None:
+                writer, self._background_writer = (
+                    self._background_writer,
+                    None,
+                )
+                writer.close()
             self.session.close()
 
     def write_source_code(self, source_code: SourceCode) -> None:
@@ -198,6 +386,7 @@ class RelationalLineaDB:
         It first has to convert it to a SourceCodeORM object, which has the fields
         inlined instead of a union
         """
+        self._source_codes[source_code.id] = source_code
         source_code_orm = SourceCodeORM(
             id=source_code.id, code=source_code.code
         )
@@ -211,8 +400,7 @@ class RelationalLineaDB:
             source_code_orm.jupyter_execution_count = location.execution_count
             source_code_orm.jupyter_session_id = location.session_id
 
-        self.session.add(source_code_orm)
-        self.renew_session()
+        self._write(source_code_orm)
 
     def write_node(self, node: Node) -> None:
         args = node.dict(
@@ -303,26 +491,31 @@ class RelationalLineaDB:
         else:
             node_orm = LookupNodeORM(**args, name=node.name)
 
-        self.session.add(node_orm)
-        self.renew_session()
+        self._write(node_orm)
 
     def write_node_value(
         self,
         node_value: NodeValue,
     ) -> None:
-        self.session.add(NodeValueORM(**node_value.dict()))
-        self.renew_session()
+        self._add(NodeValueORM(**node_value.dict()))
 
     def write_assigned_variable(
         self,
         node_id: LineaID,
         variable_name: str,
     ) -> None:
-        try:
-            self.session.add(
-                VariableNodeORM(id=node_id, variable_name=variable_name)
+        if self._defer_writes:
+            self._unflushed_background_writes = True
+            self._background_writer.submit(  # type: ignore
+                self.write_assigned_variable, node_id, variable_name
             )
-            self.renew_session()
+            return
+        if self.write_behind:
+            if (node_id, variable_name) in self._written_variables:
+                return
+            self._written_variables.add((node_id, variable_name))
+        try:
+            self._add(VariableNodeORM(id=node_id, variable_name=variable_name))
         except Exception as e:
             logger.info(
                 "%s has been defined at node %s before; most likely you have imported the library before.",
@@ -429,19 +622,8 @@ class RelationalLineaDB:
             "node_type": node.node_type,
             "control_dependency": node.control_dependency,
         }
-        if node.source_code:
-            source_code = SourceCode(
-                id=node.source_code_id,
-                code=node.source_code.code,
-                location=(
-                    Path(node.source_code.path)
-                    if node.source_code.path
-                    else JupyterCell(
-                        execution_count=node.source_code.jupyter_execution_count,
-                        session_id=node.source_code.jupyter_session_id,
-                    )
-                ),
-            )
+        if node.source_code_id is not None:
+            source_code = self._get_source_code(node)
             args["source_location"] = SourceLocation(
                 lineno=node.lineno,
                 col_offset=node.col_offset,
@@ -531,6 +713,28 @@ class RelationalLineaDB:
             )
         return LookupNode(name=node.name, **args)
 
+    def _get_source_code(self, node: NodeORM) -> SourceCode:
+        """
+        Returns the interned SourceCode of the node, creating it on first use.
+        """
+        source_code_id = cast(LineaID, node.source_code_id)
+        source_code = self._source_codes.get(source_code_id)
+        if source_code is None:
+            source_code = SourceCode(
+                id=source_code_id,
+                code=node.source_code.code,
+                location=(
+                    Path(node.source_code.path)
+                    if node.source_code.path
+                    else JupyterCell(
+                        execution_count=node.source_code.jupyter_execution_count,
+                        session_id=node.source_code.jupyter_session_id,
+                    )
+                ),
+            )
+            self._source_codes[source_code_id] = source_code
+        return source_code
+
     def get_node_by_id(self, linea_id: LineaID) -> Node:
         """
         Returns the node by looking up the database by ID
@@ -715,10 +919,24 @@ class RelationalLineaDB:
         """
         Get all the nodes associated with the session, which does
         NOT include things like SessionContext
+
+        The nodes are loaded in a fixed number of queries, instead of lazily
+        loading the subtype table and the arguments of each node one by one:
+        one query joins the node table with all the subtype tables, then
+        the source code and each argument table of the call nodes are loaded
+        in bulk (with ``IN`` queries).
         """
+        node_orm = with_polymorphic(BaseNodeORM, "*")
         node_orms = (
-            self.session.query(BaseNodeORM)
-            .filter(BaseNodeORM.session_id == session_id)
+            self.session.query(node_orm)
+            .filter(node_orm.session_id == session_id)
+            .options(
+                selectinload(node_orm.source_code),
+                selectinload(node_orm.CallNodeORM.positional_args),
+                selectinload(node_orm.CallNodeORM.keyword_args),
+                selectinload(node_orm.CallNodeORM.global_reads),
+                selectinload(node_orm.CallNodeORM.implicit_dependencies),
+            )
             .all()
         )
         return [self.map_orm_to_pydantic(node) for node in node_orms]
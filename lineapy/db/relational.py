@@ -35,6 +35,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     UniqueConstraint,
@@ -223,7 +224,7 @@ class BaseNodeORM(Base):
 
     __tablename__ = "node"
     id = Column(String, primary_key=True)
-    session_id: LineaID = Column(String)
+    session_id: LineaID = Column(String, index=True)
     node_type = Column(Enum(NodeType))
     lineno = Column(Integer, nullable=True)  # line numbers are 1-indexed
     col_offset = Column(Integer, nullable=True)  # col numbers are 0-indexed
@@ -271,6 +272,12 @@ class SourceCodeORM(Base):
         CheckConstraint(
             "(jupyter_execution_count IS NULL) = (jupyter_session_id is NULL)"
         ),
+        # Cells of a session are read in execution order
+        Index(
+            "ix_source_code_jupyter_session_id_execution_count",
+            "jupyter_session_id",
+            "jupyter_execution_count",
+        ),
     )
 
 
@@ -0,0 +1,587 @@
+"""
+Export and import of a whole session, to a single binary file.
+
+The file holds the session's nodes, source code, assigned variables and
+artifact metadata (the artifacts, the node values which point to their
+pickles, and their executions), so the session can be moved to another
+DB, or loaded directly into a ``Graph``, without going through the ORM.
+
+It is a msgpack map, laid out in columns: each kind of row is a map from
+field name to a list with one entry per row. All strings, including the
+node ids, are stored once in a string table and referred to by index,
+with ``None`` for missing values. The arguments of the call nodes are
+stored as flat lists, with offsets giving the slice of each node.
+
+Needs msgpack, from the ``export`` extra.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from lineapy.data.graph import Graph
+from lineapy.data.types import (
+    Artifact,
+    CallNode,
+    ElseNode,
+    Execution,
+    GlobalNode,
+    IfNode,
+    ImportNode,
+    JupyterCell,
+    KeywordArgument,
+    LineaID,
+    LiteralNode,
+    LiteralType,
+    LookupNode,
+    MutateNode,
+    Node,
+    NodeType,
+    NodeValue,
+    PositionalArgument,
+    SessionContext,
+    SessionType,
+    SourceCode,
+    SourceLocation,
+    ValueType,
+)
+from lineapy.db.db import RelationalLineaDB
+from lineapy.db.relational import (
+    ArtifactORM,
+    ExecutionORM,
+    NodeValueORM,
+    SessionContextORM,
+)
+from lineapy.utils.utils import get_literal_value_from_string
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMAT = "lineapy-session"
+EXPORT_VERSION = 1
+
+NODE_CLASSES = {
+    NodeType.CallNode: CallNode,
+    NodeType.LiteralNode: LiteralNode,
+    NodeType.ImportNode: ImportNode,
+    NodeType.LookupNode: LookupNode,
+    NodeType.MutateNode: MutateNode,
+    NodeType.GlobalNode: GlobalNode,
+    NodeType.IfNode: IfNode,
+    NodeType.ElseNode: ElseNode,
+}
+
+# The string fields of each node type, which all share a column each
+NODE_STRING_FIELDS = {
+    NodeType.ImportNode: ("name", "version", "package_name", "path"),
+    NodeType.LookupNode: ("name",),
+    NodeType.MutateNode: ("source_id", "call_id"),
+    NodeType.GlobalNode: ("name", "call_id"),
+    NodeType.IfNode: ("test_id", "companion_id", "unexec_id"),
+    NodeType.ElseNode: ("companion_id", "unexec_id"),
+    NodeType.CallNode: ("function_id",),
+}
+NODE_STRING_COLUMNS = sorted(
+    {name for names in NODE_STRING_FIELDS.values() for name in names}
+)
+NODE_COLUMNS = [
+    "id",
+    "node_type",
+    "control_dependency",
+    "source_code",
+    "lineno",
+    "col_offset",
+    "end_lineno",
+    "end_col_offset",
+    "literal_type",
+    "value",
+    *NODE_STRING_COLUMNS,
+]
+
+# The columns of the arguments of call nodes
+ARGUMENT_COLUMNS = {
+    "positional_args": ["id", "starred"],
+    "keyword_args": ["key", "value", "starred"],
+    "global_reads": ["name", "id"],
+    "implicit_dependencies": ["id"],
+}
+
+
+@dataclass
+class SessionExport:
+    """
+    A session read back from an export file.
+    """
+
+    graph: Graph
+    # The (node id, variable name) pairs of the assigned variables
+    variables: List[Tuple[LineaID, str]]
+    artifacts: List[Artifact]
+    node_values: List[NodeValue]
+    executions: List[Execution]
+
+    @property
+    def session_context(self) -> SessionContext:
+        return self.graph.session_context
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError(
+            "Exporting sessions needs msgpack, install it with "
+            "`pip install lineapy[export]`"
+        )
+    return msgpack
+
+
+class _StringTable:
+    """
+    Collects the strings of an export, so each is stored once.
+    """
+
+    def __init__(self) -> None:
+        self.strings: List[str] = []
+        self._indices: Dict[str, int] = {}
+
+    def __call__(self, value: Optional[str]) -> Optional[int]:
+        if value is None:
+            return None
+        index = self._indices.get(value)
+        if index is None:
+            index = self._indices[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+
+def _datetime_to_str(value: Optional[datetime]) -> Optional[str]:
+    return None if value is None else value.isoformat()
+
+
+def _columns(rows: Iterable[Dict[str, Any]], names: Iterable[str]):
+    columns: Dict[str, List[Any]] = {name: [] for name in names}
+    for row in rows:
+        for name, column in columns.items():
+            column.append(row[name])
+    return columns
+
+
+def export_session(
+    db: RelationalLineaDB, session_id: LineaID, path: Union[str, Path]
+) -> None:
+    """
+    Writes the session to a file, which can be loaded with
+    ``load_session_export`` or added to another DB with ``import_session``.
+    """
+    db.flush_writes()
+    s = _StringTable()
+    context = db.get_session_context(session_id)
+    nodes = db.get_nodes_for_session(session_id)
+    node_ids = [node.id for node in nodes]
+
+    source_codes: Dict[LineaID, int] = {}
+    source_code_rows = []
+    node_rows = []
+    # The arguments of all the call nodes, with the offset of the arguments
+    # of each node
+    arg_rows: Dict[str, List[Dict[str, Any]]] = {
+        name: [] for name in ARGUMENT_COLUMNS
+    }
+    arg_offsets: Dict[str, List[int]] = {
+        name: [0] for name in ARGUMENT_COLUMNS
+    }
+    for node in nodes:
+        row: Dict[str, Any] = dict.fromkeys(NODE_COLUMNS)
+        row.update(
+            id=s(node.id),
+            node_type=s(node.node_type.name),
+            control_dependency=s(node.control_dependency),
+        )
+        location = node.source_location
+        if location is not None:
+            source_code = location.source_code
+            if source_code.id not in source_codes:
+                source_codes[source_code.id] = len(source_code_rows)
+                cell = source_code.location
+                is_path = isinstance(cell, Path)
+                source_code_rows.append(
+                    dict(
+                        id=s(source_code.id),
+                        code=s(source_code.code),
+                        path=s(str(cell)) if is_path else None,
+                        jupyter_execution_count=(
+                            None if is_path else cell.execution_count
+                        ),
+                        jupyter_session_id=(
+                            None if is_path else s(cell.session_id)
+                        ),
+                    )
+                )
+            row.update(
+                source_code=source_codes[source_code.id],
+                lineno=location.lineno,
+                col_offset=location.col_offset,
+                end_lineno=location.end_lineno,
+                end_col_offset=location.end_col_offset,
+            )
+        for name in NODE_STRING_FIELDS.get(node.node_type, ()):
+            row[name] = s(getattr(node, name))
+        if isinstance(node, LiteralNode):
+            row.update(
+                literal_type=s(db.get_type_of_literal_value(node.value).name),
+                value=s(str(node.value)),
+            )
+        elif isinstance(node, CallNode):
+            arg_rows["positional_args"].extend(
+                dict(id=s(p.id), starred=p.starred)
+                for p in node.positional_args
+            )
+            arg_rows["keyword_args"].extend(
+                dict(key=s(k.key), value=s(k.value), starred=k.starred)
+                for k in node.keyword_args
+            )
+            arg_rows["global_reads"].extend(
+                dict(name=s(name), id=s(id_))
+                for name, id_ in node.global_reads.items()
+            )
+            arg_rows["implicit_dependencies"].extend(
+                dict(id=s(id_)) for id_ in node.implicit_dependencies
+            )
+        for name, rows in arg_rows.items():
+            arg_offsets[name].append(len(rows))
+        node_rows.append(row)
+
+    variables = db.get_variables_for_session(session_id)
+    artifacts = (
+        db.session.query(ArtifactORM)
+        .filter(ArtifactORM.node_id.in_(node_ids))
+        .all()
+    )
+    node_values = (
+        db.session.query(NodeValueORM)
+        .filter(NodeValueORM.node_id.in_(node_ids))
+        .all()
+    )
+    execution_ids = (
+        {context.execution_id}
+        | {a.execution_id for a in artifacts}
+        | {v.execution_id for v in node_values}
+    )
+    executions = (
+        db.session.query(ExecutionORM)
+        .filter(ExecutionORM.id.in_(execution_ids))
+        .all()
+    )
+
+    data = {
+        "format": EXPORT_FORMAT,
+        "version": EXPORT_VERSION,
+        "session": dict(
+            id=s(context.id),
+            environment_type=s(context.environment_type.name),
+            python_version=s(context.python_version),
+            creation_time=s(_datetime_to_str(context.creation_time)),
+            working_directory=s(context.working_directory),
+            session_name=s(context.session_name),
+            user_name=s(context.user_name),
+            execution_id=s(context.execution_id),
+        ),
+        "executions": _columns(
+            (
+                dict(
+                    id=s(e.id),
+                    timestamp=s(_datetime_to_str(e.timestamp)),
+                )
+                for e in executions
+            ),
+            ["id", "timestamp"],
+        ),
+        "source_codes": _columns(
+            source_code_rows,
+            [
+                "id",
+                "code",
+                "path",
+                "jupyter_execution_count",
+                "jupyter_session_id",
+            ],
+        ),
+        "nodes": _columns(node_rows, NODE_COLUMNS),
+        **{
+            name: dict(
+                _columns(arg_rows[name], columns), offsets=arg_offsets[name]
+            )
+            for name, columns in ARGUMENT_COLUMNS.items()
+        },
+        "variables": _columns(
+            (dict(node_id=s(id_), name=s(name)) for id_, name in variables),
+            ["node_id", "name"],
+        ),
+        "artifacts": _columns(
+            (
+                dict(
+                    node_id=s(a.node_id),
+                    execution_id=s(a.execution_id),
+                    name=s(a.name),
+                    version=a.version,
+                    date_created=s(_datetime_to_str(a.date_created)),
+                )
+                for a in artifacts
+            ),
+            ["node_id", "execution_id", "name", "version", "date_created"],
+        ),
+        "node_values": _columns(
+            (
+                dict(
+                    node_id=s(v.node_id),
+                    execution_id=s(v.execution_id),
+                    value=s(v.value),
+                    value_type=s(v.value_type and v.value_type.name),
+                    start_time=s(_datetime_to_str(v.start_time)),
+                    end_time=s(_datetime_to_str(v.end_time)),
+                )
+                for v in node_values
+            ),
+            [
+                "node_id",
+                "execution_id",
+                "value",
+                "value_type",
+                "start_time",
+                "end_time",
+            ],
+        ),
+        "strings": s.strings,
+    }
+    Path(path).write_bytes(_msgpack().packb(data))
+
+
+def load_session_export(path: Union[str, Path]) -> SessionExport:
+    """
+    Reads a file written by ``export_session``.
+
+    The models are created without validation, since their fields are
+    already of the right types, which is what makes this faster than
+    reading the session from the DB.
+    """
+    data = _msgpack().unpackb(Path(path).read_bytes(), use_list=True)
+    if (
+        data.get("format") != EXPORT_FORMAT
+        or data.get("version") != EXPORT_VERSION
+    ):
+        raise ValueError(f"{path} is not a LineaPy session export")
+    strings: List[str] = data["strings"]
+
+    def string(index: Optional[int]) -> Any:
+        return None if index is None else strings[index]
+
+    def datetime_(index: Optional[int]) -> Optional[datetime]:
+        return (
+            None if index is None else datetime.fromisoformat(strings[index])
+        )
+
+    def rows(columns: Dict[str, List[Any]]) -> Iterable[Dict[str, Any]]:
+        names = list(columns)
+        for values in zip(*columns.values()):
+            yield dict(zip(names, values))
+
+    session = data["session"]
+    session_context = SessionContext.construct(
+        id=string(session["id"]),
+        environment_type=SessionType[string(session["environment_type"])],
+        python_version=string(session["python_version"]),
+        creation_time=datetime_(session["creation_time"]),
+        working_directory=string(session["working_directory"]),
+        session_name=string(session["session_name"]),
+        user_name=string(session["user_name"]),
+        execution_id=string(session["execution_id"]),
+    )
+
+    source_codes = [
+        SourceCode.construct(
+            id=string(row["id"]),
+            code=string(row["code"]),
+            location=(
+                Path(string(row["path"]))
+                if row["path"] is not None
+                else JupyterCell.construct(
+                    execution_count=row["jupyter_execution_count"],
+                    session_id=string(row["jupyter_session_id"]),
+                )
+            ),
+        )
+        for row in rows(data["source_codes"])
+    ]
+
+    positional_args = data["positional_args"]
+    keyword_args = data["keyword_args"]
+    global_reads = data["global_reads"]
+    implicit_dependencies = data["implicit_dependencies"]
+    nodes: List[Node] = []
+    for i, row in enumerate(rows(data["nodes"])):
+        node_type = NodeType[string(row["node_type"])]
+        fields: Dict[str, Any] = dict(
+            id=string(row["id"]),
+            session_id=session_context.id,
+            node_type=node_type,
+            control_dependency=string(row["control_dependency"]),
+            source_location=None,
+        )
+        if row["source_code"] is not None:
+            fields["source_location"] = SourceLocation.construct(
+                lineno=row["lineno"],
+                col_offset=row["col_offset"],
+                end_lineno=row["end_lineno"],
+                end_col_offset=row["end_col_offset"],
+                source_code=source_codes[row["source_code"]],
+            )
+        for name in NODE_STRING_FIELDS.get(node_type, ()):
+            fields[name] = string(row[name])
+        if node_type == NodeType.LiteralNode:
+            fields["value"] = get_literal_value_from_string(
+                string(row["value"]), LiteralType[string(row["literal_type"])]
+            )
+        elif node_type == NodeType.CallNode:
+            start, end = positional_args["offsets"][i : i + 2]
+            fields["positional_args"] = [
+                PositionalArgument.construct(id=strings[id_], starred=starred)
+                for id_, starred in zip(
+                    positional_args["id"][start:end],
+                    positional_args["starred"][start:end],
+                )
+            ]
+            start, end = keyword_args["offsets"][i : i + 2]
+            fields["keyword_args"] = [
+                KeywordArgument.construct(
+                    key=strings[key], value=strings[value], starred=starred
+                )
+                for key, value, starred in zip(
+                    keyword_args["key"][start:end],
+                    keyword_args["value"][start:end],
+                    keyword_args["starred"][start:end],
+                )
+            ]
+            start, end = global_reads["offsets"][i : i + 2]
+            fields["global_reads"] = {
+                strings[name]: strings[id_]
+                for name, id_ in zip(
+                    global_reads["name"][start:end],
+                    global_reads["id"][start:end],
+                )
+            }
+            start, end = implicit_dependencies["offsets"][i : i + 2]
+            fields["implicit_dependencies"] = [
+                strings[id_] for id_ in implicit_dependencies["id"][start:end]
+            ]
+        nodes.append(NODE_CLASSES[node_type].construct(**fields))
+
+    return SessionExport(
+        graph=Graph(nodes, session_context),
+        variables=[
+            (string(row["node_id"]), string(row["name"]))
+            for row in rows(data["variables"])
+        ],
+        artifacts=[
+            Artifact.construct(
+                node_id=string(row["node_id"]),
+                execution_id=string(row["execution_id"]),
+                name=string(row["name"]),
+                version=row["version"],
+                date_created=datetime_(row["date_created"]),
+            )
+            for row in rows(data["artifacts"])
+        ],
+        node_values=[
+            NodeValue.construct(
+                node_id=string(row["node_id"]),
+                execution_id=string(row["execution_id"]),
+                value=string(row["value"]),
+                value_type=(
+                    None
+                    if row["value_type"] is None
+                    else ValueType[string(row["value_type"])]
+                ),
+                start_time=datetime_(row["start_time"]),
+                end_time=datetime_(row["end_time"]),
+            )
+            for row in rows(data["node_values"])
+        ],
+        executions=[
+            Execution.construct(
+                id=string(row["id"]), timestamp=datetime_(row["timestamp"])
+            )
+            for row in rows(data["executions"])
+        ],
+    )
+
+
+def import_session(
+    db: RelationalLineaDB, path: Union[str, Path]
+) -> SessionExport:
+    """
+    Adds a session exported with ``export_session`` to the DB.
+
+    Artifacts whose name and version are already taken in the DB are added
+    as the next version of that name instead, the returned export has the
+    versions they were added as.
+    """
+    export = load_session_export(path)
+    context = export.session_context
+    if (
+        db.session.query(SessionContextORM)
+        .filter(SessionContextORM.id == context.id)
+        .first()
+        is not None
+    ):
+        raise ValueError(f"Session {context.id} is already in the DB")
+    existing_executions = {
+        id_
+        for id_, in db.session.query(ExecutionORM.id).filter(
+            ExecutionORM.id.in_([e.id for e in export.executions])
+        )
+    }
+    for execution in export.executions:
+        if execution.id not in existing_executions:
+            db.write_execution(execution)
+    db.write_context(context)
+    for source_code in {
+        node.source_location.source_code
+        for node in export.graph.nodes
+        if node.source_location is not None
+    }:
+        db.write_source_code(source_code)
+    for node in export.graph.nodes:
+        db.write_node(node)
+    for node_id, variable_name in export.variables:
+        db.write_assigned_variable(node_id, variable_name)
+    for node_value in export.node_values:
+        db.write_node_value(node_value)
+    db.commit()
+
+    for i, artifact in enumerate(export.artifacts):
+        if (
+            db.session.query(ArtifactORM.id)
+            .filter(
+                ArtifactORM.name == artifact.name,
+                ArtifactORM.version == artifact.version,
+            )
+            .first()
+            is not None
+        ):
+            version = db.get_latest_artifact_version(artifact.name) + 1
+            logger.info(
+                "Artifact %s version %d already exists, importing it as "
+                "version %d",
+                artifact.name,
+                artifact.version,
+                version,
+            )
+            artifact = export.artifacts[i] = artifact.copy(
+                update={"version": version}
+            )
+        db.write_artifact(artifact)
+    db.commit()
+    return export
@@ -6,13 +6,14 @@ https://ipython.readthedocs.io/en/stable/config/inputtransforms.html
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
 from IPython.core.interactiveshell import InteractiveShell
 from IPython.display import DisplayHandle, DisplayObject, display
 
-from lineapy.data.types import JupyterCell, SessionType
+from lineapy.data.types import JupyterCell, Node, SessionType
 from lineapy.db.db import RelationalLineaDB
+from lineapy.editors.ipython_cell_cache import TracedCell, transform_cell
 from lineapy.editors.ipython_cell_storage import cleanup_cells, get_cell_path
 from lineapy.exceptions.excepthook import transform_except_hook_args
 from lineapy.exceptions.flag import REWRITE_EXCEPTIONS
@@ -23,6 +24,9 @@ from lineapy.utils.analytics.utils import send_lib_info_from_db
 from lineapy.utils.config import options
 from lineapy.utils.logging_config import configure_logging
 
+if TYPE_CHECKING:
+    from lineapy.visualizer.live import LiveVisualizer
+
 __all__ = ["_end_cell", "start", "stop", "visualize"]
 
 # The state of the ipython extension works like:
@@ -59,6 +63,11 @@ class CellsExecutedState:
     code: str
     # If set, we should update this display on every cell execution.
     visualize_display_handle: Optional[DisplayHandle] = field(default=None)
+    # Renders the live visualization, keeping the layout of each cell
+    live_visualizer: Optional[LiveVisualizer] = field(default=None)
+    # The cells which can be re-run without tracing them again, by the hash
+    # of their code, see `reuse_unchanged_cells`
+    traced_cells: Dict[str, TracedCell] = field(default_factory=dict)
 
     def create_visualize_display_object(self) -> DisplayObject:
         """
@@ -169,10 +178,16 @@ def _end_cell() -> object:
     # Write the code text to a file for error reporting
     get_cell_path(location).write_text(code)
 
-    last_node = transform(code, location, STATE.tracer)
-    if STATE.visualize_display_handle:
+    # Keep the nodes of the cell, to only add those to the live visualization
+    with STATE.tracer.record_nodes() as nodes:
+        try:
+            last_node = _transform_cell(code, location)
+        finally:
+            if STATE.live_visualizer:
+                STATE.live_visualizer.add_nodes(nodes)
+    if STATE.visualize_display_handle and STATE.live_visualizer:
         STATE.visualize_display_handle.update(
-            STATE.create_visualize_display_object()
+            STATE.live_visualizer.ipython_display_object()
         )
 
     # Return the last value so it will be printed, if we don't end
@@ -185,13 +200,21 @@ def _end_cell() -> object:
     return res
 
 
+def _transform_cell(code: str, location: JupyterCell) -> Optional[Node]:
+    assert isinstance(STATE, CellsExecutedState)
+    if str(options.get("reuse_unchanged_cells")).lower() == "true":
+        return transform_cell(code, location, STATE.tracer, STATE.traced_cells)
+    return transform(code, location, STATE.tracer)
+
+
 def visualize(*, live=False) -> None:
     """
     Display a visualization of the Linea graph from this session using Graphviz.
 
     If `live=True`, then this visualization will live update after cell execution.
-    Note that this comes with a substantial performance penalty, so it is False
-    by default.
+    Each cell is laid out separately, and only re-rendered when it changes, so
+    that updating it stays fast as the session grows. The nodes a cell uses from
+    other cells are repeated in it, greyed out.
 
     Note: If the visualization is not live, it will print out the visualization
     as of the previous cell execution, not the one where `visualize` is executed.
@@ -200,8 +223,12 @@ def visualize(*, live=False) -> None:
         raise RuntimeError(
             "Cannot visualize before we have started executing cells"
         )
-    display_object = STATE.create_visualize_display_object()
     if live:
+        if STATE.live_visualizer is None:
+            from lineapy.visualizer.live import LiveVisualizer
+
+            STATE.live_visualizer = LiveVisualizer(STATE.tracer)
+        display_object = STATE.live_visualizer.ipython_display_object()
         # If we have an existing display handle, display a new version of it.
         if STATE.visualize_display_handle:
             STATE.visualize_display_handle.display(display_object)
@@ -212,7 +239,7 @@ def visualize(*, live=False) -> None:
             )
     else:
         # Otherwise, just display the visualization
-        display(display_object)
+        display(STATE.create_visualize_display_object())
 
 
 def stop() -> None:
@@ -0,0 +1,192 @@
+"""
+Re-running a cell without tracing it again, if neither its code nor anything
+it reads has changed since it was last traced.
+
+Instead of parsing the cell and adding new nodes to the graph, the nodes
+traced the last time are executed again, in place, and the variables the
+cell assigned are bound to them again.
+"""
+import ast
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from lineapy.data.types import ElseNode, IfNode, JupyterCell, LineaID, Node
+from lineapy.instrumentation.tracer import Tracer
+from lineapy.transformer.transform_code import transform
+
+logger = logging.getLogger(__name__)
+
+# Sentinel for names which are not a global of the executor
+_MISSING = object()
+
+# What a name read by a cell refers to, the latest node of the variable or
+# module and otherwise the global value it is looked up as
+Identity = Tuple[Optional[LineaID], object]
+
+
+@dataclass
+class TracedCell:
+    # The nodes traced for the cell, in the order they were executed
+    nodes: List[Node]
+    # The node of the last statement, whose value is displayed
+    last_node: Optional[Node]
+    # What each name the cell reads from before it runs referred to
+    reads: Dict[str, Identity]
+    # The latest version of each node the cell depends on and of each of its
+    # own nodes, when it was traced
+    latest_nodes: Dict[LineaID, LineaID]
+    # The variables and modules the cell assigned
+    variables: Dict[str, Node]
+    modules: Dict[str, Node]
+    # Number of times the cell was re-run without tracing it
+    n_replays: int = 0
+
+    def is_unchanged(self, tracer: Tracer) -> bool:
+        """
+        Whether re-running the cell would trace the same nodes, because all
+        the names it reads still refer to the same values, and none of the
+        nodes it depends on, or that it created, were mutated since.
+        """
+        get_latest = tracer.mutation_tracker.get_latest_mutate_node
+        return all(
+            _same_identity(_get_identity(tracer, name), identity)
+            for name, identity in self.reads.items()
+        ) and all(
+            get_latest(node_id) == latest_id
+            for node_id, latest_id in self.latest_nodes.items()
+        )
+
+
+def transform_cell(
+    code: str,
+    location: JupyterCell,
+    tracer: Tracer,
+    traced_cells: Dict[str, TracedCell],
+) -> Optional[Node]:
+    """
+    Traces a cell like `transform`, unless the same code was traced before
+    and nothing it reads changed since, in which case its nodes are
+    executed again instead.
+
+    `traced_cells` maps the hash of the code of each cell to how it was
+    last traced.
+    """
+    key = hashlib.sha256(code.encode()).hexdigest()
+    cell = traced_cells.pop(key, None)
+    if cell is not None and cell.is_unchanged(tracer):
+        tracer.replay(cell.nodes)
+        tracer.variable_name_to_node.update(cell.variables)
+        tracer.module_name_to_node.update(cell.modules)
+        cell.n_replays += 1
+        logger.debug(
+            "Re-ran unchanged cell %s without tracing it (%d times)",
+            location.execution_count,
+            cell.n_replays,
+        )
+        traced_cells[key] = cell
+        return cell.last_node
+
+    try:
+        names = _get_names_read(ast.parse(code))
+    except SyntaxError:
+        # Let the transform raise it
+        return transform(code, location, tracer)
+    reads = {name: _get_identity(tracer, name) for name in names}
+    variables_before = dict(tracer.variable_name_to_node)
+    modules_before = dict(tracer.module_name_to_node)
+    with tracer.record_nodes() as nodes:
+        last_node = transform(code, location, tracer)
+
+    # Control flow is only traced for the branches which were taken, so
+    # the same code could trace different nodes
+    if any(
+        isinstance(node, (IfNode, ElseNode)) or node.control_dependency
+        for node in nodes
+    ):
+        return last_node
+    node_ids = {node.id for node in nodes}
+    get_latest = tracer.mutation_tracker.get_latest_mutate_node
+    traced_cells[key] = TracedCell(
+        nodes=nodes,
+        last_node=last_node,
+        reads=reads,
+        latest_nodes={
+            node_id: get_latest(node_id)
+            for node_id in node_ids.union(*(node.parents() for node in nodes))
+        },
+        variables=_get_assigned(
+            variables_before, tracer.variable_name_to_node, node_ids
+        ),
+        modules=_get_assigned(
+            modules_before, tracer.module_name_to_node, node_ids
+        ),
+    )
+    return last_node
+
+
+def _get_identity(tracer: Tracer, name: str) -> Identity:
+    node = tracer.variable_name_to_node.get(
+        name
+    ) or tracer.module_name_to_node.get(name)
+    if node is not None:
+        return tracer.mutation_tracker.get_latest_mutate_node(node.id), None
+    return None, tracer.executor._globals.get(name, _MISSING)
+
+
+def _same_identity(left: Identity, right: Identity) -> bool:
+    return left[0] == right[0] and left[1] is right[1]
+
+
+def _get_assigned(
+    before: Dict[str, Node], after: Dict[str, Node], node_ids: Set[LineaID]
+) -> Dict[str, Node]:
+    return {
+        name: node
+        for name, node in after.items()
+        if node.id in node_ids and before.get(name) is not node
+    }
+
+
+def _get_names_read(tree: ast.Module) -> Set[str]:
+    """
+    Returns the names a cell reads from before it runs, i.e. all names
+    loaded by each top level statement, which no previous statement assigned.
+    """
+    assigned: Set[str] = set()
+    names: Set[str] = set()
+    for stmt in tree.body:
+        for node in ast.walk(stmt):
+            if isinstance(node, ast.Name) and not isinstance(
+                node.ctx, ast.Store
+            ):
+                name = node.id
+            elif isinstance(node, ast.AugAssign) and isinstance(
+                node.target, ast.Name
+            ):
+                name = node.target.id
+            else:
+                continue
+            if name not in assigned:
+                names.add(name)
+        assigned.update(_get_names_assigned(stmt))
+    return names
+
+
+def _get_names_assigned(stmt: ast.stmt) -> Iterable[str]:
+    if isinstance(stmt, (ast.Assign, ast.AnnAssign)):
+        targets = (
+            stmt.targets if isinstance(stmt, ast.Assign) else [stmt.target]
+        )
+        for target in targets:
+            for node in ast.walk(target):
+                if isinstance(node, ast.Name):
+                    yield node.id
+    elif isinstance(stmt, (ast.Import, ast.ImportFrom)):
+        for alias in stmt.names:
+            yield (alias.asname or alias.name).split(".")[0]
+    elif isinstance(
+        stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+    ):
+        yield stmt.name
@@ -87,8 +87,6 @@ class ExecutionContext:
 
     # Mapping from each input global name to its ID
     _input_node_ids: Mapping[str, LineaID]
-    # Mapping from each input global name to whether it is mutable
-    _input_globals_mutable: Mapping[str, bool]
 
     # Mapping of input node IDs to their values.
     # Used by the exec function to understand what side effects to emit, by knowing the nodes associated with each global value used.
@@ -105,6 +103,25 @@ class ExecutionContext:
         """
         return _global_variables
 
+    def _is_input_global_mutable(self, name: str) -> bool:
+        """
+        Whether the value of the input global is mutable.
+
+        This is only needed for the globals which were accessed, so it is
+        computed lazily, and cached on the executor per node, since calling
+        `is_mutable` on every input global for every call is expensive.
+        """
+        node_id = self._input_node_ids[name]
+        cache = self.executor._id_to_mutable
+        if node_id not in cache:
+            value = self.input_nodes[node_id]
+            # Don't consider modules or classes as mutable inputs, so that any code which uses a module
+            # we assume it doesn't mutate it.
+            cache[node_id] = is_mutable(value) and not isinstance(
+                value, (ModuleType, type)
+            )
+        return cache[node_id]
+
 
 def set_context(
     executor: Executor,
@@ -122,7 +139,7 @@ def set_context(
     # by updating with our new inputs
     # Note: We need to save our inputs so that we can check what has changed
     # at the end
-    assert not _global_variables
+    assert not _global_variables.keys() - {"__builtins__"}
     # The first time this is run, variables is set, and we know
     # the scoping, so we set all of the variables we know.
     # The subsequent times, we only use those that were recorded
@@ -134,16 +151,10 @@ def set_context(
     _global_variables.setup_globals(global_name_to_value)
 
     global_node_id_to_value = {
-        id_: executor._id_to_value[id_] for id_ in input_node_ids.values()
+        id_: global_name_to_value[k] for k, id_ in input_node_ids.items()
     }
     _current_context = ExecutionContext(
         _input_node_ids=input_node_ids,
-        _input_globals_mutable={
-            # Don't consider modules or classes as mutable inputs, so that any code which uses a module
-            # we assume it doesn't mutate it.
-            k: is_mutable(v) and not isinstance(v, (ModuleType, type))
-            for k, v in global_name_to_value.items()
-        },
         node=node,
         executor=executor,
         input_nodes=global_node_id_to_value,
@@ -214,7 +225,7 @@ def _compute_side_effects(
     mutable_input_vars: List[ExecutorPointer] = [
         ID(context._input_node_ids[name])
         for name in globals_result.accessed_inputs
-        if context._input_globals_mutable[name]
+        if context._is_input_global_mutable(name)
     ]
     yield from map(MutatedNode, mutable_input_vars)
 
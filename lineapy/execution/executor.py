@@ -3,6 +3,13 @@ from __future__ import annotations
 import builtins
 import logging
 import operator
+from collections import defaultdict
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
 from dataclasses import dataclass, field
 from datetime import datetime
 from os import chdir, getcwd
@@ -11,8 +18,10 @@ from typing import (
     Dict,
     Hashable,
     Iterable,
+    Iterator,
     List,
     Optional,
+    Set,
     Tuple,
     cast,
 )
@@ -64,6 +73,7 @@ from lineapy.instrumentation.annotation_spec import (
     ValuePointer,
     ViewOfValues,
 )
+from lineapy.utils.constants import PARALLEL_EXECUTION_MAIN_THREAD_MODULES
 from lineapy.utils.lineabuiltins import LINEA_BUILTINS
 from lineapy.utils.utils import get_new_id
 
@@ -139,6 +149,13 @@ class Executor:
     # in here are external state values
     _value_to_node: Dict[Hashable, LineaID] = field(default_factory=dict)
 
+    # Cache of whether the value of a node is mutable, filled in lazily for
+    # the nodes which are read as globals during a call.
+    # Keyed by node ID instead of by `id()` of the value, since the value of a
+    # node never changes, while an `id()` can be reused once its value is
+    # garbage collected.
+    _id_to_mutable: Dict[LineaID, bool] = field(default_factory=dict)
+
     def __post_init__(self):
         self.execution = Execution(
             id=get_new_id(),
@@ -162,6 +179,26 @@ class Executor:
         """
         return self._id_to_value[node_id]
 
+    def release_values(self, live_ids: Set[LineaID]) -> None:
+        """
+        Drops the values of all nodes that are not in `live_ids`, so they can
+        be garbage collected. Values of external state nodes are always kept,
+        since they are looked up by value.
+
+        Only the values are dropped, the execution times are kept, since they
+        are small and still read by control flow nodes.
+        """
+        external_state_ids = set(self._value_to_node.values())
+        released = [
+            id_
+            for id_ in self._id_to_value
+            if id_ not in live_ids and id_ not in external_state_ids
+        ]
+        for id_ in released:
+            del self._id_to_value[id_]
+            self._node_to_globals.pop(id_, None)
+            self._id_to_mutable.pop(id_, None)
+
     def execute_node(
         self, node: Node, variables: Optional[Dict[str, LineaID]] = None
     ) -> Iterable[SideEffect]:
@@ -185,7 +222,13 @@ class Executor:
         - Returns the `SideEffects` of this node that's analyzed at runtime (hence in the executor).
         """
         logger.debug("Executing node %s", node)
+        res = self._execute(node, self._default_changes(node), variables)
+        return self._record_result(node, res)
 
+    def _default_changes(self, node: Node) -> List[AddFrame]:
+        """
+        The changes to apply to the traceback if executing the node raises.
+        """
         # To use if we need to raise an exception and change the frame
         default_changes: List[AddFrame] = []
         # If we know the source location, add that frame at the top
@@ -197,8 +240,15 @@ class Executor:
                     node.source_location.lineno,
                 )
             )
+        return default_changes
 
-        res = self._execute(node, default_changes, variables)
+    def _record_result(
+        self, node: Node, res: PrivateExecuteResult
+    ) -> List[SideEffect]:
+        """
+        Records the value and execution time of an executed node, returning
+        its side effects.
+        """
         value = res.value
         self._id_to_value[node.id] = value
         self._execution_time[node.id] = res.start_time, res.end_time
@@ -298,29 +348,7 @@ class Executor:
         variables: Optional[Dict[str, LineaID]],
     ) -> PrivateExecuteResult:
 
-        fn = cast(Callable, self._id_to_value[node.function_id])
-
-        # If we are getting an attribute, save the value in case
-        # we later call it as a bound method and need to track its mutations
-        # For example, for `a = [1]; a.append(2)`
-        # We need to trace `a`, as opposed to `a.append` when tracking the
-        # mutation.
-        if fn is getattr:
-            self._node_to_bound_self[node.id] = node.positional_args[0].id
-
-        args: List[object] = []
-        for p_arg in node.positional_args:
-            if p_arg.starred:
-                args.extend(cast(Iterable, self._id_to_value[p_arg.id]))
-            else:
-                args.append(self._id_to_value[p_arg.id])
-        kwargs = {}
-        for k in node.keyword_args:
-            if k.starred:
-                kwargs.update(cast(Dict, self._id_to_value[k.value]))
-            else:
-                kwargs.update({k.key: self._id_to_value[k.value]})
-
+        fn, args, kwargs = self._get_call_arguments(node)
         logger.debug("Calling function %s %s %s", fn, args, kwargs)
 
         # Set up our execution context, with our globals and node
@@ -387,6 +415,37 @@ class Executor:
 
         return PrivateExecuteResult(res, start_time, end_time, side_effects)
 
+    def _get_call_arguments(
+        self, node: CallNode
+    ) -> Tuple[Callable, List[object], Dict[str, object]]:
+        """
+        Returns the function, positional and keyword arguments of a call node,
+        from the values of its parents.
+        """
+        fn = cast(Callable, self._id_to_value[node.function_id])
+
+        # If we are getting an attribute, save the value in case
+        # we later call it as a bound method and need to track its mutations
+        # For example, for `a = [1]; a.append(2)`
+        # We need to trace `a`, as opposed to `a.append` when tracking the
+        # mutation.
+        if fn is getattr:
+            self._node_to_bound_self[node.id] = node.positional_args[0].id
+
+        args: List[object] = []
+        for p_arg in node.positional_args:
+            if p_arg.starred:
+                args.extend(cast(Iterable, self._id_to_value[p_arg.id]))
+            else:
+                args.append(self._id_to_value[p_arg.id])
+        kwargs = {}
+        for k in node.keyword_args:
+            if k.starred:
+                kwargs.update(cast(Dict, self._id_to_value[k.value]))
+            else:
+                kwargs.update({k.key: self._id_to_value[k.value]})
+        return fn, args, kwargs
+
     def lookup_external_state(self, state: ExternalState) -> Optional[LineaID]:
         """
         Returns the node ID if we have created a node already for some external state.
@@ -451,21 +510,186 @@ class Executor:
             [ViewOfNodes([ID(node.id), ID(node.source_id)])],
         )
 
-    def execute_graph(self, graph: Graph) -> None:
+    def execute_graph(
+        self,
+        graph: Graph,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> None:
         """
         Executes a graph in visit order making sure to setup the working directory first.
 
+        If `parallel` is set, independent calls are instead run concurrently,
+        on a pool of `max_workers` threads, see `_execute_graph_parallel`.
+
         TODO: Possibly move to graph instead of on executor, since it rather cleanly uses the
         executor's public API? Or move to function?
         """
         logger.debug("Executing graph %s", graph)
         prev_working_dir = getcwd()
         chdir(graph.session_context.working_directory)
-        for node in graph.visit_order():
-            self.execute_node(node, variables=None)
+        if parallel:
+            self._execute_graph_parallel(graph, max_workers)
+        else:
+            for node in graph.visit_order():
+                self.execute_node(node, variables=None)
         chdir(prev_working_dir)
         # Add executed nodes to DB
-        self.db.session.commit()
+        self.db.commit()
+
+    def _execute_graph_parallel(
+        self, graph: Graph, max_workers: Optional[int]
+    ) -> None:
+        """
+        Executes a graph, running each call on a thread pool as soon as all
+        the nodes it depends on have been executed, so independent branches
+        of the graph, like loading two datasets, run at the same time.
+
+        Besides the edges of the graph, a call which mutates a value also
+        depends on all the nodes which read that value before it, in visit
+        order, so that they don't see the mutated value.
+
+        Only calls which don't need an execution context are run on the
+        thread pool, since the context, and the globals that the user's code
+        is executed with, are shared by the whole process. These are calls
+        which don't read or write any globals and which are not to one of
+        lineapy's own functions (like `l_exec_statement` or `lineapy.get`).
+        All other nodes are executed on the calling thread, in visit order.
+
+        Like when executing sequentially, calls can only be ordered by the
+        dependencies recorded in the graph. Calls whose effects on each other
+        were not recorded, e.g. writing and then reading a file with functions
+        that are not annotated, may run in any order.
+        """
+        order = graph.visit_order()
+        position = {node.id: i for i, node in enumerate(order)}
+        dependencies: Dict[LineaID, Set[LineaID]] = {
+            node.id: set(graph.get_parents(node.id)) for node in order
+        }
+        # Calls which write globals, their values are passed to the global
+        # nodes through the context
+        writes_globals: Set[LineaID] = set()
+        for node in order:
+            if isinstance(node, IfNode) and node.companion_id is not None:
+                # Like in `visit_order`, the else node is not a dependency
+                # of the if node, to break the cycle between them
+                dependencies[node.id].discard(node.companion_id)
+            elif isinstance(node, MutateNode):
+                if node.source_id in position and node.call_id in position:
+                    dependencies[node.call_id].update(
+                        reader_id
+                        for reader_id in graph.get_children(node.source_id)
+                        if position[reader_id] < position[node.call_id]
+                    )
+            elif isinstance(node, GlobalNode):
+                writes_globals.add(node.call_id)
+
+        children: Dict[LineaID, List[LineaID]] = defaultdict(list)
+        remaining_dependencies: Dict[LineaID, int] = {}
+        for node_id, parent_ids in dependencies.items():
+            remaining_dependencies[node_id] = len(parent_ids)
+            for parent_id in parent_ids:
+                children[parent_id].append(node_id)
+
+        # Positions of the nodes which are ready to be executed, but have not
+        # been started yet
+        ready = {
+            position[node_id]
+            for node_id, n in remaining_dependencies.items()
+            if n == 0
+        }
+        # Position of the next node to execute on this thread, all nodes
+        # before it have been started
+        next_position = 0
+        running: Dict[Future, CallNode] = {}
+
+        def mark_executed(node_id: LineaID) -> None:
+            for child_id in children[node_id]:
+                remaining_dependencies[child_id] -= 1
+                if remaining_dependencies[child_id] == 0:
+                    ready.add(position[child_id])
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while True:
+                for i in sorted(ready):
+                    node = order[i]
+                    if self._can_execute_without_context(node, writes_globals):
+                        ready.remove(i)
+                        future = pool.submit(
+                            self._execute_call_without_context, node
+                        )
+                        running[future] = node
+                while next_position < len(order) and not (
+                    next_position in ready
+                    or remaining_dependencies[order[next_position].id]
+                ):
+                    next_position += 1
+                if next_position in ready:
+                    ready.remove(next_position)
+                    node = order[next_position]
+                    self.execute_node(node, variables=None)
+                    mark_executed(node.id)
+                    continue
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    node = running.pop(future)
+                    if future.exception() is None:
+                        self._record_result(node, future.result())
+                    else:
+                        # Some objects can only be used on the thread which
+                        # created them, like sqlite3 connections, so retry
+                        # the call on this thread, which also raises any
+                        # error like executing sequentially would.
+                        self.execute_node(node, variables=None)
+                    mark_executed(node.id)
+
+    def _can_execute_without_context(
+        self, node: Node, writes_globals: Set[LineaID]
+    ) -> bool:
+        if (
+            not isinstance(node, CallNode)
+            or node.global_reads
+            or node.id in writes_globals
+        ):
+            return False
+        fn = self._id_to_value[node.function_id]
+        if any(module.startswith("lineapy") for module in _get_modules(fn)):
+            return False
+        # Look at the values passed, without unpacking starred arguments,
+        # which could consume an iterator
+        values = [
+            fn,
+            *(self._id_to_value[arg.id] for arg in node.positional_args),
+            *(self._id_to_value[arg.value] for arg in node.keyword_args),
+        ]
+        return not any(
+            module.startswith(PARALLEL_EXECUTION_MAIN_THREAD_MODULES)
+            for value in values
+            for module in _get_modules(value)
+        )
+
+    def _execute_call_without_context(
+        self, node: CallNode
+    ) -> PrivateExecuteResult:
+        """
+        Executes a call node without setting up the execution context, so it
+        can be run on another thread.
+
+        The side effects of the call are not inspected, since they are only
+        used when tracing.
+        """
+        fn, args, kwargs = self._get_call_arguments(node)
+        try:
+            start_time = datetime.now()
+            res = fn(*args, **kwargs)
+            end_time = datetime.now()
+        except Exception as exc:
+            raise UserException(
+                exc, RemoveFrames(1), *self._default_changes(node)
+            )
+        return PrivateExecuteResult(res, start_time, end_time, [])
 
     def reload_annotations(self) -> None:
         self._function_inspector.reload_annotations()
@@ -525,3 +749,17 @@ class Executor:
         if name in LINEA_BUILTINS:
             return LINEA_BUILTINS[name]
         return self._globals[name]
+
+
+def _get_modules(value: object) -> Iterator[str]:
+    """
+    Returns the modules a value (or the function or method it is) comes
+    from.
+    """
+    yield type(value).__module__
+    module = getattr(value, "__module__", None)
+    if isinstance(module, str):
+        yield module
+    bound_self = getattr(value, "__self__", None)
+    if bound_self is not None:
+        yield type(bound_self).__module__
@@ -31,12 +31,20 @@ class GlobalsDict(Dict[str, object]):
     def __init__(self):
         self._state: Optional[State] = None
         super().__init__()
+        # Always keep the builtins, so that functions defined with these
+        # globals can still use them when called outside of an execution,
+        # e.g. when the executor runs calls on other threads
+        self["__builtins__"] = builtins
 
     def __getitem__(self, k):
         v = super().__getitem__(k)
-        if not self._state:
+        state = self._state
+        if not state:
             raise RuntimeError("GlobalsDict not setup")
-        self._state.process_getitem(k, v)
+        # This is called for every global lookup in the executed code, so
+        # skip the call once the key is recorded
+        if k not in state.accessed_inputs:
+            state.process_getitem(k, v)
         return v
 
     def setup_globals(self, inputs: Dict[str, object]) -> None:
@@ -51,22 +59,24 @@ class GlobalsDict(Dict[str, object]):
         # Calculate what globals have changed or have been added. Compare by pointer,
         # not by value, since we want to see if the global variable has been re-assigned
         # not if the value has been mutated
+        inputs = state.inputs
         changed_globals = {
             k: v
             for k, v, in self.items()
-            if k != "__builtins__"
-            and (
-                # The global was changed if it is new, i.e. was not in the our variables
-                k not in state.inputs
-                # Or if it is different
-                or state.inputs[k] is not v
-            )
+            # The global was changed if it is new, i.e. was not in the our
+            # variables, or if it is different
+            if inputs.get(k, _MISSING) is not v and k != "__builtins__"
         }
 
         self._state = None
         self.clear()
+        self["__builtins__"] = builtins
+
+        return GlobalsDictResult(list(state.accessed_inputs), changed_globals)
+
 
-        return GlobalsDictResult(state.accessed_inputs, changed_globals)
+# Sentinel for keys missing from the inputs, so that no value is identical to it
+_MISSING = object()
 
 
 @dataclass
@@ -75,8 +85,9 @@ class State:
     inputs: Dict[str, object]
 
     # A subset of the input globals, containing only the keys that were accessed
-    # from it
-    accessed_inputs: List[str] = field(default_factory=list)
+    # from it. Used as an insertion ordered set, so that checking if a key was
+    # already recorded doesn't depend on how many were accessed.
+    accessed_inputs: Dict[str, None] = field(default_factory=dict)
 
     def process_getitem(self, k: str, v: object) -> None:
         """
@@ -87,10 +98,9 @@ class State:
         if (
             k != "__builtins__"
             and k not in self.accessed_inputs
-            and k in self.inputs
-            and self.inputs[k] is v
+            and self.inputs.get(k, _MISSING) is v
         ):
-            self.accessed_inputs.append(k)
+            self.accessed_inputs[k] = None
 
 
 @dataclass
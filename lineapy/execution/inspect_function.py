@@ -6,6 +6,7 @@ import os
 import sys
 from collections import defaultdict
 from dataclasses import dataclass, field
+from functools import lru_cache
 from io import IOBase
 from pathlib import Path
 from types import ModuleType
@@ -35,6 +36,7 @@ from lineapy.instrumentation.annotation_spec import (
     ViewOfValues,
 )
 from lineapy.utils.config import CUSTOM_ANNOTATIONS_EXTENSION_NAME, options
+from lineapy.utils.constants import MUTABLE_TYPE_CACHE_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +60,38 @@ def is_mutable(obj: object) -> bool:
     ```
     """
 
+    verdict = _is_type_mutable(type(obj))
+    if verdict is not None:
+        return verdict
+
+    # Otherwise assume all hashable objects are immutable
+    try:
+        hash(obj)
+    except Exception:
+        return True
+    return False
+
+
+# Hash implementations which never raise, so that any instance of a type
+# using one of them is hashable regardless of its contents
+_INFALLIBLE_HASHES = {
+    object.__hash__,
+    int.__hash__,
+    float.__hash__,
+    complex.__hash__,
+    str.__hash__,
+    bytes.__hash__,
+    frozenset.__hash__,
+    type(None).__hash__,
+}
+
+
+@lru_cache(maxsize=MUTABLE_TYPE_CACHE_SIZE)
+def _is_type_mutable(tp: type) -> Optional[bool]:
+    """
+    Returns whether instances of the type are mutable, or None if it depends
+    on the instance, like for tuples, whose hash depends on their items.
+    """
     # We have to special case any types which are hashable, but are mutable.
     # Since there is no way to see if a class is mutable a priori, we could add a list of types
     # like this to our annotations
@@ -67,19 +101,21 @@ def is_mutable(obj: object) -> bool:
         type(iter([])),
         IOBase,
     )
+    # Subclasses of BaseEstimator can only be created once sklearn.base is
+    # imported, so verdicts cached before that stay valid
     if "sklearn.base" in sys.modules:
         mutable_hashable_types += (sys.modules["sklearn.base"].BaseEstimator,)  # type: ignore
 
     # Special case some mutable hashable types
-    if isinstance(obj, mutable_hashable_types):
+    if issubclass(tp, mutable_hashable_types):
         return True
 
-    # Otherwise assume all hashable objects are immutable
-    try:
-        hash(obj)
-    except Exception:
+    hash_ = getattr(tp, "__hash__", None)
+    if hash_ is None:
         return True
-    return False
+    if hash_ in _INFALLIBLE_HASHES:
+        return False
+    return None
 
 
 def validate(item: Dict) -> Optional[ModuleAnnotation]:
@@ -216,6 +252,16 @@ class FunctionInspectorParsed:
     keyword_name_and_value_to_type_to_side_effects: Dict[
         Tuple[str, Hashable], Dict[type, List[InspectFunctionSideEffect]]
     ] = field(default_factory=lambda: defaultdict(lambda: defaultdict(list)))
+    # Side effects of the method and keyword argument criteria, resolved for
+    # the type of the object the method is bound to, so that each type is
+    # only matched against the criteria once
+    method_dispatch_cache: Dict[
+        Tuple[type, str], Optional[List[InspectFunctionSideEffect]]
+    ] = field(default_factory=dict)
+    keyword_dispatch_cache: Dict[
+        Tuple[type, Tuple[str, Hashable]],
+        Optional[List[InspectFunctionSideEffect]],
+    ] = field(default_factory=dict)
 
     def inspect(
         self, fn: Callable, kwargs: Dict[str, object]
@@ -233,27 +279,43 @@ class FunctionInspectorParsed:
         # If it's a function, we just do a simple lookup to see if it's exactly equal to any functions we saved
         if not is_method:
             return self.function_to_side_effects.get(fn, None)
-        # If it's a class instance however, we have to consider superclasses, so we first do a lookup
-        # on the name, then check for isinstance
-        method_name = fn.__name__
-        for tp, side_effects in self.method_name_to_type_to_side_effects[
-            method_name
-        ].items():
-            if isinstance(obj, tp):
-                return side_effects
+        # If it's a class instance however, we have to consider superclasses, so we look up the
+        # side effects resolved for its type and the name
+        tp = type(obj)
+        method_key = (tp, fn.__name__)
+        try:
+            side_effects = self.method_dispatch_cache[method_key]
+        except KeyError:
+            side_effects = self.method_dispatch_cache[
+                method_key
+            ] = resolve_for_type(
+                tp,
+                self.method_name_to_type_to_side_effects.get(fn.__name__, {}),
+            )
+        if side_effects is not None:
+            return side_effects
         # Finally, if we haven't found something yet, try the keyword names mapping on the method
-        for k, v in kwargs.items():
+        for keyword_name_and_value in kwargs.items():
+            try:
+                type_to_side_effects = (
+                    self.keyword_name_and_value_to_type_to_side_effects.get(
+                        keyword_name_and_value
+                    )
+                )
             # Ignore any non hashable keyword args we pass in
-            if not isinstance(v, Hashable):
-                continue  # type: ignore
-            for (
-                tp,
-                side_effects,
-            ) in self.keyword_name_and_value_to_type_to_side_effects[
-                (k, v)
-            ].items():
-                if isinstance(obj, tp):
-                    return side_effects
+            except TypeError:
+                continue
+            if not type_to_side_effects:
+                continue
+            keyword_key = (tp, keyword_name_and_value)
+            try:
+                side_effects = self.keyword_dispatch_cache[keyword_key]
+            except KeyError:
+                side_effects = self.keyword_dispatch_cache[
+                    keyword_key
+                ] = resolve_for_type(tp, type_to_side_effects)
+            if side_effects is not None:
+                return side_effects
         return None
 
     def add_annotations(
@@ -266,6 +328,9 @@ class FunctionInspectorParsed:
             self._add_annotation(
                 module, annotation.criteria, annotation.side_effects
             )
+        # The new criteria might match types that were already resolved
+        self.method_dispatch_cache.clear()
+        self.keyword_dispatch_cache.clear()
 
     def _add_annotation(
         self,
@@ -310,14 +375,32 @@ class FunctionInspectorParsed:
             raise NotImplementedError(criteria)
 
 
+def resolve_for_type(
+    tp: type, type_to_side_effects: Dict[type, List[InspectFunctionSideEffect]]
+) -> Optional[List[InspectFunctionSideEffect]]:
+    """
+    Returns the side effects of the closest class in the MRO of the type
+    which has some, or else of the first class the type is a subclass of,
+    for abstract base classes it was registered with.
+    """
+    for class_ in tp.__mro__:
+        if class_ in type_to_side_effects:
+            return type_to_side_effects[class_]
+    for class_, side_effects in type_to_side_effects.items():
+        if issubclass(tp, class_):
+            return side_effects
+    return None
+
+
 @dataclass
 class FunctionInspector:
     """
     The FunctionInspector does two different loading steps.
 
     1. Load all the specs from disk with `get_specs`. This happens once on creation of the object.
-    2. On initialization, and before every spec call, go through all the specs and "parse" any for modules we have already imported,
-       which means turning the criteria into in memory objects, we can compare against when inspecting.
+    2. On initialization, and before every spec call once new modules were imported, go through all the specs and
+       "parse" any for modules we have already imported, which means turning the criteria into in memory objects,
+       we can compare against when inspecting.
     """
 
     # Dictionary contains all the specs we haven't parsed yet, because they correspond to un-imported modules
@@ -326,11 +409,16 @@ class FunctionInspector:
     parsed: FunctionInspectorParsed = field(
         default_factory=FunctionInspectorParsed
     )
+    # Number of modules in `sys.modules` when the specs were last parsed.
+    # Specs can only be parsed once more modules are imported, so we don't
+    # parse them again until then.
+    n_modules_parsed: int = field(default=-1, init=False)
 
     def _parse(self) -> None:
         """
         Parses all specs which are for modules we have imported
         """
+        self.n_modules_parsed = len(sys.modules)
         for module_name in list(self.specs.keys()):
             module = get_imported_module(module_name)
             if not module:
@@ -359,8 +447,9 @@ class FunctionInspector:
         Inspects a function and returns how calling it mutates the args/result and
         creates view relationships between them.
         """
-        # Try re-parsing during each function call, in case other modules were imported we can analyse
-        self._parse()
+        # Try re-parsing if other modules were imported since, in case we can analyse them
+        if self.specs and len(sys.modules) != self.n_modules_parsed:
+            self._parse()
         side_effects = self.parsed.inspect(function, kwargs) or []
         for side_effect in side_effects:
             processed_side_effect = process_side_effect(
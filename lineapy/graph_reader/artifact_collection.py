@@ -3,8 +3,6 @@ from dataclasses import dataclass
 from itertools import chain
 from typing import Dict, List
 
-import networkx as nx
-
 from lineapy.api.models.linea_artifact import LineaArtifact, LineaArtifactDef
 from lineapy.data.types import LineaID
 from lineapy.db.db import RelationalLineaDB
@@ -152,6 +150,8 @@ class ArtifactCollection:
         """
         Validate provided dependencies created an acyclic TaskGraph.
         """
+        import networkx as nx
+
         if nx.is_directed_acyclic_graph(taskgraph.graph) is False:
             raise Exception(
                 "LineaPy detected conflict with the provided dependencies. "
@@ -167,6 +167,7 @@ class ArtifactCollection:
         Nodes are SessionIds and edges between Sessions are specified by the dependencies
         existing in the combined_taskgraph.
         """
+        import networkx as nx
 
         inter_session_taskgraph = TaskGraph(nodes=[], edges={})
 
@@ -231,6 +232,8 @@ class ArtifactCollection:
         Note: These additional edges prevent bugs as the user maybe be unable to specify dependencies
         to automatically generated components.
         """
+        import networkx as nx
+
         inter_artifact_taskgraph = TaskGraph(nodes=[], edges={})
 
         # add subgraph for each session_artifact
@@ -114,10 +114,7 @@ class GraphPrinter:
                 # do not track version change, pin to 0.0.1
                 node.version = ""  # type: ignore
 
-            if (
-                self.nest_nodes
-                and len(list(self.graph.nx_graph.successors(node_id))) == 1
-            ):
+            if self.nest_nodes and len(self.graph.get_children(node_id)) == 1:
                 self.id_to_attribute_name[node_id] = "\n".join(
                     self.pretty_print_model(node)
                 )
@@ -97,9 +97,6 @@ def _include_dependencies_for_indirectly_included_nodes_in_slice(
     Ensures that for each line in the sliced program output, all corresponding
     nodes are included in the selected subgraph, and vice versa
     """
-    # TODO: Change the recursive function into a iterative/one-pass solution
-    # for speed.
-    #
     # LineaPy's graph slicing mechanism takes in the Linea Graph, obtains a
     # subset of the nodes which are necessary for the required artifact, and
     # then selects the line numbers which the selected nodes of the subgraph
@@ -123,56 +120,51 @@ def _include_dependencies_for_indirectly_included_nodes_in_slice(
     # relevant line numbers to be included, and checks whether there are any
     # additional nodes whose line numbers intersect with already included line
     # numbers, and adds those nodes and their ancestors to the graph. This
-    # process may increase the set of included line numbers, hence this
-    # function is called recursively.
-    code_to_lines = DefaultDict[SourceCode, Set[int]](set)
-
-    for node_id in current_subset:
+    # process may increase the set of included line numbers, which may pull in
+    # more nodes, until we reach a fixed point.
+    #
+    # Instead of rescanning the whole graph until nothing changes, we use a
+    # worklist: every line is looked up in the graph's line index once, the
+    # first time it gets included, and every node's parents are visited once,
+    # when the node is added.
+    line_index = graph.get_line_index()
+    included_lines = DefaultDict[SourceCode, Set[int]](set)
+    worklist: List[LineaID] = []
+
+    def include_lines(node_id: LineaID) -> None:
         node = graph.get_node(node_id)
         if node is None or not node.source_location:
-            continue
-        code_to_lines[node.source_location.source_code] |= set(
-            range(
-                node.source_location.lineno,
-                node.source_location.end_lineno + 1,
-            )
-        )
-
-    to_be_added = set()
-    completed = True
-
-    for node in graph.nodes:
-        node_id = node.id  # type: ignore
-        if node_id not in current_subset:
-            node = graph.get_node(node_id)
-            if (
-                node is None
-                or isinstance(node, ImportNode)
-                or not node.source_location
-            ):
+            return
+        source_code = node.source_location.source_code
+        lines = included_lines[source_code]
+        nodes_by_line = line_index.get(source_code, {})
+        for line in range(
+            node.source_location.lineno,
+            node.source_location.end_lineno + 1,
+        ):
+            if line in lines:
                 continue
-            if (
-                set(
-                    range(
-                        node.source_location.lineno,
-                        node.source_location.end_lineno + 1,
-                    )
-                )
-                & code_to_lines[node.source_location.source_code]
-            ):
-                to_be_added |= {node_id}
-                completed = False
-
-    for node_id in to_be_added:
-        current_subset |= {node_id}
-        current_subset.update(graph.get_ancestors(node_id))
-
-    if completed:
-        return current_subset
-    else:
-        return _include_dependencies_for_indirectly_included_nodes_in_slice(
-            graph, current_subset
-        )
+            lines.add(line)
+            for other_id in nodes_by_line.get(line, []):
+                if other_id not in current_subset and not isinstance(
+                    graph.ids[other_id], ImportNode
+                ):
+                    current_subset.add(other_id)
+                    worklist.append(other_id)
+
+    for node_id in list(current_subset):
+        include_lines(node_id)
+
+    while worklist:
+        node_id = worklist.pop()
+        include_lines(node_id)
+        # Nodes pulled in by a line need all their ancestors as well
+        for parent_id in graph.get_parents(node_id):
+            if parent_id not in current_subset:
+                current_subset.add(parent_id)
+                worklist.append(parent_id)
+
+    return current_subset
 
 
 @dataclass
@@ -3,8 +3,6 @@ from collections import Counter, OrderedDict
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Set, Tuple, cast
 
-import networkx as nx
-
 from lineapy.api.models.linea_artifact import (
     LineaArtifact,
     get_lineaartifactdef,
@@ -87,13 +85,19 @@ class SessionArtifacts:
 
             return self.session_graph.get_subgraph(nodes)
 
-        # Only interested union of sliced graph of each artifacts
+        # Only interested union of sliced graph of each artifacts. The
+        # artifacts are all sliced from the same session graph, so they share
+        # its memoized ancestors.
         self.graph = _get_subgraph_from_node_list(
             self.session_graph,
             list(
                 set.union(
                     *[
-                        set(art._get_subgraph().nx_graph.nodes)
+                        set(
+                            get_slice_graph(
+                                self.session_graph, [art._node_id]
+                            ).ids
+                        )
                         for art in target_artifacts
                     ]
                 )
@@ -233,6 +237,8 @@ class SessionArtifacts:
         performance since some of the information need to query the attributes
         from predecessors.
         """
+        import networkx as nx
+
         # Map each variable node ID to the corresponding variable name(when variable assigned)
         # Need to treat import different from regular variable assignment
         variable_dict: Dict[LineaID, Set[str]] = OrderedDict()
@@ -273,7 +279,7 @@ class SessionArtifacts:
                 if node_id in self.all_session_artifacts.keys()
                 else None,
                 dependent_variables=set(),
-                predecessors=set(self.graph.nx_graph.predecessors(node_id)),
+                predecessors=set(self.graph.get_parents(node_id)),
                 tracked_variables=set(),
                 module_import=import_dict.get(node_id, set()),
             )
@@ -347,7 +353,7 @@ class SessionArtifacts:
         Get sliced nodes from session graph and separate nodes for import
         and main calculation.
         """
-        nodes = set(get_slice_graph(self.graph, [node_id]).nx_graph.nodes)
+        nodes = set(get_slice_graph(self.graph, [node_id]).ids)
         # Identify import nodes
         importnodes = set(
             [
@@ -411,7 +417,7 @@ class SessionArtifacts:
                 pred_graph_segment,
                 slice_variable_nodes,
             )
-            common_nodes = set(source_art_slice_variable_graph.nx_graph.nodes)
+            common_nodes = set(source_art_slice_variable_graph.ids)
         else:
             common_nodes = set()
 
@@ -590,6 +596,8 @@ class SessionArtifacts:
         NodeCollections that only use to calculate artifacts in
         reuse_pre_computed_artifacts list.
         """
+        import networkx as nx
+
         last_appearance_nc: Dict[str, str] = dict()
         dependencies: Dict[str, Set[str]] = dict()
         # Artifact nodes that are going to be replaced by cached value
@@ -1,10 +1,12 @@
 import logging
+from contextlib import contextmanager
 from dataclasses import InitVar, dataclass, field
 from datetime import datetime
+from itertools import chain
 from os import getcwd
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
-from lineapy.data.graph import Graph
+from lineapy.data.graph import Graph, session_graph_cache
 from lineapy.data.types import (
     CallNode,
     ControlNode,
@@ -71,6 +73,9 @@ class Tracer:
     control_flow_tracker: ControlFlowTracker = field(
         default_factory=ControlFlowTracker
     )
+    # If set, the nodes which are processed are appended to it, see
+    # `record_nodes`
+    _recorded_nodes: Optional[List[Node]] = field(default=None, init=False)
 
     def __post_init__(
         self,
@@ -122,6 +127,72 @@ class Tracer:
             for k, n in self.variable_name_to_node.items()
         }
 
+    def release_unreachable_values(self) -> None:
+        """
+        Drop the executor's values of the nodes that code traced from now on
+        can no longer refer to.
+
+        Later code can only get at a node through a variable or a module, or,
+        when mutating, through the instance a bound method was taken from and
+        the views of the mutated value, so those (and their latest mutate
+        nodes) are the only values kept.
+
+        Must only be called between top level statements, since the
+        intermediate values of a statement are not bound to any variable.
+        """
+        live_ids = {
+            node.id
+            for node in chain(
+                self.variable_name_to_node.values(),
+                self.module_name_to_node.values(),
+            )
+        }
+        bound_self = self.executor._node_to_bound_self
+        live_ids.update(
+            bound_self[id_] for id_ in live_ids & bound_self.keys()
+        )
+        # views are tracked symmetrically, so keep every node in a view
+        # relationship, in case some other node in it is mutated
+        for id_, viewer_ids in self.mutation_tracker.viewers.items():
+            live_ids.add(id_)
+            live_ids.update(viewer_ids)
+        live_ids.update(
+            [
+                self.mutation_tracker.get_latest_mutate_node(id_)
+                for id_ in live_ids
+            ]
+        )
+        self.executor.release_values(live_ids)
+
+    @contextmanager
+    def record_nodes(self) -> Iterator[List[Node]]:
+        """
+        Collects the nodes processed inside the block, in the order they
+        were executed, so they can be replayed later.
+
+        Blocks can be nested, the nodes of an inner block are also added to
+        the outer one.
+        """
+        outer_nodes = self._recorded_nodes
+        self._recorded_nodes = nodes = []
+        try:
+            yield nodes
+        finally:
+            self._recorded_nodes = outer_nodes
+            if outer_nodes is not None:
+                outer_nodes.extend(nodes)
+
+    def replay(self, nodes: List[Node]) -> None:
+        """
+        Executes nodes which were already traced again, like when executing
+        a graph, without adding anything to it.
+
+        The side effects of the nodes are ignored, since they were already
+        added to the graph when the nodes were traced.
+        """
+        for node in nodes:
+            self.executor.execute_node(node, variables=None)
+
     def process_node(self, node: Node) -> None:
         """
         Execute a node, and adds it to the database.
@@ -142,6 +213,8 @@ class Tracer:
             logger.error("Artifact could not be saved.")
             logger.debug(exc_info)
             return
+        if self._recorded_nodes is not None:
+            self._recorded_nodes.append(node)
         logger.debug("Processing side effects")
 
         # Iterate through each side effect and process it, depending on its type
@@ -183,6 +256,8 @@ class Tracer:
             node.package_name = package_name
 
         self.db.write_node(node)
+        # any graph of the session loaded so far is missing this node
+        session_graph_cache.invalidate(node.session_id)
 
     def _resolve_pointer(self, ptr: ExecutorPointer) -> LineaID:
         if isinstance(ptr, ID):
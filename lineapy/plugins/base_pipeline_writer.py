@@ -5,8 +5,6 @@ from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Optional
 
-import networkx as nx
-
 from lineapy.graph_reader.artifact_collection import ArtifactCollection
 from lineapy.graph_reader.node_collection import UserCodeNodeCollection
 from lineapy.graph_reader.types import InputVariable
@@ -242,6 +240,8 @@ class BasePipelineWriter:
         form of equality evaluation for each function's output,
         which demands validation and customization by the user.
         """
+        import networkx as nx
+
         # Extract information about each function in the pipeline module.
         # This information is to be eventually passed into file template.
         # Fields starting with an underscore are not intended for direct use
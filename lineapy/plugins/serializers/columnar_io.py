@@ -0,0 +1,186 @@
+import logging
+import sys
+from importlib.util import find_spec
+from typing import Any, Optional, Tuple
+
+import fsspec
+from fsspec import AbstractFileSystem
+from fsspec.implementations.local import LocalFileSystem
+
+from lineapy.utils.config import options
+from lineapy.utils.logging_config import configure_logging
+
+"""
+Serializer and deserializer for columnar data, stored in formats that can be
+memory-mapped when they are read back, instead of being unpickled into a copy.
+
+[x] numpy.ndarray (.npy, except object arrays)
+[x] pandas.DataFrame (Arrow IPC, needs pyarrow)
+
+Memory-mapping only applies to local artifact storage, values on remote
+storage are read into memory.
+"""
+
+
+logger = logging.getLogger(__name__)
+configure_logging()
+
+COLUMNAR_SUFFIXES = (".npy", ".arrow")
+
+columnar_io = {}
+"""
+This dictionary holds information about how to serialize and deserialize
+each supported type. Each individual key is the file suffix of the format.
+Each value is a dictionary with following five keys:
+
+1. module and class: module and name of the class that can be saved in this
+   format (subclasses are pickled as usual, since the format would drop what
+   they add). The class is only looked up once its module was imported, so
+   that numpy and pandas are not imported with lineapy.
+2. can_write: check for values of the class the format cannot hold
+3. serializer: the method to write a value to an open binary file
+4. deserializer: the method to read a value back from a file path,
+   memory-mapping it if the path is local
+"""
+
+
+def _can_write_npy(value: Any) -> bool:
+    # object arrays would be pickled into the .npy
+    return not value.dtype.hasobject
+
+
+def _write_npy(value: Any, f) -> None:
+    import numpy as np
+
+    np.save(f, value, allow_pickle=False)
+
+
+def _read_npy(fs: AbstractFileSystem, path: str) -> Any:
+    import numpy as np
+
+    if isinstance(fs, LocalFileSystem):
+        # copy-on-write, so the loaded array can still be modified
+        # without touching the saved file
+        return np.load(path, mmap_mode="c", allow_pickle=False)
+    with fs.open(path, "rb") as f:
+        return np.load(f, allow_pickle=False)
+
+
+def _can_write_arrow(value: Any) -> bool:
+    return True
+
+
+def _write_arrow(value: Any, f) -> None:
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(value)
+    with pa.ipc.new_file(f, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _read_arrow(fs: AbstractFileSystem, path: str) -> Any:
+    import pyarrow as pa
+
+    if isinstance(fs, LocalFileSystem):
+        # not closed explicitly, the table's buffers keep the mapping
+        # alive for as long as they are used
+        source = pa.memory_map(path, "r")
+        table = pa.ipc.open_file(source).read_all()
+    else:
+        with fs.open(path, "rb") as f:
+            table = pa.ipc.open_file(pa.py_buffer(f.read())).read_all()
+    # split_blocks lets numeric columns point at the mapped buffers
+    # instead of being consolidated into new blocks
+    return table.to_pandas(split_blocks=True)
+
+
+if find_spec("numpy") is not None:
+    columnar_io[".npy"] = {
+        "module": "numpy",
+        "class": "ndarray",
+        "can_write": _can_write_npy,
+        "serializer": _write_npy,
+        "deserializer": _read_npy,
+    }
+
+if find_spec("pandas") is not None and find_spec("pyarrow") is not None:
+    columnar_io[".arrow"] = {
+        "module": "pandas",
+        "class": "DataFrame",
+        "can_write": _can_write_arrow,
+        "serializer": _write_arrow,
+        "deserializer": _read_arrow,
+    }
+
+
+def columnar_suffix(value: Any) -> Optional[str]:
+    """
+    Return the file suffix of the columnar format ``value`` can be saved
+    in, or None if it has to be pickled.
+    """
+    for suffix, io in columnar_io.items():
+        # a value cannot be of the class if its module was never imported
+        module = sys.modules.get(io["module"])
+        if (
+            module is not None
+            and type(value) is getattr(module, io["class"])
+            and io["can_write"](value)
+        ):
+            return suffix
+    return None
+
+
+def is_columnar_path(storage_path: Any) -> bool:
+    return isinstance(storage_path, str) and any(
+        storage_path.endswith(suffix) for suffix in COLUMNAR_SUFFIXES
+    )
+
+
+def try_write_to_columnar(value: Any, filename: str) -> bool:
+    """
+    Try to save the value to ``filename`` in the artifact storage dir, in
+    the columnar format matching the suffix of ``filename``.
+
+    Returns
+    -------
+    bool
+        True if the value was saved, False if it could not be converted
+        (e.g., a DataFrame with mixed types in a column), in which case
+        it should be pickled instead.
+    """
+    suffix = "." + filename.rsplit(".", 1)[-1]
+    fs, path = _get_fs(filename)
+    try:
+        with fs.open(path, "wb") as f:
+            columnar_io[suffix]["serializer"](value, f)
+    except Exception as e:
+        logger.info(
+            f"Unable to save {type(value)} as {suffix}, pickling it instead: {e}"
+        )
+        if fs.exists(path):
+            fs.delete(path)
+        return False
+    return True
+
+
+def read_columnar(filename: str) -> Any:
+    """
+    Read a value saved with :func:`try_write_to_columnar`.
+    """
+    suffix = "." + filename.rsplit(".", 1)[-1]
+    if suffix not in columnar_io:
+        msg = (
+            f"Reading {suffix} artifacts needs 'numpy' and 'pyarrow';"
+            + " please install them with 'pip install lineapy[columnar]'"
+        )
+        raise ModuleNotFoundError(msg)
+    fs, path = _get_fs(filename)
+    return columnar_io[suffix]["deserializer"](fs, path)
+
+
+def _get_fs(filename: str) -> Tuple[AbstractFileSystem, str]:
+    artifact_storage_dir = str(options.safe_get("artifact_storage_dir"))
+    return fsspec.core.url_to_fs(
+        f'{artifact_storage_dir.rstrip("/")}/{filename}',
+        **(options.get("storage_options") or {}),
+    )
@@ -5,9 +5,6 @@ from enum import Enum
 from itertools import chain
 from typing import Dict, List, Set, Tuple
 
-import networkx as nx
-from networkx.exception import NetworkXUnfeasible
-
 from lineapy.plugins.utils import load_plugin_template, slugify
 
 TaskGraphEdge = Dict[str, Set[str]]
@@ -45,6 +42,8 @@ class TaskGraph(object):
         nodes: List[str],
         edges: TaskGraphEdge = {},
     ):
+        import networkx as nx
+
         self.graph = nx.DiGraph()
         self.graph.add_nodes_from(nodes)
         # parsing the other format to our tuple-based format
@@ -66,6 +65,8 @@ class TaskGraph(object):
         return copied_taskgraph
 
     def remap_nodes(self, mapping: Dict[str, str]) -> TaskGraph:
+        import networkx as nx
+
         remapped_taskgraph = TaskGraph([])
         remapped_taskgraph.graph = nx.relabel_nodes(
             self.graph, mapping, copy=True
@@ -95,6 +96,9 @@ class TaskGraph(object):
                 self.graph.add_edge(old_sink, cleanup_task_name)
 
     def get_taskorder(self) -> List[str]:
+        import networkx as nx
+        from networkx.exception import NetworkXUnfeasible
+
         try:
             return list(nx.topological_sort(self.graph))
         except NetworkXUnfeasible:
@@ -106,6 +110,8 @@ class TaskGraph(object):
             )
 
     def remove_self_loops(self):
+        import networkx as nx
+
         self.graph.remove_edges_from(nx.selfloop_edges(self.graph))
 
     @property
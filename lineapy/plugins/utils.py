@@ -1,22 +1,25 @@
 import re
 import unicodedata
 from pathlib import Path
-from typing import Dict
-
-from jinja2 import Environment, FileSystemLoader, Template
+from typing import TYPE_CHECKING, Dict
 
 import lineapy
 
+if TYPE_CHECKING:
+    from jinja2 import Template
+
 # Python is not aware of a package's pip name, so we need to get it from the module
 PIP_PACKAGE_NAMES: Dict[str, str] = {
     "sklearn": "scikit-learn",
 }
 
 
-def load_plugin_template(template_name: str) -> Template:
+def load_plugin_template(template_name: str) -> "Template":
     """
     Loads a jinja template for a plugin (currently only airflow) from the jinja_templates folder.
     """
+    from jinja2 import Environment, FileSystemLoader
+
     template_loader = FileSystemLoader(
         searchpath=str(
             (Path(lineapy.__file__) / "../plugins/jinja_templates").resolve()
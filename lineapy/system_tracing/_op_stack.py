@@ -6,16 +6,20 @@ import sys
 from ctypes import (
     POINTER,
     Structure,
+    c_char,
     c_int,
     c_ssize_t,
+    c_uint16,
     c_void_p,
+    cast,
     py_object,
     sizeof,
 )
-from types import FrameType
-from typing import Any, Tuple
+from dis import Bytecode, hasjabs, hasjrel, opmap, stack_effect
+from types import CodeType, FrameType
+from typing import Any, Dict, List, Optional, Tuple
 
-__all__ = ("OpStack",)
+__all__ = ("OpStack", "stack_depths")
 
 
 class Frame(Structure):
@@ -38,7 +42,7 @@ class Frame(Structure):
             ("f_stacktop", POINTER(py_object)),
             ("f_trace", POINTER(py_object)),
         )
-    else:
+    elif sys.version_info < (3, 11):
         _fields_: Tuple[Tuple[str, object], ...] = (
             ("ob_refcnt", c_ssize_t),
             ("ob_type", c_void_p),
@@ -52,6 +56,42 @@ class Frame(Structure):
             ("f_trace", POINTER(py_object)),
             ("f_stackdepth", c_int),
         )
+    else:
+        # The frame object only points to the interpreter frame, which holds
+        # the stack
+        _fields_: Tuple[Tuple[str, object], ...] = (
+            ("ob_refcnt", c_ssize_t),
+            ("ob_type", c_void_p),
+            ("f_back", c_void_p),
+            ("f_frame", c_void_p),
+        )
+
+
+class InterpreterFrame(Structure):
+    """
+    ctypes Structure for the ``_PyInterpreterFrame`` of Python 3.11 to 3.13.
+    The fields before ``stacktop`` are renamed between versions but keep the
+    same layout.
+
+    ``localsplus`` holds the local variables, cells and free variables of
+    the code, followed by the stack, and ``stacktop`` is the index of the
+    top of the stack in it.
+    """
+
+    _fields_: Tuple[Tuple[str, object], ...] = (
+        ("f_code", c_void_p),
+        ("previous", c_void_p),
+        ("f_funcobj", c_void_p),
+        ("f_globals", c_void_p),
+        ("f_builtins", c_void_p),
+        ("f_locals", c_void_p),
+        ("frame_obj", c_void_p),
+        ("prev_instr", c_void_p),
+        ("stacktop", c_int),
+        ("return_offset", c_uint16),
+        ("owner", c_char),
+        ("localsplus", py_object),
+    )
 
 
 # The frame object has additional fields in debug mode
@@ -67,6 +107,7 @@ if sys.version_info < (3, 10):
     F_STACKTOP_OFFSET = sizeof(Frame) - 2 * PTR_SIZE
 else:
     F_STACKDEPTH_OFFSET = sizeof(Frame) - PTR_SIZE
+LOCALSPLUS_OFFSET = InterpreterFrame.localsplus.offset  # type: ignore
 
 
 class OpStack:
@@ -74,7 +115,12 @@ class OpStack:
     Only support negative access
     """
 
-    def __init__(self, frame: FrameType):
+    def __init__(self, frame: FrameType, stack_depth: Optional[int] = None):
+        """
+        :param stack_depth: The depth of the stack, on Python 3.11+, when it
+            is not saved in the frame, which is the case in sys.monitoring
+            callbacks (see `stack_depths`).
+        """
         self._frame = Frame.from_address(id(frame))
         if sys.version_info < (3, 10):
             stack_start_addr = c_ssize_t.from_address(
@@ -84,10 +130,27 @@ class OpStack:
                 id(frame) + F_STACKTOP_OFFSET
             ).value
             self._len = (stack_top_addr - stack_start_addr) // PTR_SIZE
-        else:
+        elif sys.version_info < (3, 11):
             self._len = c_int.from_address(
                 id(frame) + F_STACKDEPTH_OFFSET
             ).value
+        else:
+            interpreter_frame_addr = self._frame.f_frame
+            n_localsplus = _n_localsplus(frame.f_code)
+            self._stack = cast(
+                interpreter_frame_addr
+                + LOCALSPLUS_OFFSET
+                + n_localsplus * PTR_SIZE,
+                POINTER(py_object),
+            )
+            if stack_depth is None:
+                stack_depth = (
+                    InterpreterFrame.from_address(
+                        interpreter_frame_addr
+                    ).stacktop
+                    - n_localsplus
+                )
+            self._len = stack_depth
 
     def __getitem__(self, item: int) -> Any:
         if item < -self._len or item >= 0:
@@ -95,5 +158,90 @@ class OpStack:
         if item < 0:
             if sys.version_info < (3, 10):
                 return self._frame.f_stacktop[item]
-            else:
+            elif sys.version_info < (3, 11):
                 return self._frame.f_valuestack[item + self._len]
+            else:
+                return self._stack[item + self._len]
+
+
+def _n_localsplus(code: CodeType) -> int:
+    """
+    Number of local variables, cells and free variables, which come before
+    the stack in the interpreter frame. Arguments which are also cells are
+    only stored once.
+    """
+    return len(set(code.co_varnames).union(code.co_cellvars)) + len(
+        code.co_freevars
+    )
+
+
+# Instructions after which the next one is never executed
+NO_FALLTHROUGH = {
+    opmap[name]
+    for name in (
+        "JUMP_FORWARD",
+        "JUMP_BACKWARD",
+        "JUMP_BACKWARD_NO_INTERRUPT",
+        "JUMP_ABSOLUTE",
+        "RETURN_VALUE",
+        "RETURN_CONST",
+        "RAISE_VARARGS",
+        "RERAISE",
+    )
+    if name in opmap
+}
+JUMPS = set(hasjrel) | set(hasjabs)
+
+
+def stack_depths(code: CodeType) -> Dict[int, int]:
+    """
+    Returns the depth of the stack before each instruction of the code
+    object, by offset, for Python 3.11+.
+
+    The stack pointer is only saved in the frame for some events, and not
+    before sys.monitoring instruction callbacks, but the depth at each
+    instruction is fixed by the compiler, so we compute it from the bytecode
+    the same way, following jumps and exception handlers.
+    """
+    bytecode = Bytecode(code)
+    instructions = list(bytecode)
+    offset_to_index = {
+        instruction.offset: i for i, instruction in enumerate(instructions)
+    }
+    depths: Dict[int, int] = {}
+    # The exception and the offset of the instruction which raised it (if
+    # lasti) are pushed when jumping to an exception handler
+    to_visit: List[Tuple[int, int]] = [(0, 0)] + [
+        (entry.target, entry.depth + int(entry.lasti) + 1)
+        for entry in bytecode.exception_entries  # type: ignore
+    ]
+    while to_visit:
+        offset, depth = to_visit.pop()
+        i = offset_to_index[offset]
+        while i < len(instructions):
+            instruction = instructions[i]
+            if instruction.offset in depths:
+                break
+            depths[instruction.offset] = depth
+            if instruction.opcode in JUMPS:
+                to_visit.append(
+                    (
+                        instruction.argval,
+                        depth
+                        + stack_effect(
+                            instruction.opcode, instruction.arg, jump=True
+                        ),
+                    )
+                )
+            if instruction.opcode in NO_FALLTHROUGH:
+                break
+            # The generator is resumed with a value, which the compiler
+            # doesn't count, since it adds this instruction afterwards
+            if instruction.opname == "RETURN_GENERATOR":
+                depth += 1
+            else:
+                depth += stack_effect(
+                    instruction.opcode, instruction.arg, jump=False
+                )
+            i += 1
+    return depths
@@ -6,13 +6,14 @@ from collections.abc import Sequence
 from dataclasses import InitVar, dataclass, field
 from dis import Instruction, get_instructions
 from sys import version_info
-from types import CodeType
+from types import CodeType, FrameType, MappingProxyType
 from typing import (
     Any,
     Callable,
     Dict,
     Iterable,
     List,
+    Mapping,
     Optional,
     Set,
     Tuple,
@@ -20,7 +21,7 @@ from typing import (
     cast,
 )
 
-from lineapy.system_tracing._op_stack import OpStack
+from lineapy.system_tracing._op_stack import JUMPS, OpStack, stack_depths
 from lineapy.system_tracing.function_call import FunctionCall
 
 # This callback is saved when we have an operator that had some function call. We need to defer some of the processing until the next bytecode instruction loads,
@@ -31,18 +32,92 @@ ReturnValueCallback = Callable[
 ]
 
 
+@dataclass(frozen=True)
+class CodeInstructions:
+    """
+    The instructions of a code object, and of the code objects nested in it.
+
+    They are the same every time the code runs, so they are computed once
+    and shared by the trace functions of all its runs, which only copy
+    ``code_to_unvisited`` to keep track of what they traced.
+    """
+
+    # Mapping of each code object to its instructions, by offset, so we can
+    # quickly look up what instruction we are looking at
+    code_to_offset_to_instruction: Mapping[CodeType, Mapping[int, Instruction]]
+    # Number of instructions in each code object which could record a
+    # function call
+    code_to_n_calls: Mapping[CodeType, int]
+    # For each code object, a byte per 2 bytes of bytecode, set at the
+    # offsets of its instructions, divided by 2
+    code_to_unvisited: Mapping[CodeType, bytes]
+    # On Python 3.12+, the depth of the stack before each instruction, and
+    # the offsets of the instructions which can run right after it (see
+    # `exec_and_monitor`)
+    code_to_stack_depths: Mapping[CodeType, Mapping[int, int]]
+    code_to_next_offsets: Mapping[CodeType, Mapping[int, Tuple[int, ...]]]
+
+    @classmethod
+    def from_code(cls, code: CodeType) -> CodeInstructions:
+        code_to_offset_to_instruction = {
+            code: MappingProxyType(instructions_by_offset(code))
+            for code in all_code_objects(code)
+        }
+        code_to_n_calls = {}
+        code_to_unvisited = {}
+        for (
+            code,
+            offset_to_instruction,
+        ) in code_to_offset_to_instruction.items():
+            code_to_n_calls[code] = sum(
+                may_call_function(instruction)
+                for instruction in offset_to_instruction.values()
+            )
+            unvisited = bytearray(len(code.co_code) // 2)
+            for offset in offset_to_instruction:
+                unvisited[offset // 2] = 1
+            code_to_unvisited[code] = bytes(unvisited)
+        code_to_stack_depths = {}
+        code_to_next_offsets = {}
+        if version_info >= (3, 12):
+            for (
+                code,
+                offset_to_instruction,
+            ) in code_to_offset_to_instruction.items():
+                code_to_stack_depths[code] = MappingProxyType(
+                    stack_depths(code)
+                )
+                code_to_next_offsets[code] = MappingProxyType(
+                    next_offsets(offset_to_instruction)
+                )
+        return cls(
+            MappingProxyType(code_to_offset_to_instruction),
+            MappingProxyType(code_to_n_calls),
+            MappingProxyType(code_to_unvisited),
+            MappingProxyType(code_to_stack_depths),
+            MappingProxyType(code_to_next_offsets),
+        )
+
+
 @dataclass
 class TraceFunc:
     code: InitVar[CodeType]
     function_calls: List[FunctionCall] = field(default_factory=list)
     # Set of operations we encounter that we don't know how to handle
     not_implemented_ops: Set[str] = field(default_factory=set)
+    # The instructions of the code, which are computed from it if they are
+    # not passed in
+    code_instructions: Optional[CodeInstructions] = None
 
     # Mapping of each code object that was passed in to its instructions,
     # by offset, so we can quickly look up what instruction we are looking at
-    code_to_offset_to_instruction: Dict[
-        CodeType, Dict[int, Instruction]
+    code_to_offset_to_instruction: Mapping[
+        CodeType, Mapping[int, Instruction]
     ] = field(init=False)
+    # For each code object, whether the instruction at each offset, divided
+    # by 2, is yet to be traced, so that we only trace each bytecode once
+    # (for performance reasons)
+    code_to_unvisited: Dict[CodeType, bytearray] = field(init=False)
 
     # If set for the code object, then the previous bytecode instruction in the
     # frame for that code object had a function call, and during the next call,
@@ -52,62 +127,119 @@ class TraceFunc:
         default_factory=dict
     )
 
+    # Number of instructions left to trace in each code object which could
+    # record a function call. Once there are none, and none is waiting for
+    # its return value, the frames of the code object are no longer traced.
+    code_to_n_untraced_calls: Dict[CodeType, int] = field(init=False)
+
     def __post_init__(self, code):
-        self.code_to_offset_to_instruction = {
-            code: {i.offset: i for i in get_instructions(code)}
-            for code in all_code_objects(code)
+        if self.code_instructions is None:
+            self.code_instructions = CodeInstructions.from_code(code)
+        self.code_to_offset_to_instruction = (
+            self.code_instructions.code_to_offset_to_instruction
+        )
+        self.code_to_unvisited = {
+            code: bytearray(unvisited)
+            for code, unvisited in self.code_instructions.code_to_unvisited.items()
         }
+        self.code_to_n_untraced_calls = dict(
+            self.code_instructions.code_to_n_calls
+        )
 
     def __call__(self, frame, event, arg):
         # Exit early if the code object for this frame is not one of the code
         # objects that is contained in the source code passed in (i.e., specifically
         # in the current usecase, anything outside of the blackbox).
-        try:
-            offset_to_instruction = self.code_to_offset_to_instruction[
-                frame.f_code
-            ]
-        except KeyError:
+        code = frame.f_code
+        if code not in self.code_to_offset_to_instruction:
             return self
 
+        # Once every instruction of the code object that could call a
+        # function was traced, stop tracing its frames, so that the rest of a
+        # loop runs without callbacks.
+        if self.is_code_traced(code):
+            return self._stop_tracing(frame)
+
         # If it is one we want to trace, enable opcode tracing on it
         frame.f_trace_opcodes = True
         # If this is not an opcode event, ignore it
         if event != "opcode":
             return self
 
-        # Lookup the instruction we currently have based on the code object as
-        # well as the offset in that object
-        # Pop the instruction off the mapping, so that we only trace each bytecode once (for performance reasons)
-        try:
-            instruction = offset_to_instruction.pop(frame.f_lasti)
-        except KeyError:
-            return self
+        self.trace_instruction(frame, frame.f_lasti)
+        if self.is_code_traced(code):
+            return self._stop_tracing(frame)
+        return self
 
-        code = frame.f_code
-        offset = frame.f_lasti
+    def is_code_traced(self, code: CodeType) -> bool:
+        """
+        Whether all the instructions of the code object that could call a
+        function have been traced, and none is waiting for its return value.
 
-        # We want to see the name and the arg for the actual instruction, not
-        # the arg, so increment until we get to that
-        extended_arg_counter = 1
-        while instruction.opname == "EXTENDED_ARG":
-            offset += 2
-            extended_arg_counter += 1
-            instruction = self.code_to_offset_to_instruction[code][offset]
+        The other instructions can be left untraced, like the end of a loop
+        or the return at the end of the code, which only run after the loop.
+        """
+        return (
+            self.code_to_n_untraced_calls[code] == 0
+            and code not in self.code_to_return_value_callback
+        )
+
+    @staticmethod
+    def _stop_tracing(frame: FrameType) -> None:
+        # Returning None only turns off the local trace function for a "call"
+        # event, so clear it from the frame as well
+        frame.f_trace_opcodes = False
+        frame.f_trace_lines = False
+        frame.f_trace = None
+        return None
+
+    def trace_instruction(
+        self, frame: FrameType, offset: int, stack_depth: Optional[int] = None
+    ) -> None:
+        """
+        Records the function calls of the instruction at the offset, which is
+        about to run in the frame, and those of the previous instruction run
+        in the frame, if they were waiting for its return value.
+
+        :param stack_depth: The depth of the stack, when it is not saved in
+            the frame (see `OpStack`).
+        """
+        code = frame.f_code
+        offset_to_instruction = self.code_to_offset_to_instruction[code]
+        unvisited = self.code_to_unvisited[code]
+        # Mark the instruction as visited, so that we only trace each
+        # bytecode once (for performance reasons)
+        instruction = None
+        if unvisited[offset // 2]:
+            unvisited[offset // 2] = 0
+            instruction = offset_to_instruction[offset]
+        return_value_callback = self.code_to_return_value_callback.pop(
+            code, None
+        )
+        if instruction is None and return_value_callback is None:
+            return
 
         # Create an op stack around the frame so we can access the stack
-        op_stack = OpStack(frame)
+        op_stack = OpStack(frame, stack_depth)
 
         # If during last instruction we had some function call that needs a
         # return value, trigger the callback with the current
         # stack, so it can get the return value.
-        if code in self.code_to_return_value_callback:
-            return_value_callback = self.code_to_return_value_callback[code]
-            function_call = return_value_callback(op_stack, frame.f_lasti)
-            if isinstance(function_call, FunctionCall):
-                self.function_calls.append(function_call)
-            elif function_call:
-                self.function_calls.extend(function_call)
-            del self.code_to_return_value_callback[code]
+        # This is done even if the current instruction was already traced,
+        # since the previous one might not have been.
+        if return_value_callback is not None:
+            self._add_function_calls(return_value_callback(op_stack, offset))
+        if instruction is None:
+            return
+
+        # We want to see the name and the arg for the actual instruction, not
+        # the arg, so increment until we get to that
+        while instruction.opname == "EXTENDED_ARG":
+            offset += 2
+            unvisited[offset // 2] = 0
+            instruction = offset_to_instruction[offset]
+        if may_call_function(instruction):
+            self.code_to_n_untraced_calls[code] -= 1
 
         # Check if the current operation is a function call
         try:
@@ -116,8 +248,6 @@ class TraceFunc:
                 instruction.argval,
                 instruction.arg,
                 op_stack,
-                frame.f_lasti,
-                extended_arg_counter,
             )
         except NotImplementedError:
             self.not_implemented_ops.add(instruction.opname)
@@ -127,12 +257,74 @@ class TraceFunc:
         if callable(possible_function_call):
             self.code_to_return_value_callback[code] = possible_function_call
         # Otherwise, if we could resolve it fully now, add that to our function call
-        elif isinstance(possible_function_call, FunctionCall):
-            self.function_calls.append(possible_function_call)
-        elif possible_function_call:
-            self.function_calls.extend(possible_function_call)
+        else:
+            self._add_function_calls(possible_function_call)
 
-        return self
+    def _add_function_calls(
+        self, function_calls: Union[FunctionCall, None, Iterable[FunctionCall]]
+    ) -> None:
+        if isinstance(function_calls, FunctionCall):
+            self.function_calls.append(function_calls)
+        elif function_calls:
+            self.function_calls.extend(function_calls)
+
+
+def instructions_by_offset(code: CodeType) -> Dict[int, Instruction]:
+    """
+    Returns the instructions of the code object by offset.
+
+    On Python 3.11 and 3.12, the names of the keyword arguments of a ``CALL``
+    are not on the stack but set by the ``KW_NAMES`` instruction right before
+    it, so they are moved to the ``argval`` of the ``CALL``.
+    """
+    offset_to_instruction = {}
+    kw_names: Tuple[str, ...] = ()
+    for instruction in get_instructions(code):
+        if instruction.opname == "KW_NAMES":
+            # dis only resolves the constant from Python 3.12
+            kw_names = code.co_consts[instruction.arg]
+        elif instruction.opname == "CALL":
+            instruction = instruction._replace(argval=kw_names)
+            kw_names = ()
+        offset_to_instruction[instruction.offset] = instruction
+    return offset_to_instruction
+
+
+def next_offsets(
+    offset_to_instruction: Mapping[int, Instruction]
+) -> Dict[int, Tuple[int, ...]]:
+    """
+    Returns the offsets of the instructions which can run right after each
+    instruction, skipping `EXTENDED_ARG`, whose events are ignored.
+    """
+    instructions = list(offset_to_instruction.values())
+    # The offset of the instruction which each EXTENDED_ARG extends
+    extended: Dict[int, int] = {}
+    for instruction in reversed(instructions):
+        extended[instruction.offset] = (
+            extended[instruction.offset + 2]
+            if instruction.opname == "EXTENDED_ARG"
+            else instruction.offset
+        )
+    offset_to_next_offsets = {}
+    for i, instruction in enumerate(instructions):
+        offsets = []
+        if i + 1 < len(instructions):
+            offsets.append(extended[instructions[i + 1].offset])
+        if instruction.opcode in JUMPS:
+            offsets.append(extended[instruction.argval])
+        offset_to_next_offsets[instruction.offset] = tuple(offsets)
+    return offset_to_next_offsets
+
+
+def may_call_function(instruction: Instruction) -> bool:
+    """
+    Whether tracing the instruction could record a function call.
+    """
+    return (
+        instruction.opname not in NOT_FUNCTION_CALLS
+        and instruction.opname != "EXTENDED_ARG"
+    )
 
 
 # Bytecode operations that are not function calls
@@ -188,6 +380,43 @@ NOT_FUNCTION_CALLS = {
     "SETUP_LOOP",
     "END_FINALLY",
     "POP_FINALLY",
+    # Python 3.11+
+    "RESUME",
+    "CACHE",
+    "PUSH_NULL",
+    "PRECALL",
+    "KW_NAMES",
+    "MAKE_CELL",
+    "COPY_FREE_VARS",
+    "RETURN_GENERATOR",
+    "PUSH_EXC_INFO",
+    "CHECK_EXC_MATCH",
+    "JUMP_BACKWARD",
+    "JUMP_BACKWARD_NO_INTERRUPT",
+    "POP_JUMP_IF_NONE",
+    "POP_JUMP_IF_NOT_NONE",
+    "POP_JUMP_FORWARD_IF_TRUE",
+    "POP_JUMP_FORWARD_IF_FALSE",
+    "POP_JUMP_FORWARD_IF_NONE",
+    "POP_JUMP_FORWARD_IF_NOT_NONE",
+    "POP_JUMP_BACKWARD_IF_TRUE",
+    "POP_JUMP_BACKWARD_IF_FALSE",
+    "POP_JUMP_BACKWARD_IF_NONE",
+    "POP_JUMP_BACKWARD_IF_NOT_NONE",
+    # Python 3.12+
+    "RETURN_CONST",
+    "END_FOR",
+    "LOAD_FAST_CHECK",
+    "LOAD_FAST_AND_CLEAR",
+    "LOAD_FROM_DICT_OR_DEREF",
+    "LOAD_FROM_DICT_OR_GLOBALS",
+    "LOAD_LOCALS",
+    # Python 3.13+
+    "LOAD_FAST_LOAD_FAST",
+    "STORE_FAST_LOAD_FAST",
+    "STORE_FAST_STORE_FAST",
+    "SET_FUNCTION_ATTRIBUTE",
+    "TO_BOOL",
 }
 
 UNARY_OPERATORS = {
@@ -229,6 +458,55 @@ BINARY_OPERATIONS = {
     "INPLACE_OR": operator.ior,
 }
 
+# Operators of BINARY_OP in Python 3.11+, by its arg, in the order of
+# dis._nb_ops
+BINARY_OP_OPERATORS = [
+    operator.add,
+    operator.and_,
+    operator.floordiv,
+    operator.lshift,
+    operator.matmul,
+    operator.mul,
+    operator.mod,
+    operator.or_,
+    operator.pow,
+    operator.rshift,
+    operator.sub,
+    operator.truediv,
+    operator.xor,
+    # Inplace
+    operator.iadd,
+    operator.iand,
+    operator.ifloordiv,
+    operator.ilshift,
+    operator.imatmul,
+    operator.imul,
+    operator.imod,
+    operator.ior,
+    operator.ipow,
+    operator.irshift,
+    operator.isub,
+    operator.itruediv,
+    operator.ixor,
+]
+
+# Functions of CALL_INTRINSIC_1, in Python 3.12+, by its arg
+INTRINSIC_1_FUNCTIONS: Dict[int, Callable] = {
+    # INTRINSIC_UNARY_POSITIVE
+    5: operator.pos,
+    # INTRINSIC_LIST_TO_TUPLE
+    6: tuple,
+}
+# Converts StopIteration raised in generators to RuntimeError
+INTRINSIC_STOPITERATION_ERROR = 3
+
+# Stands for a NULL item on the stack
+NULL = object()
+
+# Set on the types of functions which Python 3.11+ loads unbound, with self
+# pushed separately, when calling a method (Py_TPFLAGS_METHOD_DESCRIPTOR)
+METHOD_DESCRIPTOR_FLAG = 1 << 17
+
 
 def compose(f, g):
     return lambda *a, **kw: f(g(*a, **kw))
@@ -313,8 +591,6 @@ def resolve_bytecode_execution(
     value: Any,
     arg: Optional[int],
     stack: OpStack,
-    offset: int,
-    extended_arg_count: int,
 ) -> Union[Iterable[FunctionCall], ReturnValueCallback, FunctionCall, None]:
     """
     Returns a function call corresponding to the bytecode executing on the current stack.
@@ -341,6 +617,40 @@ def resolve_bytecode_execution(
         return lambda post_stack, _: FunctionCall(
             BINARY_OPERATIONS[name], args, {}, post_stack[-1]
         )
+    if name == "BINARY_OP":
+        # Python 3.11+ replaces the binary and inplace operations with one,
+        # whose arg is the operator.
+        args = [stack[-2], stack[-1]]
+        fn = BINARY_OP_OPERATORS[cast(int, arg)]
+        return lambda post_stack, _: FunctionCall(fn, args, {}, post_stack[-1])
+    if name == "BINARY_SLICE":
+        # Implements ``TOS = TOS2[TOS1:TOS]``, on Python 3.12+.
+        container, start, end = stack[-3], stack[-2], stack[-1]
+        slice_ = slice(start, end)
+        return lambda post_stack, _: [
+            FunctionCall(slice, [start, end], res=slice_),
+            FunctionCall(
+                operator.getitem, [container, slice_], res=post_stack[-1]
+            ),
+        ]
+    if name == "STORE_SLICE":
+        # Implements ``TOS2[TOS1:TOS] = TOS3``, on Python 3.12+.
+        slice_ = slice(stack[-2], stack[-1])
+        return [
+            FunctionCall(slice, [stack[-2], stack[-1]], res=slice_),
+            FunctionCall(operator.setitem, [stack[-3], slice_, stack[-4]]),
+        ]
+    if name == "CALL_INTRINSIC_1":
+        # Python 3.12+ moved some rare operations to intrinsic functions,
+        # chosen by the arg.
+        if arg == INTRINSIC_STOPITERATION_ERROR:
+            return None
+        if arg not in INTRINSIC_1_FUNCTIONS:
+            raise NotImplementedError()
+        args = [stack[-1]]
+        return lambda post_stack, _: FunctionCall(
+            INTRINSIC_1_FUNCTIONS[cast(int, arg)], args, res=post_stack[-1]
+        )
     if name == "FOR_ITER":
         """
         From the original Python source code documentation:
@@ -349,10 +659,10 @@ def resolve_bytecode_execution(
         # it).  If the iterator indicates it is exhausted, TOS is popped, and the byte
         # code counter is incremented by *delta*.
 
-        We need to handle the case when the code body is large and needs
-        `EXTENDED_ARG`, this breaks the assumption that the offset will increase
-        by 2, so we have the count of extended_arg passed in as traced by the caller
-        and count with that instead.
+        The next instruction is either the start of the loop body, right
+        after, or the jump target, *value*, after the loop body. We can't
+        rely on the offset increasing by 2, since the code body may be large
+        and need `EXTENDED_ARG`, and Python 3.12+ adds cache entries:
         ```
         >>> large_for_loop_code = "for _ in x:\n  i = 1\n" + "  j = i\n" * 100
         >>> dis.dis(large_for_loop_code)
@@ -366,7 +676,7 @@ def resolve_bytecode_execution(
         ```
 
         So we translated to:
-        If the current instruction is the next one (i.e. the offset has increased by 2), then we didn't jump,
+        If the next instruction is before the jump target, then we didn't jump,
         meaning the iterator was not exhausted. Otherwise, we did jump, and it was, so don't add a function call for this.
 
         Note tha if we start handling exception, we should edit how we are
@@ -379,7 +689,7 @@ def resolve_bytecode_execution(
             lambda post_stack, post_offset: FunctionCall(
                 next, args, {}, post_stack[-1]
             )
-            if post_offset == offset + 2 * extended_arg_count
+            if post_offset < value
             else None
         )
     if name == "STORE_SUBSCR":
@@ -413,11 +723,19 @@ def resolve_bytecode_execution(
         # items on the stack as arguments.
         # Used to implement the call ``context_manager.__exit__(*exc_info())`` when an exception
         # has occurred in a :keyword:`with` statement.
-        fn = stack[-7]
-        args = [stack[-1], stack[-2], stack[-3]]
+        if version_info >= (3, 11):
+            # Only the exception is on the stack, with the function in
+            # position 4
+            fn = stack[-4]
+            exc = stack[-1]
+            args = [type(exc), exc, exc.__traceback__]
+        else:
+            fn = stack[-7]
+            args = [stack[-1], stack[-2], stack[-3]]
         return lambda post_stack, _: FunctionCall(fn, args, res=post_stack[-1])
 
-    if name == "SETUP_WITH":
+    # BEFORE_WITH replaces SETUP_WITH in Python 3.11+
+    if name in {"SETUP_WITH", "BEFORE_WITH"}:
         # This opcode performs several operations before a with block starts.  First,
         # it loads `__exit__` from the context manager and pushes it onto
         # the stack for later use by `WITH_EXCEPT_START`.  Then,
@@ -639,6 +957,9 @@ def resolve_bytecode_execution(
         return FunctionCall(getattr(stack[-value - 1], "update"), [stack[-1]])
 
     if name == "LOAD_ATTR":
+        # In Python 3.12+, this also loads methods, like LOAD_METHOD did
+        if version_info >= (3, 12) and cast(int, arg) & 1:
+            return None
         o = stack[-1]
         return lambda post_stack, _: FunctionCall(
             getattr, [o, value], res=post_stack[-1]
@@ -703,15 +1024,18 @@ def resolve_bytecode_execution(
         # the only case that we cannot handle is an generator that exhausts
         #   then `raise NotImplementedError()`
         # The way we figure out if something is an iterator without accidentally calling .next, is to check whether it's a Sequence, since a generator doesn't have __getitem__ (the streaming/lazy semantic) https://docs.python.org/3/library/collections.abc.html#collections-abstract-base-classes
+        # In Python 3.13+, NULL is pushed after the function rather than before
+        fn_position = 3 if version_info >= (3, 13) else 2
         if cast(int, arg) & 0x01:
             # then it's kwargs
             kwargs = stack[-1]
             args = stack[-2]
-            fn = stack[-3]
+            fn = stack[-fn_position - 1]
         else:
             # then it's positional
+            kwargs = {}
             args = stack[-1]
-            fn = stack[-2]
+            fn = stack[-fn_position]
         # check if the function is a generator
         if not isinstance(args, Sequence):
             raise NotImplementedError()
@@ -738,6 +1062,56 @@ def resolve_bytecode_execution(
             fn = getattr(self_, method.__name__)
         return lambda post_stack, _: FunctionCall(fn, args, res=post_stack[-1])
 
+    if name in {"CALL", "CALL_KW"}:
+        # Calls a callable object with *argc* arguments, in Python 3.11+.
+        # Below the arguments are two items: in Python 3.11 and 3.12, either
+        # ``NULL`` and the callable object, or an unbound method and ``self``,
+        # and in Python 3.13+, either the callable object and ``NULL``, or an
+        # unbound method and ``self``.
+        # The last arguments are keyword arguments, whose names are in
+        # *value* (see `instructions_by_offset`), or on top of the stack for
+        # ``CALL_KW``.
+        if name == "CALL_KW":
+            kwarg_names = stack[-1]
+            top = 2
+        else:
+            kwarg_names = value
+            top = 1
+        n_args = cast(int, arg)
+        args = [stack[-i - top] for i in reversed(range(n_args))]
+        kwargs = dict(zip(kwarg_names, args[n_args - len(kwarg_names) :]))
+        args = args[: n_args - len(kwarg_names)]
+        if version_info >= (3, 13):
+            fn = stack[-n_args - top - 1]
+            try:
+                self_ = stack[-n_args - top]
+            # This is raised when it is NULL
+            except ValueError:
+                self_ = NULL
+        else:
+            try:
+                fn = stack[-n_args - top - 1]
+            except ValueError:
+                fn = stack[-n_args - top]
+                self_ = NULL
+            else:
+                self_ = stack[-n_args - top]
+        if self_ is not NULL:
+            # Bind the method, so we record the same call as with
+            # CALL_METHOD, instead of a call with self as the first argument.
+            # The same items are pushed for other calls with an extra first
+            # argument, like the call to a generator expression, so check that
+            # the function was loaded from the type of self.
+            if type(fn).__flags__ & METHOD_DESCRIPTOR_FLAG and (
+                getattr(type(self_), fn.__name__, None) is fn
+            ):
+                fn = fn.__get__(self_, type(self_))  # type: ignore
+            else:
+                args.insert(0, self_)
+        return lambda post_stack, _: FunctionCall(
+            fn, args, kwargs, post_stack[-1]
+        )
+
     if name == "BUILD_SLICE":
         # Pushes a slice object on the stack.  *argc* must be 2 or 3.  If it is 2,
         # ``slice(TOS1, TOS)`` is pushed; if it is 3, ``slice(TOS2, TOS1, TOS)`` is
@@ -804,6 +1178,24 @@ def resolve_bytecode_execution(
                 )
             ]
         )
+    # Python 3.13+ splits FORMAT_VALUE into CONVERT_VALUE, FORMAT_SIMPLE and
+    # FORMAT_WITH_SPEC
+    if name == "CONVERT_VALUE":
+        # *value* is the conversion function, str, repr or ascii
+        args = [stack[-1]]
+        return lambda post_stack, _: FunctionCall(
+            value, args, res=post_stack[-1]
+        )
+    if name == "FORMAT_SIMPLE":
+        args = [stack[-1], None]
+        return lambda post_stack, _: FunctionCall(
+            format, args, res=post_stack[-1]
+        )
+    if name == "FORMAT_WITH_SPEC":
+        args = [stack[-2], stack[-1]]
+        return lambda post_stack, _: FunctionCall(
+            format, args, res=post_stack[-1]
+        )
     raise NotImplementedError()
 
 
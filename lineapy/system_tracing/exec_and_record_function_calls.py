@@ -1,15 +1,36 @@
 import logging
-from sys import gettrace, settrace
+import sys
+from functools import lru_cache
+from sys import gettrace, settrace, version_info
 from types import CodeType
-from typing import Dict
+from typing import Any, Dict, Optional, Tuple, cast
 
-from lineapy.system_tracing._trace_func import TraceFunc
+from lineapy.system_tracing._trace_func import CodeInstructions, TraceFunc
+from lineapy.utils.constants import COMPILED_CODE_CACHE_SIZE
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=COMPILED_CODE_CACHE_SIZE)
+def compile_traced_code(
+    source: str, path: str, first_line: int
+) -> Tuple[CodeType, CodeInstructions]:
+    """
+    Compiles the source code, starting at the first line of the file at the
+    path, and analyzes its instructions for `exec_and_record_function_calls`.
+
+    Both are cached, since the same statements are executed again, for
+    example when re-executing an artifact or a slice.
+    """
+    # Pad the code with extra lines, so that the line numbers match up
+    code = compile((first_line - 1) * "\n" + source, path, "exec")
+    return code, CodeInstructions.from_code(code)
+
+
 def exec_and_record_function_calls(
-    code: CodeType, globals_: Dict[str, object]
+    code: CodeType,
+    globals_: Dict[str, object],
+    code_instructions: Optional[CodeInstructions] = None,
 ) -> TraceFunc:
     """
     Execute the code while recording all the function calls which originate from the code object.
@@ -20,10 +41,19 @@ def exec_and_record_function_calls(
     However, to ensure LineaPy works correctly while debugging using VSCode, we first capture any
     existing tracers using sys.gettrace(), perform our analysis using the LineaPy tracer, and reset
     the existing tracer using sys.settrace()
+
+    On Python 3.12+, we use sys.monitoring instead (see `exec_and_monitor`),
+    which doesn't replace existing tracers.
+
+    :param code_instructions: The instructions of the code, if they were
+        already analyzed (see `compile_traced_code`).
     """
     logger.debug("Executing code")
+    trace_func = TraceFunc(code, code_instructions=code_instructions)
+    if version_info >= (3, 12):
+        exec_and_monitor(code, globals_, trace_func)
+        return trace_func
     original_trace = gettrace()
-    trace_func = TraceFunc(code)
     try:
         settrace(trace_func)
         exec(code, globals_)
@@ -31,3 +61,78 @@ def exec_and_record_function_calls(
     finally:
         settrace(original_trace)
     return trace_func
+
+
+def exec_and_monitor(
+    code: CodeType, globals_: Dict[str, object], trace_func: TraceFunc
+) -> None:
+    """
+    Execute the code while recording its function calls in the trace
+    function, with sys.monitoring (PEP 669), on Python 3.12+.
+
+    Instruction events are only turned on for the code objects we trace, and
+    each instruction is disabled once it has been recorded, since we only
+    record it once anyway. So a loop is only traced during its first
+    iteration, and then runs at full speed.
+    """
+    monitoring = sys.monitoring  # type: ignore
+    tool_id = next(
+        (i for i in range(6) if monitoring.get_tool(i) is None), None
+    )
+    if tool_id is None:
+        raise RuntimeError("No free sys.monitoring tool ID to record with")
+
+    code_instructions = cast(CodeInstructions, trace_func.code_instructions)
+    code_to_offset_to_instruction = trace_func.code_to_offset_to_instruction
+    code_to_unvisited = trace_func.code_to_unvisited
+    # The stack pointer isn't saved in the frame before instruction events,
+    # so we pass the depth of the stack in
+    code_to_stack_depths = code_instructions.code_to_stack_depths
+    code_to_next_offsets = code_instructions.code_to_next_offsets
+    code_to_return_value_callback = trace_func.code_to_return_value_callback
+
+    def record_instruction(code: CodeType, offset: int) -> Any:
+        unvisited = code_to_unvisited[code]
+        if (
+            not unvisited[offset // 2]
+            and code not in code_to_return_value_callback
+        ) or (
+            # The instruction after it has its own event, with the same stack
+            unvisited[offset // 2]
+            and code_to_offset_to_instruction[code][offset].opname
+            == "EXTENDED_ARG"
+        ):
+            return monitoring.DISABLE
+        trace_func.trace_instruction(
+            sys._getframe(1), offset, code_to_stack_depths[code].get(offset)
+        )
+        # If the instruction waits for the next one for its return value,
+        # but that one was already recorded and disabled, enable it again
+        if code in code_to_return_value_callback and any(
+            not unvisited[next_offset // 2]
+            for next_offset in code_to_next_offsets[code][offset]
+        ):
+            monitoring.restart_events()
+        return monitoring.DISABLE
+
+    monitoring.use_tool_id(tool_id, "lineapy")
+    try:
+        monitoring.register_callback(
+            tool_id, monitoring.events.INSTRUCTION, record_instruction
+        )
+        for traced_code in code_to_offset_to_instruction:
+            monitoring.set_local_events(
+                tool_id, traced_code, monitoring.events.INSTRUCTION
+            )
+        # Instructions of these code objects might still be disabled from a
+        # previous run
+        monitoring.restart_events()
+        exec(code, globals_)
+    # Always stop monitoring even if exception raised
+    finally:
+        for traced_code in code_to_offset_to_instruction:
+            monitoring.set_local_events(tool_id, traced_code, 0)
+        monitoring.register_callback(
+            tool_id, monitoring.events.INSTRUCTION, None
+        )
+        monitoring.free_tool_id(tool_id)
@@ -12,6 +12,7 @@ from lineapy.transformer.base_transformer import BaseTransformer
 from lineapy.transformer.node_transformer import NodeTransformer
 from lineapy.transformer.py37_transformer import Py37Transformer
 from lineapy.transformer.py38_transformer import Py38Transformer
+from lineapy.utils.config import options
 from lineapy.utils.utils import get_new_id
 
 logger = logging.getLogger(__name__)
@@ -42,6 +43,10 @@ def transform(
 
     """
 
+    # surface any failed background write from the previous cell before
+    # tracing more on top of it
+    tracer.db.check_background_writes()
+
     # create sourcecode object and register source code to db
     src = SourceCode(id=get_new_id(), code=code, location=location)
     tracer.db.write_source_code(src)
@@ -92,7 +97,15 @@ def transform(
 
     # walk the parsed tree through every transformer in the list
     if len(tree.body) > 0:
+        release_values = (
+            str(options.get("release_unreachable_values")).lower() == "true"
+        )
         for stmt in tree.body:
+            if release_values:
+                # Release before each statement instead of after it, so the
+                # values of the last statement are kept, since they are read
+                # to display the result of a cell.
+                tracer.release_unreachable_values()
             res = None
             for trans in transformers:
 
@@ -109,7 +122,9 @@ def transform(
                 )
             last_statement_result = res
 
-        tracer.db.commit()
+        # don't wait on a background writer, its errors are raised at the
+        # start of the next cell or on the next read
+        tracer.db.commit(wait=False)
         return last_statement_result
 
     return None
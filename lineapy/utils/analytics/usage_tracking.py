@@ -17,9 +17,6 @@ import uuid
 from functools import lru_cache
 from pathlib import Path
 
-import requests
-from IPython import get_ipython
-
 from lineapy.utils.analytics.event_schemas import TagEvent, TrackingEvent
 from lineapy.utils.config import options
 from lineapy.utils.version import __version__
@@ -43,6 +40,10 @@ def _py_version() -> str:
 
 @lru_cache(maxsize=1)
 def _runtime() -> str:
+    # IPython and requests are only imported once an event is tracked,
+    # they are slow to import and not needed otherwise
+    from IPython import get_ipython
+
     if get_ipython() is None:
         runtime = "non-ipython"
     else:
@@ -126,6 +127,8 @@ def do_not_track() -> bool:
 
 
 def _send_amplitude_event(event_type: str, event_properties: dict):
+    import requests
+
     events = [
         {
             "event_type": event_type,
@@ -54,6 +54,18 @@ class lineapy_config:
     :param mlflow_tracking_uri: URI for MLflow tracking
     :param default_ml_models_storage_backend: Default storage backend if
         at least one of mlflow_tracking_uri or mlflow_registry_uri is not empty
+    :param db_write_behind: queue graph writes and commit them in batches at
+        cell/script boundaries instead of once per node
+    :param db_background_writer: persist traced nodes on a background thread
+        instead of on the critical path of the user's code
+    :param artifact_storage_dedup: save artifact values to a content-addressed
+        chunk store, so identical data is only stored once
+    :param release_unreachable_values: drop the values of traced nodes once
+        no variable refers to them anymore, instead of keeping every value
+        computed in the session in memory
+    :param reuse_unchanged_cells: when a notebook cell is re-run with the
+        same code, and the variables it reads are unchanged, execute the
+        nodes it traced before again instead of tracing it anew
     """
 
     home_dir: Path
@@ -67,6 +79,11 @@ class lineapy_config:
     mlflow_registry_uri: Optional[str]
     mlflow_tracking_uri: Optional[str]
     default_ml_models_storage_backend: Optional[ARTIFACT_STORAGE_BACKEND]
+    db_write_behind: bool
+    db_background_writer: bool
+    artifact_storage_dedup: bool
+    release_unreachable_values: bool
+    reuse_unchanged_cells: bool
 
     def __init__(
         self,
@@ -81,6 +98,11 @@ class lineapy_config:
         mlflow_registry_uri=None,
         mlflow_tracking_uri=None,
         default_ml_models_storage_backend=None,
+        db_write_behind=False,
+        db_background_writer=False,
+        artifact_storage_dedup=False,
+        release_unreachable_values=False,
+        reuse_unchanged_cells=False,
     ):
         if logging_level.isdigit():
             logging_level = logging._levelToName[int(logging_level)]
@@ -99,6 +121,11 @@ class lineapy_config:
         self.default_ml_models_storage_backend = (
             default_ml_models_storage_backend
         )
+        self.db_write_behind = db_write_behind
+        self.db_background_writer = db_background_writer
+        self.artifact_storage_dedup = artifact_storage_dedup
+        self.release_unreachable_values = release_unreachable_values
+        self.reuse_unchanged_cells = reuse_unchanged_cells
 
         # config file
         config_file_path = Path(
@@ -2,6 +2,39 @@ import operator
 
 SQLALCHEMY_ECHO = "SQLALCHEMY_ECHO"
 DB_SQLITE_PREFIX = "sqlite:///"
+# Max number of queued writes before RelationalLineaDB flushes in write-behind mode
+DB_WRITE_BEHIND_MAX_PENDING = 1000
+# Max number of queued writes before the background DB writer blocks the tracer
+DB_BACKGROUND_WRITER_MAX_QUEUE = 10000
+
+# Max total number of nodes of the session graphs kept in memory
+SESSION_GRAPH_CACHE_MAX_NODES = 100_000
+
+# Max number of statements executed by l_exec_statement whose compiled code
+# and instructions are kept in memory
+COMPILED_CODE_CACHE_SIZE = 1024
+
+# Max number of types whose mutability verdict is kept by is_mutable
+MUTABLE_TYPE_CACHE_SIZE = 1024
+
+# Content-addressed artifact storage
+# Size of the chunks a pickled artifact value is split into
+ARTIFACT_CHUNK_SIZE = 1024 * 1024
+# Folder (inside the artifact storage dir) holding chunks by their digest
+ARTIFACT_CHUNK_DIR = "chunks"
+# Suffix of the manifests stored in place of the pickle file
+ARTIFACT_MANIFEST_SUFFIX = ".manifest.json"
+# Max number of chunks read concurrently when loading an artifact value
+ARTIFACT_CHUNK_READ_WORKERS = 8
+
+# Modules whose functions and objects are only used on the main thread when
+# executing a graph in parallel, since they are bound to the thread they were
+# created on (sqlite3 connections) or share global state (pyplot's figures)
+PARALLEL_EXECUTION_MAIN_THREAD_MODULES = (
+    "sqlite3",
+    "_sqlite3",
+    "matplotlib.pyplot",
+)
 
 # Transformer related
 GET_ITEM = operator.__getitem__.__name__
@@ -18,6 +18,7 @@ from lineapy.editors.ipython_cell_storage import get_location_path
 from lineapy.exceptions.l_import_error import LImportError
 from lineapy.instrumentation.annotation_spec import ExternalState
 from lineapy.system_tracing.exec_and_record_function_calls import (
+    compile_traced_code,
     exec_and_record_function_calls,
 )
 
@@ -155,14 +156,15 @@ def l_exec_statement(code: str) -> None:
     source_location = context.node.source_location
     if source_location:
         location = source_location.source_code.location
-        # Pad the code with extra lines, so that the line numbers match up
-        code = (source_location.lineno - 1) * "\n" + code
         path = str(get_location_path(location))
+        first_line = source_location.lineno
     else:
         path = "<unknown>"
-    bytecode = compile(code, path, "exec")
+        first_line = 1
+    # Re-executions of the same statement reuse its code and instructions
+    bytecode, code_instructions = compile_traced_code(code, path, first_line)
     trace_fn = exec_and_record_function_calls(
-        bytecode, context.global_variables
+        bytecode, context.global_variables, code_instructions
     )
     # If we were able to understand all the opcode, then save the function calls, otherwise throw them away
     # and depend on the worst case assumptions
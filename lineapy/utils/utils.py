@@ -5,16 +5,6 @@ from uuid import uuid4
 
 from lineapy.data.types import LineaID, LiteralType, ValueType
 
-try:
-    import black
-except ImportError:
-    pass
-
-try:
-    import isort
-except ImportError:
-    pass
-
 
 def get_new_id() -> LineaID:
     # https://docs.python.org/3/library/uuid.html#module-uuid seems to use str
@@ -85,11 +75,21 @@ def get_value_type(val: Any) -> Optional[ValueType]:
 
 
 def prettify(code: str) -> str:
-    # Sort imports and move them to the top
-    if "isort" in sys.modules:
+    # isort and black are optional, and only imported the first time code
+    # is formatted since they are slow to import
+    try:
+        import isort
+    except ImportError:
+        pass
+    else:
+        # Sort imports and move them to the top
         code = isort.code(code, float_to_top=True, profile="black")
 
-    if "black" in sys.modules:
+    try:
+        import black
+    except ImportError:
+        pass
+    else:
         code = black.format_str(code, mode=black.Mode())
 
     return code
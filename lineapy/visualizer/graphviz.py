@@ -25,6 +25,7 @@ from lineapy.visualizer.visual_graph import (
     VisualEdge,
     VisualEdgeID,
     VisualEdgeType,
+    VisualGraph,
     VisualGraphOptions,
     VisualNode,
     VisualNodeType,
@@ -204,21 +205,28 @@ def get_color(tp: ColorableType, highlighted: bool) -> str:
 
 
 def to_graphviz(options: VisualGraphOptions) -> graphviz.Digraph:
-    dot = graphviz.Digraph(node_attr=NODE_STYLE, edge_attr=EDGE_STYLE)
-    dot.attr(**GRAPH_STYLE)
+    dot = new_digraph()
 
     add_legend(dot, options)
 
-    vg = to_visual_graph(options)
+    render_visual_graph(dot, to_visual_graph(options))
+
+    return dot
+
+
+def new_digraph() -> graphviz.Digraph:
+    dot = graphviz.Digraph(node_attr=NODE_STYLE, edge_attr=EDGE_STYLE)
+    dot.attr(**GRAPH_STYLE)
+    return dot
 
+
+def render_visual_graph(dot: graphviz.Digraph, vg: VisualGraph) -> None:
     for node in vg.nodes:
         render_node(dot, node)
 
     for edge in vg.edges:
         render_edge(dot, edge)
 
-    return dot
-
 
 def render_edge(dot, edge: VisualEdge) -> None:
     dot.edge(
@@ -0,0 +1,195 @@
+"""
+Visualization of a notebook session which is updated after every cell.
+
+Instead of laying out the whole graph again after each cell, every cell is
+laid out on its own, as a separate SVG, and the SVGs are cached. A cell is
+only rendered again when the artifacts or variables pointing to its nodes
+change, so updating the visualization after a cell usually only renders
+that cell.
+
+The nodes a cell depends on from other cells are repeated in its SVG, greyed
+out, since edges cannot be drawn between separate layouts.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import graphviz
+from IPython.display import HTML, DisplayObject
+
+from lineapy.data.types import LineaID, Node
+from lineapy.instrumentation.tracer import Tracer
+from lineapy.visualizer.graphviz import (
+    add_legend,
+    new_digraph,
+    render_visual_graph,
+)
+from lineapy.visualizer.visual_graph import (
+    ExtraLabels,
+    ExtraLabelType,
+    VisualGraph,
+    VisualGraphOptions,
+    VisualNode,
+    add_node,
+    add_source_code,
+    get_extra_labels,
+    process_node,
+)
+
+# What a cell's SVG depends on, the labels of each of its nodes
+CellKey = Tuple[Tuple[Tuple[str, ExtraLabelType], ...], ...]
+
+
+@dataclass
+class LiveVisualizer:
+    """
+    Keeps the nodes of a session grouped by the cell which traced them, and
+    the SVG last rendered for each cell.
+
+    Call `add_nodes` with the nodes traced by each cell, and then
+    `ipython_display_object` to get the updated visualization.
+    """
+
+    tracer: Tracer
+    # The nodes of each cell, by the ID of its source code, in execution
+    # order
+    _cells: Dict[LineaID, List[Node]] = field(default_factory=dict)
+    _nodes: Dict[LineaID, Node] = field(default_factory=dict)
+    # The key and the SVG last rendered for each cell
+    _svgs: Dict[LineaID, Tuple[CellKey, str]] = field(default_factory=dict)
+    _legend_svg: Optional[str] = None
+    _options: VisualGraphOptions = field(init=False)
+
+    def __post_init__(self) -> None:
+        graph = self.tracer.graph
+        self._options = VisualGraphOptions(
+            graph,
+            self.tracer,
+            highlight_node=None,
+            show_implied_mutations=False,
+            show_views=False,
+            show_artifacts=True,
+            show_variables=True,
+        )
+        self.add_nodes(sorted(graph.nodes, key=_trace_order))
+
+    def add_nodes(self, nodes: Iterable[Node]) -> None:
+        """
+        Adds nodes in the order they were traced, skipping those already
+        added.
+
+        Nodes without source code are not part of any cell, they are only
+        shown in the cells which use them.
+        """
+        for node in nodes:
+            if node.id in self._nodes:
+                continue
+            self._nodes[node.id] = node
+            if node.source_location is not None:
+                self._cells.setdefault(
+                    node.source_location.source_code.id, []
+                ).append(node)
+
+    def render_svgs(self) -> List[str]:
+        """
+        Returns the SVG of the legend and of each cell, only rendering the
+        cells which changed since they were last rendered.
+        """
+        if self._legend_svg is None:
+            dot = new_digraph()
+            add_legend(dot, self._options)
+            self._legend_svg = render_svg(dot)
+        id_to_extra_labels = get_extra_labels(self._options)
+        svgs = [self._legend_svg]
+        for cell_id, nodes in self._cells.items():
+            key = tuple(
+                tuple(
+                    (label.label, label.type)
+                    for label in id_to_extra_labels.get(node.id, [])
+                )
+                for node in nodes
+            )
+            cached = self._svgs.get(cell_id)
+            if cached is None or cached[0] != key:
+                dot = new_digraph()
+                render_visual_graph(
+                    dot, self._cell_visual_graph(nodes, id_to_extra_labels)
+                )
+                cached = self._svgs[cell_id] = (key, render_svg(dot))
+            svgs.append(cached[1])
+        return svgs
+
+    def _cell_visual_graph(
+        self, nodes: List[Node], id_to_extra_labels: Dict[str, ExtraLabels]
+    ) -> VisualGraph:
+        vg = VisualGraph()
+        for node in nodes:
+            add_node(vg, node, id_to_extra_labels[node.id], self._options)
+        add_source_code(vg, nodes)
+
+        # Repeat the parents from other cells, greyed out, and the nodes
+        # without source code
+        cell_ids = {node.id for node in nodes}
+        for edge in list(vg.edges):
+            parent_id = edge.source.node_id
+            if parent_id in cell_ids:
+                continue
+            cell_ids.add(parent_id)
+            parent = self._nodes.get(parent_id)
+            if parent is None:
+                continue
+            vg.node(
+                VisualNode(
+                    parent_id,
+                    parent.node_type,
+                    process_node(VisualGraph(), parent, self._options),
+                    [],
+                    highlighted=parent.source_location is None,
+                )
+            )
+        return vg
+
+    def ipython_display_object(self) -> DisplayObject:
+        cells = "".join(
+            f'<div class="svg_cell">{svg}</div>' for svg in self.render_svgs()
+        )
+        return HTML(
+            f"""
+            <div class="svg_container">
+                <style>
+                    .svg_container .svg_cell SVG {{
+                        max-width: 100%;
+                        height: auto;
+                    }}
+                </style>
+                {cells}
+            </div>
+        """
+        )
+
+
+def _trace_order(node: Node) -> Tuple[int, int, int]:
+    """
+    Sorts the nodes of a session by cell and then by position in the cell.
+    """
+    location = node.source_location
+    if location is None:
+        return (0, 0, 0)
+    return (
+        getattr(location.source_code.location, "execution_count", 0),
+        location.lineno,
+        location.col_offset,
+    )
+
+
+def render_svg(dot: graphviz.Digraph) -> str:
+    """
+    Lays out a graph as an SVG, to be inlined in HTML.
+
+    Unlike the whole graph, it is not optimized with scour, since the SVG of
+    a cell is small and starting scour would take longer than the layout.
+    """
+    svg = dot.pipe(format="svg").decode()
+    # Drop the XML declaration and doctype
+    return svg[svg.index("<svg") :]
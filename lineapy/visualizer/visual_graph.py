@@ -73,6 +73,59 @@ def to_visual_graph(options: VisualGraphOptions) -> VisualGraph:
     graph = options.graph
     vg = VisualGraph()
 
+    id_to_extra_labels = get_extra_labels(options)
+
+    # First add all the nodes from the session
+    for node in graph.nodes:
+        add_node(vg, node, id_to_extra_labels[node.id], options)
+
+    add_source_code(vg, graph.nodes)
+
+    # Then we can add all the additional information from the tracer
+    if options.show_implied_mutations:
+        if not tracer:
+            raise RuntimeError("Cannot show implied mutations without tracer")
+        # the mutate nodes
+        for source, mutate in tracer.mutation_tracker.source_to_mutate.items():
+            vg.edge(
+                VisualEdge(
+                    VisualEdgeID(source),
+                    VisualEdgeID(mutate),
+                    VisualEdgeType.LATEST_MUTATE_SOURCE,
+                )
+            )
+
+    if options.show_views:
+        if not tracer:
+            raise RuntimeError("Cannot show views without tracer")
+
+        # Create a set of unique pairs of viewers, where order doesn't matter
+        # Since they aren't directed
+        viewer_pairs: Set[FrozenSet[LineaID]] = {
+            frozenset([source, viewer])
+            for source, viewers in tracer.mutation_tracker.viewers.items()
+            for viewer in viewers
+        }
+        for source, target in viewer_pairs:
+            vg.edge(
+                VisualEdge(
+                    VisualEdgeID(source),
+                    VisualEdgeID(target),
+                    VisualEdgeType.VIEW,
+                )
+            )
+    if options.highlight_node:
+        vg.highlight_ancestors(options.highlight_node)
+    return vg
+
+
+def get_extra_labels(
+    options: VisualGraphOptions,
+) -> Dict[str, ExtraLabels]:
+    """
+    Returns the artifacts and variables to show next to each node.
+    """
+    tracer = options.tracer
     # We will create some mappings to start, so that we can add the
     # variables and artifacts to each node
 
@@ -92,18 +145,36 @@ def to_visual_graph(options: VisualGraphOptions) -> VisualGraph:
         for name, node in tracer.variable_name_to_node.items():
             id_to_variables[node.id].append(name)
 
-    # First add all the nodes from the session
-    for node in graph.nodes:
-        extra_labels = [
+    id_to_extra_labels: Dict[str, ExtraLabels] = defaultdict(list)
+    for id_, artifact_names in id_to_artifacts.items():
+        id_to_extra_labels[id_].extend(
             ExtraLabel(a or "Unnamed Artifact", ExtraLabelType.ARTIFACT)
-            for a in id_to_artifacts[node.id]
-        ] + [
-            ExtraLabel(v, ExtraLabelType.VARIABLE)
-            for v in id_to_variables[node.id]
-        ]
-        contents = process_node(vg, node, options)
-        vg.node(VisualNode(node.id, node.node_type, contents, extra_labels))
+            for a in artifact_names
+        )
+    for id_, variable_names in id_to_variables.items():
+        id_to_extra_labels[id_].extend(
+            ExtraLabel(v, ExtraLabelType.VARIABLE) for v in variable_names
+        )
+    return id_to_extra_labels
+
+
+def add_node(
+    vg: VisualGraph,
+    node: Node,
+    extra_labels: ExtraLabels,
+    options: VisualGraphOptions,
+) -> None:
+    """
+    Adds a node, and the edges from its parents.
+    """
+    contents = process_node(vg, node, options)
+    vg.node(VisualNode(node.id, node.node_type, contents, extra_labels))
+
 
+def add_source_code(vg: VisualGraph, nodes: Iterable[Node]) -> None:
+    """
+    Adds the source code lines of the nodes, with an edge to each node.
+    """
     # For now, our algorithm for making nodes based on source locations is:
     # 1. Whenever we encounter a node, if we haven't made a source code node
     #    for that pair of start and end lines, make one and add an edge
@@ -120,7 +191,7 @@ def to_visual_graph(options: VisualGraphOptions) -> VisualGraph:
     last_added_source_id: Optional[str] = None
 
     # Then add the source code nodes
-    for n in graph.nodes:
+    for n in nodes:
         source_location = n.source_location
         if not source_location:
             continue
@@ -154,42 +225,6 @@ def to_visual_graph(options: VisualGraphOptions) -> VisualGraph:
                 VisualEdgeType.SOURCE_CODE,
             )
         )
-    # Then we can add all the additional information from the tracer
-    if options.show_implied_mutations:
-        if not tracer:
-            raise RuntimeError("Cannot show implied mutations without tracer")
-        # the mutate nodes
-        for source, mutate in tracer.mutation_tracker.source_to_mutate.items():
-            vg.edge(
-                VisualEdge(
-                    VisualEdgeID(source),
-                    VisualEdgeID(mutate),
-                    VisualEdgeType.LATEST_MUTATE_SOURCE,
-                )
-            )
-
-    if options.show_views:
-        if not tracer:
-            raise RuntimeError("Cannot show views without tracer")
-
-        # Create a set of unique pairs of viewers, where order doesn't matter
-        # Since they aren't directed
-        viewer_pairs: Set[FrozenSet[LineaID]] = {
-            frozenset([source, viewer])
-            for source, viewers in tracer.mutation_tracker.viewers.items()
-            for viewer in viewers
-        }
-        for source, target in viewer_pairs:
-            vg.edge(
-                VisualEdge(
-                    VisualEdgeID(source),
-                    VisualEdgeID(target),
-                    VisualEdgeType.VIEW,
-                )
-            )
-    if options.highlight_node:
-        vg.highlight_ancestors(options.highlight_node)
-    return vg
 
 
 # TODO: Make single dispatch based on node type
@@ -126,12 +126,18 @@ s3_libs = ["boto3", "s3fs", "botocore"]
 
 mlflow_libs = ["mlflow"]
 
+columnar_libs = ["pyarrow"]
+
+export_libs = ["msgpack"]
+
 MINIMAL_REQUIRES = minimal_requirement
 INSTALL_REQUIRES = minimal_requirement + formatter_libs
 POSTGRES_REQUIRES = INSTALL_REQUIRES + postgres_libs
 GRAPH_REQUIRES = INSTALL_REQUIRES + graph_libs
 S3_REQUIRES = INSTALL_REQUIRES + s3_libs
 MLFLOW_REQUIRES = INSTALL_REQUIRES + mlflow_libs
+COLUMNAR_REQUIRES = INSTALL_REQUIRES + columnar_libs
+EXPORT_REQUIRES = INSTALL_REQUIRES + export_libs
 DEV_REQUIRES = (
     minimal_requirement
     + formatter_libs
@@ -145,6 +151,8 @@ DEV_REQUIRES = (
     + typing_libs
     + s3_libs
     + mlflow_libs
+    + columnar_libs
+    + export_libs
 )
 EXTRA_REQUIRES = {
     "dev": DEV_REQUIRES,
@@ -153,6 +161,8 @@ EXTRA_REQUIRES = {
     "minimal": MINIMAL_REQUIRES,
     "s3": S3_REQUIRES,
     "mlflow": MLFLOW_REQUIRES,
+    "columnar": COLUMNAR_REQUIRES,
+    "export": EXPORT_REQUIRES,
 }
 
 setup(
@@ -72,7 +72,7 @@ call_3 = CallNode(
     positional_args=[
         call_2.id,
         LiteralNode(
-            value=1,
+            value=0,
         ).id,
     ],
 )
@@ -90,7 +90,7 @@ call_4 = CallNode(
     positional_args=[
         call_2.id,
         LiteralNode(
-            value=0,
+            value=1,
         ).id,
     ],
 )
@@ -86,7 +86,7 @@ call_3 = CallNode(
         ).id,
     ],
 )
-call_4 = CallNode(
+call_5 = CallNode(
     source_location=SourceLocation(
         lineno=2,
         col_offset=0,
@@ -153,7 +153,7 @@ call_7 = CallNode(
     positional_args=[
         call_6.id,
         LiteralNode(
-            value=1,
+            value=0,
         ).id,
     ],
 )
@@ -171,7 +171,7 @@ call_8 = CallNode(
     positional_args=[
         call_6.id,
         LiteralNode(
-            value=0,
+            value=1,
         ).id,
     ],
 )
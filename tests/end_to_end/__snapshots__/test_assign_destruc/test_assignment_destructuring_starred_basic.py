@@ -103,7 +103,7 @@ call_4 = CallNode(
     positional_args=[
         call_2.id,
         LiteralNode(
-            value=2,
+            value=1,
         ).id,
     ],
 )
@@ -121,7 +121,7 @@ call_5 = CallNode(
     positional_args=[
         call_2.id,
         LiteralNode(
-            value=1,
+            value=2,
         ).id,
     ],
 )
@@ -75,7 +75,7 @@ call_3 = CallNode(
     positional_args=[
         call_2.id,
         LiteralNode(
-            value=1,
+            value=0,
         ).id,
     ],
 )
@@ -93,7 +93,7 @@ call_4 = CallNode(
     positional_args=[
         call_2.id,
         LiteralNode(
-            value=0,
+            value=1,
         ).id,
     ],
 )
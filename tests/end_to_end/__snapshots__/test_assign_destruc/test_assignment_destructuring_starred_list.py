@@ -95,7 +95,7 @@ call_3 = CallNode(
     positional_args=[
         call_2.id,
         LiteralNode(
-            value=2,
+            value=0,
         ).id,
     ],
 )
@@ -131,7 +131,7 @@ call_5 = CallNode(
     positional_args=[
         call_2.id,
         LiteralNode(
-            value=0,
+            value=2,
         ).id,
     ],
 )
@@ -83,7 +83,7 @@ call_3 = CallNode(
     positional_args=[
         call_2.id,
         LiteralNode(
-            value=1,
+            value=0,
         ).id,
     ],
 )
@@ -101,7 +101,7 @@ call_4 = CallNode(
     positional_args=[
         call_2.id,
         LiteralNode(
-            value=0,
+            value=1,
         ).id,
     ],
 )
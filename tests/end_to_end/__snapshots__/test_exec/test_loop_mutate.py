@@ -14,6 +14,18 @@ lineapy.save(xs, \'xs\')
 """,
     location=PosixPath("[source file path]"),
 )
+import_1 = ImportNode(
+    source_location=SourceLocation(
+        lineno=1,
+        col_offset=0,
+        end_lineno=1,
+        end_col_offset=14,
+        source_code=source_1.id,
+    ),
+    name="lineapy",
+    version="",
+    package_name="lineapy",
+)
 call_1 = CallNode(
     source_location=SourceLocation(
         lineno=1,
@@ -31,18 +43,6 @@ call_1 = CallNode(
         ).id
     ],
 )
-import_1 = ImportNode(
-    source_location=SourceLocation(
-        lineno=1,
-        col_offset=0,
-        end_lineno=1,
-        end_col_offset=14,
-        source_code=source_1.id,
-    ),
-    name="lineapy",
-    version="",
-    package_name="lineapy",
-)
 call_2 = CallNode(
     source_location=SourceLocation(
         lineno=2,
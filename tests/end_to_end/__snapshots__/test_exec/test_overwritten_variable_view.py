@@ -17,6 +17,18 @@ lineapy.save(y, \'y\')
 """,
     location=PosixPath("[source file path]"),
 )
+import_1 = ImportNode(
+    source_location=SourceLocation(
+        lineno=1,
+        col_offset=0,
+        end_lineno=1,
+        end_col_offset=14,
+        source_code=source_1.id,
+    ),
+    name="lineapy",
+    version="",
+    package_name="lineapy",
+)
 call_1 = CallNode(
     source_location=SourceLocation(
         lineno=1,
@@ -34,18 +46,6 @@ call_1 = CallNode(
         ).id
     ],
 )
-import_1 = ImportNode(
-    source_location=SourceLocation(
-        lineno=1,
-        col_offset=0,
-        end_lineno=1,
-        end_col_offset=14,
-        source_code=source_1.id,
-    ),
-    name="lineapy",
-    version="",
-    package_name="lineapy",
-)
 call_2 = CallNode(
     source_location=SourceLocation(
         lineno=2,
@@ -174,7 +174,7 @@ call_8 = CallNode(
         ).id
     ],
 )
-mutate_4 = MutateNode(
+mutate_6 = MutateNode(
     source_id=MutateNode(
         source_id=call_2.id,
         call_id=call_6.id,
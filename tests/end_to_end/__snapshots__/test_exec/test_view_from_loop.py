@@ -15,6 +15,18 @@ lineapy.save(xs, \'xs\')
 """,
     location=PosixPath("[source file path]"),
 )
+import_1 = ImportNode(
+    source_location=SourceLocation(
+        lineno=1,
+        col_offset=0,
+        end_lineno=1,
+        end_col_offset=14,
+        source_code=source_1.id,
+    ),
+    name="lineapy",
+    version="",
+    package_name="lineapy",
+)
 call_1 = CallNode(
     source_location=SourceLocation(
         lineno=1,
@@ -32,18 +44,6 @@ call_1 = CallNode(
         ).id
     ],
 )
-import_1 = ImportNode(
-    source_location=SourceLocation(
-        lineno=1,
-        col_offset=0,
-        end_lineno=1,
-        end_col_offset=14,
-        source_code=source_1.id,
-    ),
-    name="lineapy",
-    version="",
-    package_name="lineapy",
-)
 call_2 = CallNode(
     source_location=SourceLocation(
         lineno=2,
@@ -130,7 +130,7 @@ call_6 = CallNode(
         ).id
     ],
 )
-mutate_1 = MutateNode(
+mutate_2 = MutateNode(
     source_id=call_2.id,
     call_id=call_6.id,
 )
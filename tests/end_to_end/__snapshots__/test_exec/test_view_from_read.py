@@ -90,7 +90,7 @@ call_6 = CallNode(
         ).id
     ],
 )
-mutate_2 = MutateNode(
+mutate_3 = MutateNode(
     source_id=call_3.id,
     call_id=call_6.id,
 )
@@ -19,6 +19,18 @@ lineapy.save(clf, \'clf\')
 """,
     location=PosixPath("[source file path]"),
 )
+import_1 = ImportNode(
+    source_location=SourceLocation(
+        lineno=1,
+        col_offset=0,
+        end_lineno=1,
+        end_col_offset=14,
+        source_code=source_1.id,
+    ),
+    name="lineapy",
+    version="",
+    package_name="lineapy",
+)
 call_1 = CallNode(
     source_location=SourceLocation(
         lineno=1,
@@ -36,18 +48,6 @@ call_1 = CallNode(
         ).id
     ],
 )
-import_1 = ImportNode(
-    source_location=SourceLocation(
-        lineno=1,
-        col_offset=0,
-        end_lineno=1,
-        end_col_offset=14,
-        source_code=source_1.id,
-    ),
-    name="lineapy",
-    version="",
-    package_name="lineapy",
-)
 import_2 = ImportNode(
     source_location=SourceLocation(
         lineno=2,
@@ -77,6 +77,18 @@ call_2 = CallNode(
         ).id
     ],
 )
+import_3 = ImportNode(
+    source_location=SourceLocation(
+        lineno=3,
+        col_offset=0,
+        end_lineno=3,
+        end_col_offset=41,
+        source_code=source_1.id,
+    ),
+    name="sklearn.dummy",
+    version="",
+    package_name="sklearn",
+)
 call_3 = CallNode(
     source_location=SourceLocation(
         lineno=3,
@@ -94,18 +106,6 @@ call_3 = CallNode(
         ).id
     ],
 )
-import_3 = ImportNode(
-    source_location=SourceLocation(
-        lineno=3,
-        col_offset=0,
-        end_lineno=3,
-        end_col_offset=41,
-        source_code=source_1.id,
-    ),
-    name="sklearn.dummy",
-    version="",
-    package_name="sklearn",
-)
 call_4 = CallNode(
     source_location=SourceLocation(
         lineno=3,
@@ -407,7 +407,7 @@ call_17 = CallNode(
     ).id,
     positional_args=[call_9.id, call_12.id],
 )
-mutate_3 = MutateNode(
+mutate_4 = MutateNode(
     source_id=call_15.id,
     call_id=call_17.id,
 )
@@ -431,7 +431,7 @@ call_19 = CallNode(
             name="getattr",
         ).id,
         positional_args=[
-            mutate_3.id,
+            mutate_4.id,
             LiteralNode(
                 value="fit",
             ).id,
@@ -439,7 +439,7 @@ call_19 = CallNode(
     ).id,
     positional_args=[call_9.id, call_12.id],
 )
-mutate_5 = MutateNode(
+mutate_6 = MutateNode(
     source_id=call_17.id,
     call_id=call_19.id,
 )
@@ -471,7 +471,7 @@ call_21 = CallNode(
     ).id,
     positional_args=[
         MutateNode(
-            source_id=mutate_3.id,
+            source_id=mutate_4.id,
             call_id=call_19.id,
         ).id,
         LiteralNode(
@@ -10,6 +10,18 @@ new_img.save("test.png", "PNG")
 e = open("test.png")""",
     location=PosixPath("[source file path]"),
 )
+import_1 = ImportNode(
+    source_location=SourceLocation(
+        lineno=1,
+        col_offset=0,
+        end_lineno=1,
+        end_col_offset=31,
+        source_code=source_1.id,
+    ),
+    name="PIL.Image",
+    version="",
+    package_name="PIL.Image",
+)
 call_1 = CallNode(
     source_location=SourceLocation(
         lineno=1,
@@ -49,18 +61,6 @@ mutate_1 = MutateNode(
     source_id=call_1.id,
     call_id=call_2.id,
 )
-import_1 = ImportNode(
-    source_location=SourceLocation(
-        lineno=1,
-        col_offset=0,
-        end_lineno=1,
-        end_col_offset=31,
-        source_code=source_1.id,
-    ),
-    name="PIL.Image",
-    version="",
-    package_name="PIL.Image",
-)
 call_9 = CallNode(
     source_location=SourceLocation(
         lineno=4,
@@ -24,6 +24,18 @@ import_1 = ImportNode(
     version="",
     package_name="lineapy",
 )
+import_2 = ImportNode(
+    source_location=SourceLocation(
+        lineno=2,
+        col_offset=0,
+        end_lineno=2,
+        end_col_offset=31,
+        source_code=source_1.id,
+    ),
+    name="matplotlib.pyplot",
+    version="",
+    package_name="matplotlib",
+)
 call_2 = CallNode(
     source_location=SourceLocation(
         lineno=2,
@@ -41,18 +53,6 @@ call_2 = CallNode(
         ).id
     ],
 )
-import_2 = ImportNode(
-    source_location=SourceLocation(
-        lineno=2,
-        col_offset=0,
-        end_lineno=2,
-        end_col_offset=31,
-        source_code=source_1.id,
-    ),
-    name="matplotlib.pyplot",
-    version="",
-    package_name="matplotlib",
-)
 call_3 = CallNode(
     source_location=SourceLocation(
         lineno=2,
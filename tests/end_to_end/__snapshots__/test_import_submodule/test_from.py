@@ -90,16 +90,16 @@ call_4 = CallNode(
     ],
 )
 mutate_2 = MutateNode(
-    source_id=call_3.id,
-    call_id=call_4.id,
-)
-mutate_3 = MutateNode(
     source_id=MutateNode(
         source_id=call_2.id,
         call_id=call_3.id,
     ).id,
     call_id=call_4.id,
 )
+mutate_3 = MutateNode(
+    source_id=call_3.id,
+    call_id=call_4.id,
+)
 call_7 = CallNode(
     source_location=SourceLocation(
         lineno=5,
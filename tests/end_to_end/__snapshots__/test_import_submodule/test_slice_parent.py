@@ -90,7 +90,7 @@ call_4 = CallNode(
         call_3.id,
     ],
 )
-mutate_2 = MutateNode(
+mutate_3 = MutateNode(
     source_id=call_3.id,
     call_id=call_4.id,
 )
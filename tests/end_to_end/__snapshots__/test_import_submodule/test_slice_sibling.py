@@ -15,6 +15,18 @@ lineapy.save(second_is_prime, \'second_is_prime\')
 """,
     location=PosixPath("[source file path]"),
 )
+import_1 = ImportNode(
+    source_location=SourceLocation(
+        lineno=1,
+        col_offset=0,
+        end_lineno=1,
+        end_col_offset=14,
+        source_code=source_1.id,
+    ),
+    name="lineapy",
+    version="",
+    package_name="lineapy",
+)
 call_1 = CallNode(
     source_location=SourceLocation(
         lineno=1,
@@ -32,17 +44,17 @@ call_1 = CallNode(
         ).id
     ],
 )
-import_1 = ImportNode(
+import_2 = ImportNode(
     source_location=SourceLocation(
-        lineno=1,
+        lineno=2,
         col_offset=0,
-        end_lineno=1,
-        end_col_offset=14,
+        end_lineno=2,
+        end_col_offset=48,
         source_code=source_1.id,
     ),
-    name="lineapy",
+    name="import_data.utils.__no_imported_submodule",
     version="",
-    package_name="lineapy",
+    package_name="import_data",
 )
 call_2 = CallNode(
     source_location=SourceLocation(
@@ -79,18 +91,6 @@ call_3 = CallNode(
         call_2.id,
     ],
 )
-import_2 = ImportNode(
-    source_location=SourceLocation(
-        lineno=2,
-        col_offset=0,
-        end_lineno=2,
-        end_col_offset=48,
-        source_code=source_1.id,
-    ),
-    name="import_data.utils.__no_imported_submodule",
-    version="",
-    package_name="import_data",
-)
 call_4 = CallNode(
     source_location=SourceLocation(
         lineno=2,
@@ -109,10 +109,22 @@ call_4 = CallNode(
         call_3.id,
     ],
 )
-mutate_2 = MutateNode(
+mutate_3 = MutateNode(
     source_id=call_3.id,
     call_id=call_4.id,
 )
+import_3 = ImportNode(
+    source_location=SourceLocation(
+        lineno=3,
+        col_offset=0,
+        end_lineno=3,
+        end_col_offset=54,
+        source_code=source_1.id,
+    ),
+    name="import_data.utils.__no_imported_submodule_prime",
+    version="",
+    package_name="import_data",
+)
 call_5 = CallNode(
     source_location=SourceLocation(
         lineno=3,
@@ -128,7 +140,7 @@ call_5 = CallNode(
         LiteralNode(
             value="__no_imported_submodule_prime",
         ).id,
-        mutate_2.id,
+        mutate_3.id,
     ],
 )
 mutate_4 = MutateNode(
@@ -136,7 +148,7 @@ mutate_4 = MutateNode(
     call_id=call_5.id,
 )
 mutate_5 = MutateNode(
-    source_id=mutate_2.id,
+    source_id=mutate_3.id,
     call_id=call_5.id,
 )
 mutate_6 = MutateNode(
@@ -149,18 +161,6 @@ mutate_6 = MutateNode(
     ).id,
     call_id=call_5.id,
 )
-import_3 = ImportNode(
-    source_location=SourceLocation(
-        lineno=3,
-        col_offset=0,
-        end_lineno=3,
-        end_col_offset=54,
-        source_code=source_1.id,
-    ),
-    name="import_data.utils.__no_imported_submodule_prime",
-    version="",
-    package_name="import_data",
-)
 call_13 = CallNode(
     source_location=SourceLocation(
         lineno=7,
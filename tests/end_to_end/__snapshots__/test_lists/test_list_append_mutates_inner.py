@@ -95,7 +95,7 @@ call_5 = CallNode(
         ).id
     ],
 )
-mutate_2 = MutateNode(
+mutate_1 = MutateNode(
     source_id=CallNode(
         source_location=SourceLocation(
             lineno=3,
@@ -123,7 +123,7 @@ call_6 = CallNode(
         name="getitem",
     ).id,
     positional_args=[
-        mutate_2.id,
+        mutate_1.id,
         LiteralNode(
             source_location=SourceLocation(
                 lineno=5,
@@ -253,7 +253,7 @@ call_12 = CallNode(
     ).id,
     positional_args=[
         MutateNode(
-            source_id=mutate_2.id,
+            source_id=mutate_1.id,
             call_id=call_8.id,
         ).id,
         LiteralNode(
@@ -76,7 +76,7 @@ call_5 = CallNode(
         ).id
     ],
 )
-mutate_1 = MutateNode(
+mutate_2 = MutateNode(
     source_id=call_2.id,
     call_id=call_5.id,
 )
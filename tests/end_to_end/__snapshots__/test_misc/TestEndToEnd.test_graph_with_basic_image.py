@@ -46,6 +46,18 @@ import_2 = ImportNode(
     version="",
     package_name="pandas",
 )
+import_3 = ImportNode(
+    source_location=SourceLocation(
+        lineno=3,
+        col_offset=0,
+        end_lineno=3,
+        end_col_offset=31,
+        source_code=source_1.id,
+    ),
+    name="matplotlib.pyplot",
+    version="",
+    package_name="matplotlib",
+)
 call_3 = CallNode(
     source_location=SourceLocation(
         lineno=3,
@@ -63,18 +75,6 @@ call_3 = CallNode(
         ).id
     ],
 )
-import_3 = ImportNode(
-    source_location=SourceLocation(
-        lineno=3,
-        col_offset=0,
-        end_lineno=3,
-        end_col_offset=31,
-        source_code=source_1.id,
-    ),
-    name="matplotlib.pyplot",
-    version="",
-    package_name="matplotlib",
-)
 call_4 = CallNode(
     source_location=SourceLocation(
         lineno=3,
@@ -97,6 +97,18 @@ mutate_1 = MutateNode(
     source_id=call_3.id,
     call_id=call_4.id,
 )
+import_4 = ImportNode(
+    source_location=SourceLocation(
+        lineno=4,
+        col_offset=0,
+        end_lineno=4,
+        end_col_offset=26,
+        source_code=source_1.id,
+    ),
+    name="PIL.Image",
+    version="",
+    package_name="PIL.Image",
+)
 call_5 = CallNode(
     source_location=SourceLocation(
         lineno=4,
@@ -114,18 +126,6 @@ call_5 = CallNode(
         ).id
     ],
 )
-import_4 = ImportNode(
-    source_location=SourceLocation(
-        lineno=4,
-        col_offset=0,
-        end_lineno=4,
-        end_col_offset=26,
-        source_code=source_1.id,
-    ),
-    name="PIL.Image",
-    version="",
-    package_name="PIL.Image",
-)
 call_6 = CallNode(
     source_location=SourceLocation(
         lineno=4,
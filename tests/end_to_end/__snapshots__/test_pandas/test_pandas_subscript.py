@@ -306,11 +306,11 @@ call_13 = CallNode(
         ).id,
     ],
 )
-mutate_2 = MutateNode(
+mutate_1 = MutateNode(
     source_id=call_11.id,
     call_id=call_13.id,
 )
-mutate_3 = MutateNode(
+mutate_2 = MutateNode(
     source_id=call_10.id,
     call_id=call_13.id,
 )
@@ -96,7 +96,7 @@ call_5 = CallNode(
     positional_args=[
         call_4.id,
         LiteralNode(
-            value=1,
+            value=0,
         ).id,
     ],
 )
@@ -114,7 +114,7 @@ call_6 = CallNode(
     positional_args=[
         call_4.id,
         LiteralNode(
-            value=0,
+            value=1,
         ).id,
     ],
 )
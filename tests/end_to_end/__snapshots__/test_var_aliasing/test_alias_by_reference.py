@@ -97,7 +97,7 @@ call_4 = CallNode(
         ).id
     ],
 )
-mutate_1 = MutateNode(
+mutate_2 = MutateNode(
     source_id=call_1.id,
     call_id=call_4.id,
 )
@@ -122,7 +122,7 @@ call_5 = CallNode(
     function_id=LookupNode(
         name="contains",
     ).id,
-    positional_args=[mutate_1.id, literal_6.id],
+    positional_args=[mutate_2.id, literal_6.id],
 )
 call_7 = CallNode(
     source_location=SourceLocation(
@@ -147,7 +147,7 @@ call_7 = CallNode(
             function_id=LookupNode(
                 name="contains",
             ).id,
-            positional_args=[mutate_1.id, literal_6.id],
+            positional_args=[mutate_2.id, literal_6.id],
         ).id
     ],
 )
@@ -1,7 +1,12 @@
 import pickle
 from pathlib import Path
 
-from lineapy.api.artifact_serializer import _try_write_to_pickle
+from lineapy.api.api_utils import read_pickle
+from lineapy.api.artifact_serializer import (
+    _try_write_to_pickle,
+    serialize_artifact,
+)
+from lineapy.api.chunk_store import read_chunked_pickle, to_chunked_pickle
 from lineapy.api.models.linea_artifact import LineaArtifact
 from lineapy.utils.config import options
 
@@ -28,6 +33,7 @@ if True:
 
     slice_graph_artifact_res = full_graph_artifact.execute()
     assert slice_graph_artifact_res == res.values["x"]
+    assert full_graph_artifact.execute(parallel=True) == res.values["x"]
     assert (
         res.artifacts["x"]
         == """if True:
@@ -47,3 +53,31 @@ def test_write_to_pickle():
 
     with pickle_path.open("rb") as f:
         assert pickle.load(f) == 42
+
+
+def test_chunked_pickle_dedup(tmp_path):
+    value = list(range(100_000))
+    to_chunked_pickle(value, "a.manifest.json", tmp_path, chunk_size=4096)
+    chunks = {p for p in (tmp_path / "chunks").rglob("*") if p.is_file()}
+    assert len(chunks) > 1
+
+    # saving the same value again only writes a new manifest
+    to_chunked_pickle(value, "b.manifest.json", tmp_path, chunk_size=4096)
+    assert {
+        p for p in (tmp_path / "chunks").rglob("*") if p.is_file()
+    } == chunks
+    assert read_chunked_pickle("a.manifest.json", tmp_path) == value
+    assert read_chunked_pickle("b.manifest.json", tmp_path) == value
+
+
+def test_serialize_artifact_dedup():
+    options.set("artifact_storage_dedup", True)
+    try:
+        metadata = serialize_artifact(
+            "value_node_id", "execution_id", {"a": [1, 2]}, "dedup"
+        )
+    finally:
+        options.set("artifact_storage_dedup", False)
+    pickle_name = metadata["metadata"]["pickle_name"]
+    assert pickle_name.endswith(".manifest.json")
+    assert read_pickle(pickle_name) == {"a": [1, 2]}
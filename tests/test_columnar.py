@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+
+def test_save_get_delete_ndarray_to_columnar(execute):
+    """
+    Test columnar as backend storage for numpy arrays
+
+    Test the array is saved as .npy, read back memory-mapped, and deleted
+    with the artifact.
+    """
+    code = """
+import lineapy
+import numpy as np
+arr = np.arange(12, dtype="float64").reshape(3, 4)
+lineapy.save(arr, 'arr', storage_backend='columnar')
+
+art = lineapy.get('arr')
+loaded = art.get_value()
+metadata = art.get_metadata()
+
+lineapy.delete('arr', version=art.version)
+"""
+    res = execute(code, snapshot=False)
+
+    loaded = res.values["loaded"]
+    assert isinstance(loaded, np.memmap)
+    np.testing.assert_array_equal(loaded, res.values["arr"])
+
+    # copy-on-write, modifying the loaded value is allowed
+    loaded[0, 0] = -1
+
+    storage_path = res.values["metadata"]["lineapy"].storage_path
+    assert storage_path.endswith(".npy")
+    assert res.values["metadata"]["lineapy"].storage_backend == "columnar"
+
+
+def test_save_object_ndarray_falls_back_to_pickle(execute):
+    code = """
+import lineapy
+import numpy as np
+arr = np.array([1, "a", None], dtype=object)
+lineapy.save(arr, 'arr', storage_backend='columnar')
+
+art = lineapy.get('arr')
+loaded = art.get_value()
+metadata = art.get_metadata()
+"""
+    res = execute(code, snapshot=False)
+
+    np.testing.assert_array_equal(res.values["loaded"], res.values["arr"])
+    assert res.values["metadata"]["lineapy"].storage_backend == "lineapy"
+
+
+def test_save_get_dataframe_to_columnar(execute):
+    pytest.importorskip("pyarrow")
+    code = """
+import lineapy
+import pandas as pd
+df = pd.DataFrame({"a": [1, 2, 3], "b": [0.5, 1.5, 2.5], "c": ["x", "y", "z"]})
+lineapy.save(df, 'df', storage_backend='columnar')
+
+art = lineapy.get('df')
+loaded = art.get_value()
+metadata = art.get_metadata()
+"""
+    res = execute(code, snapshot=False)
+
+    assert res.values["loaded"].equals(res.values["df"])
+    assert res.values["metadata"]["lineapy"].storage_path.endswith(".arrow")
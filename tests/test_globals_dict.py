@@ -17,6 +17,13 @@ from lineapy.execution.globals_dict import GlobalsDict, GlobalsDictResult
         pytest.param(
             "x = 2\nx", {"x": 1}, [], {"x": 2}, id="read after write"
         ),
+        pytest.param(
+            "for _ in range(3):\n    y\n    x\n",
+            {"x": 1, "y": 2, "z": 3},
+            ["y", "x"],
+            {"_": 2},
+            id="repeated loads in access order",
+        ),
     ),
 )
 def test_results(
@@ -1,11 +1,14 @@
 import functools
 import shutil
+import time
 from typing import Callable
 
 import pytest
 from IPython.core.interactiveshell import InteractiveShell
 
 from lineapy import save
+from lineapy.editors import ipython
+from lineapy.utils.config import options
 
 
 def test_empty_cell(run_cell):
@@ -59,14 +62,10 @@ def airflow_py_module_path(run_cell, add_config):
 @pytest.mark.parametrize(
     "pipeline_file", ["a_module.py", "a_dag.py"], ids=["module", "dag"]
 )
-@pytest.mark.parametrize(
-    "add_config", [True, False], ids=["with_config", "no_config"]
-)
+@pytest.mark.parametrize("add_config", [True, False], ids=["with_config", "no_config"])
 @pytest.mark.slow
 def test_to_airflow(python_snapshot, airflow_py_module_path, pipeline_file):
-    assert (
-        python_snapshot == (airflow_py_module_path / pipeline_file).read_text()
-    )
+    assert python_snapshot == (airflow_py_module_path / pipeline_file).read_text()
 
 
 def test_get_value_artifact_inline(run_cell):
@@ -111,9 +110,7 @@ res = lineapy.get("deferencedy")
         == importl + code_body + artifact_f_save + "res.get_session_code()\n"
     )
     assert (
-        run_cell(
-            "res.db.get_session_context(res._session_id).environment_type.name"
-        )
+        run_cell("res.db.get_session_context(res._session_id).environment_type.name")
         == "JUPYTER"
     )
 
@@ -134,6 +131,53 @@ y = x + 1
     assert expected == out
 
 
+@pytest.fixture
+def reuse_unchanged_cells():
+    options.set("reuse_unchanged_cells", True)
+    try:
+        yield
+    finally:
+        options.set("reuse_unchanged_cells", False)
+
+
+def _n_nodes() -> int:
+    assert isinstance(ipython.STATE, ipython.CellsExecutedState)
+    tracer = ipython.STATE.tracer
+    return len(tracer.db.get_nodes_for_session(tracer.get_session_id()))
+
+
+def test_reuse_unchanged_cell(run_cell, reuse_unchanged_cells):
+    assert run_cell("x = [1]") is None
+    assert run_cell("y = x + [2]\ny") == [1, 2]
+    n_nodes = _n_nodes()
+    y = run_cell("y")
+    assert run_cell("y = x + [2]\ny") == [1, 2]
+    # The cell is executed again, without adding any nodes
+    assert run_cell("y") is not y
+    assert _n_nodes() == n_nodes
+
+
+def test_reuse_unchanged_cell_retraces_changed_reads(run_cell, reuse_unchanged_cells):
+    assert run_cell("x = [1]") is None
+    assert run_cell("y = x + [2]") is None
+    assert run_cell("x = [3]") is None
+    assert run_cell("y = x + [2]\ny") == [3, 2]
+    assert run_cell("x.append(4)") is None
+    assert run_cell("y = x + [2]\ny") == [3, 4, 2]
+    n_nodes = _n_nodes()
+    assert run_cell("y = x + [2]\ny") == [3, 4, 2]
+    assert _n_nodes() == n_nodes
+
+
+def test_reuse_unchanged_cell_retraces_control_flow(run_cell, reuse_unchanged_cells):
+    assert run_cell("x = 1") is None
+    code = "if x > 0:\n    y = 1\nelse:\n    y = 2\ny"
+    assert run_cell(code) == 1
+    n_nodes = _n_nodes()
+    assert run_cell(code) == 1
+    assert _n_nodes() > n_nodes
+
+
 @pytest.fixture
 def ip():
     """
@@ -178,3 +222,69 @@ def _run_cell(ip: InteractiveShell, cell: str) -> object:
 @pytest.fixture
 def run_cell(ip_traced: InteractiveShell) -> Callable[[str], object]:
     return functools.partial(_run_cell, ip_traced)
+
+
+@pytest.fixture
+def rendered_svgs(monkeypatch):
+    """
+    Record the graphs rendered by the live visualization, returning their
+    source instead of laying them out.
+    """
+    from lineapy.visualizer import live
+
+    rendered = []
+
+    def render_svg(dot):
+        rendered.append(dot.source)
+        return dot.source
+
+    monkeypatch.setattr(live, "render_svg", render_svg)
+    return rendered
+
+
+def test_visualize_live_only_renders_changed_cells(run_cell, rendered_svgs):
+    assert run_cell("x = [1]") is None
+    assert run_cell("lineapy.visualize(live=True)") is None
+    assert isinstance(ipython.STATE, ipython.CellsExecutedState)
+    live_visualizer = ipython.STATE.live_visualizer
+    assert live_visualizer is not None
+    assert rendered_svgs
+
+    # The display is only updated with a frontend, so render it directly,
+    # first to add the rest of the cell which started the visualization
+    live_visualizer.render_svgs()
+    rendered_svgs.clear()
+    assert run_cell("y = x + [2]") is None
+    live_visualizer.render_svgs()
+    # Only the new cell is laid out, with `x` repeated from the first cell
+    [svg] = rendered_svgs
+    assert "y = x + [2]" in svg
+    assert "x = [1]" not in svg
+
+    rendered_svgs.clear()
+    assert run_cell("x = 10") is None
+    live_visualizer.render_svgs()
+    # The first cell is laid out again, since `x` no longer points to it
+    assert len(rendered_svgs) == 2
+    assert "x = [1]" in rendered_svgs[0]
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(shutil.which("dot") is None, reason="needs graphviz")
+def test_visualize_live_benchmark(run_cell):
+    for i in range(1000):
+        run_cell(f"x{i} = [{i}]\ny{i} = x{i} + [{i}]")
+    run_cell("lineapy.visualize(live=True)")
+    assert isinstance(ipython.STATE, ipython.CellsExecutedState)
+    live_visualizer = ipython.STATE.live_visualizer
+    assert live_visualizer is not None
+    live_visualizer.render_svgs()
+
+    run_cell("z = x0 + y999")
+    start = time.perf_counter()
+    live_visualizer.render_svgs()
+    duration = time.perf_counter() - start
+    print(
+        f"live visualization of {len(live_visualizer._nodes)} nodes: "
+        f"{duration * 1000:.0f}ms to update after a cell"
+    )
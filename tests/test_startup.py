@@ -0,0 +1,115 @@
+"""
+Checks that importing lineapy and tracing the first notebook cell stay fast,
+by running them in a fresh interpreter, where nothing is imported yet.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from lineapy.db.db import ALEMBIC_DIR, RelationalLineaDB, get_alembic_head
+
+# Dependencies which are only imported once they are used
+LAZY_MODULES = [
+    "alembic",
+    "black",
+    "IPython",
+    "isort",
+    "jinja2",
+    "networkx",
+    "pandas",
+    "requests",
+]
+
+# Budgets for a cold start, in seconds, loose enough for slow CI machines
+IMPORT_BUDGET = 1.0
+FIRST_CELL_BUDGET = 2.0
+
+FIRST_CELL = """
+import time
+from IPython.core.interactiveshell import InteractiveShell
+
+ip = InteractiveShell()
+start = time.perf_counter()
+ip.run_line_magic("load_ext", "lineapy")
+ip.run_cell("x = [1, 2]\\nx.append(sum(x))", store_history=True)
+print(time.perf_counter() - start)
+"""
+
+
+def run_python(code: str, tmp_path) -> str:
+    env = dict(
+        os.environ,
+        LINEAPY_HOME_DIR=str(tmp_path),
+        LINEAPY_DATABASE_URL=f"sqlite:///{tmp_path / 'db.sqlite'}",
+        LINEAPY_DO_NOT_TRACK="true",
+    )
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        cwd=tmp_path,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def imported_modules(code: str, tmp_path) -> list:
+    return json.loads(
+        run_python(
+            code
+            + "\nimport json, sys\n"
+            + f"print(json.dumps([m for m in {LAZY_MODULES} if m in sys.modules]))",
+            tmp_path,
+        )
+    )
+
+
+def test_import_lineapy_is_lazy(tmp_path):
+    assert imported_modules("import lineapy", tmp_path) == []
+
+
+def test_alembic_skipped_when_up_to_date(tmp_path):
+    RelationalLineaDB(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    assert "alembic" not in imported_modules(
+        "from lineapy.db.db import RelationalLineaDB\n"
+        f"RelationalLineaDB('sqlite:///{tmp_path / 'db.sqlite'}')",
+        tmp_path,
+    )
+
+
+def test_get_alembic_head():
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config()
+    config.set_main_option("script_location", ALEMBIC_DIR.as_posix())
+    assert get_alembic_head(ALEMBIC_DIR / "versions") == (
+        ScriptDirectory.from_config(config).get_current_head()
+    )
+
+
+@pytest.mark.slow
+def test_startup_benchmark(tmp_path):
+    import_time = float(
+        run_python(
+            "import time\n"
+            "start = time.perf_counter()\n"
+            "import lineapy\n"
+            "print(time.perf_counter() - start)",
+            tmp_path,
+        )
+    )
+    # The database is created by the first run, so the second one opens it
+    first_cell_times = [
+        float(run_python(FIRST_CELL, tmp_path).splitlines()[-1]) for _ in range(2)
+    ]
+    print(
+        f"import lineapy: {import_time:.3f}s, "
+        f"first cell: {first_cell_times[0]:.3f}s with a new database, "
+        f"{first_cell_times[1]:.3f}s with an existing one"
+    )
+    assert import_time < IMPORT_BUDGET
+    assert max(first_cell_times) < FIRST_CELL_BUDGET
@@ -0,0 +1,273 @@
+import datetime
+import time
+from pathlib import Path
+
+import networkx as nx
+import pytest
+
+from lineapy.data.graph import Graph, SessionGraphCache
+from lineapy.data.types import (
+    CallNode,
+    ElseNode,
+    IfNode,
+    LiteralNode,
+    LookupNode,
+    PositionalArgument,
+    SessionContext,
+    SessionType,
+    SourceCode,
+    SourceLocation,
+)
+from lineapy.utils.utils import get_new_id
+
+SESSION_ID = get_new_id()
+SOURCE_CODE = SourceCode(id=get_new_id(), code="", location=Path("source.py"))
+
+
+def session_context() -> SessionContext:
+    return SessionContext(
+        id=SESSION_ID,
+        environment_type=SessionType.SCRIPT,
+        python_version="",
+        creation_time=datetime.datetime.now(),
+        working_directory="",
+        execution_id=get_new_id(),
+    )
+
+
+def location(lineno: int, col_offset: int = 0) -> SourceLocation:
+    return SourceLocation(
+        lineno=lineno,
+        col_offset=col_offset,
+        end_lineno=lineno,
+        end_col_offset=col_offset + 1,
+        source_code=SOURCE_CODE,
+    )
+
+
+def literal(lineno: int) -> LiteralNode:
+    return LiteralNode(
+        id=get_new_id(),
+        session_id=SESSION_ID,
+        value=lineno,
+        source_location=location(lineno),
+    )
+
+
+def call(function_id, *args, lineno: int) -> CallNode:
+    return CallNode(
+        id=get_new_id(),
+        session_id=SESSION_ID,
+        function_id=function_id,
+        positional_args=[PositionalArgument(id=arg) for arg in args],
+        source_location=location(lineno),
+    )
+
+
+def test_visit_order_by_line_number():
+    """
+    Nodes should be visited after their parents, and otherwise by line number,
+    with nodes without a source location first.
+    """
+    lookup = LookupNode(id=get_new_id(), session_id=SESSION_ID, name="add")
+    x = literal(1)
+    y = literal(3)
+    # On line 2 but depends on line 3, so has to come after it
+    z = call(lookup.id, x.id, y.id, lineno=2)
+    w = literal(4)
+    graph = Graph([w, z, y, x, lookup], session_context())
+    assert graph.visit_order() == [lookup, x, y, z, w]
+
+
+def test_visit_order_if_else_cycle():
+    """
+    The cycle between an if node and its else node should be broken by
+    visiting the if node first.
+    """
+    test = literal(1)
+    if_id, else_id = get_new_id(), get_new_id()
+    if_node = IfNode(
+        id=if_id,
+        session_id=SESSION_ID,
+        test_id=test.id,
+        companion_id=else_id,
+        source_location=location(1),
+    )
+    else_node = ElseNode(
+        id=else_id,
+        session_id=SESSION_ID,
+        companion_id=if_id,
+        source_location=location(3),
+    )
+    body = LiteralNode(
+        id=get_new_id(),
+        session_id=SESSION_ID,
+        value=2,
+        source_location=location(2),
+        control_dependency=if_id,
+    )
+    graph = Graph([else_node, body, if_node, test], session_context())
+    assert graph.visit_order() == [test, if_node, body, else_node]
+
+
+def test_adjacency_matches_networkx():
+    """
+    The queries served from the adjacency arrays should match networkx.
+    """
+    lookup = LookupNode(id=get_new_id(), session_id=SESSION_ID, name="add")
+    x = literal(1)
+    y = call(lookup.id, x.id, x.id, lineno=2)
+    z = call(lookup.id, x.id, y.id, lineno=3)
+    w = literal(4)
+    graph = Graph([lookup, x, y, z, w], session_context())
+    nx_graph = graph.nx_graph
+    for node in graph.nodes:
+        assert graph.get_parents(node.id) == list(nx_graph.predecessors(node.id))
+        assert graph.get_children(node.id) == list(nx_graph.successors(node.id))
+        assert set(graph.get_ancestors(node.id)) == nx.ancestors(nx_graph, node.id)
+        assert set(graph.get_descendants(node.id)) == nx.descendants(nx_graph, node.id)
+    assert graph.get_parents(y.id) == [lookup.id, x.id]
+    assert graph.get_leaf_nodes() == [z.id, w.id]
+
+    subgraph = graph.get_subgraph([x, y])
+    assert subgraph.get_parents(y.id) == [x.id]
+    assert subgraph.get_leaf_nodes() == [y.id]
+
+
+def test_memoized_closures_match_networkx():
+    """
+    Ancestors and descendants reused from earlier queries should match a fresh
+    search, including for nodes which are part of a cycle.
+    """
+    test = literal(1)
+    if_id, else_id = get_new_id(), get_new_id()
+    if_node = IfNode(
+        id=if_id, session_id=SESSION_ID, test_id=test.id, companion_id=else_id
+    )
+    else_node = ElseNode(id=else_id, session_id=SESSION_ID, companion_id=if_id)
+    lookup = LookupNode(id=get_new_id(), session_id=SESSION_ID, name="add")
+    x = call(lookup.id, test.id, lineno=2)
+    y = call(lookup.id, x.id, else_id, lineno=3)
+    z = call(lookup.id, y.id, x.id, lineno=4)
+    graph = Graph([test, if_node, else_node, lookup, x, y, z], session_context())
+    nx_graph = graph.nx_graph
+    # Query in an order that lets later queries reuse earlier ones
+    for node in [x, if_node, y, z, test, else_node]:
+        assert set(graph.get_ancestors(node.id)) == nx.ancestors(nx_graph, node.id)
+    for node in [y, x, else_node, lookup, test]:
+        assert set(graph.get_descendants(node.id)) == nx.descendants(nx_graph, node.id)
+    assert len(graph._ancestors_cache) == 6
+    assert len(graph._descendants_cache) == 5
+
+
+def test_cyclic_graph_is_tracked(monkeypatch):
+    tracked = []
+    monkeypatch.setattr("lineapy.data.graph.track", tracked.append)
+    test = literal(1)
+    if_id, else_id = get_new_id(), get_new_id()
+    if_node = IfNode(
+        id=if_id, session_id=SESSION_ID, test_id=test.id, companion_id=else_id
+    )
+    else_node = ElseNode(id=else_id, session_id=SESSION_ID, companion_id=if_id)
+
+    Graph([test], session_context())
+    assert tracked == []
+    Graph([test, if_node, else_node], session_context())
+    assert len(tracked) == 1
+
+
+class FakeDB:
+    """
+    Stands in for RelationalLineaDB, counting the sessions loaded.
+    """
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.loads = 0
+
+    def get_session_context(self, session_id):
+        return session_context()
+
+    def get_nodes_for_session(self, session_id):
+        self.loads += 1
+        return self.nodes
+
+
+def test_create_session_graph_is_cached():
+    db = FakeDB([literal(1), literal(2)])
+    graph = Graph.create_session_graph(db, SESSION_ID)
+    assert Graph.create_session_graph(db, SESSION_ID) is graph
+    assert db.loads == 1
+
+    # graphs are not shared between databases
+    other_db = FakeDB([literal(1)])
+    assert Graph.create_session_graph(other_db, SESSION_ID) is not graph
+
+
+def test_session_graph_cache_evicts_by_node_count():
+    cache = SessionGraphCache(max_nodes=3)
+    db = FakeDB([])
+    for session_id in ["a", "b"]:
+        graph, generation = cache.get(db, session_id)
+        assert graph is None
+        cache.put(
+            db,
+            session_id,
+            Graph([literal(1), literal(2)], session_context()),
+            generation,
+        )
+    # "a" was evicted to stay under 3 nodes
+    assert cache.get(db, "a")[0] is None
+    assert cache.get(db, "b")[0] is not None
+
+
+def test_session_graph_cache_invalidate():
+    cache = SessionGraphCache()
+    db = FakeDB([])
+    graph = Graph([literal(1)], session_context())
+    _, generation = cache.get(db, SESSION_ID)
+    cache.put(db, SESSION_ID, graph, generation)
+    assert cache.get(db, SESSION_ID)[0] is graph
+
+    _, generation = cache.get(db, SESSION_ID)
+    cache.invalidate(SESSION_ID)
+    assert cache.get(db, SESSION_ID)[0] is None
+
+    # a graph loaded before the session changed is not cached
+    cache.put(db, SESSION_ID, graph, generation)
+    assert cache.get(db, SESSION_ID)[0] is None
+
+
+def test_session_graph_invalidated_while_tracing(execute):
+    code = """import lineapy
+x = 1
+x_code = lineapy.save(x, "x").get_code()
+y = x + 1
+y_code = lineapy.save(y, "y").get_code()
+"""
+    res = execute(code, snapshot=False)
+    assert res.values["x_code"] == "x = 1\n"
+    assert res.values["y_code"] == "x = 1\ny = x + 1\n"
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("n_nodes", [1_000, 10_000, 100_000])
+def test_visit_order_benchmark(n_nodes):
+    """
+    Benchmark the visit order on a synthetic graph, where each line adds the
+    two previous lines, so most nodes have to wait on a parent with a later
+    line number.
+    """
+    lookup = LookupNode(id=get_new_id(), session_id=SESSION_ID, name="add")
+    nodes = [lookup, literal(1), literal(2)]
+    for lineno in range(3, n_nodes + 1):
+        nodes.append(call(lookup.id, nodes[-1].id, nodes[-2].id, lineno=lineno))
+    # Reverse, so the order the nodes are in doesn't help
+    graph = Graph(nodes[::-1], session_context())
+
+    start = time.perf_counter()
+    order = graph.visit_order()
+    duration = time.perf_counter() - start
+
+    print(f"visit_order with {n_nodes} nodes: {duration:.3f}s")
+    assert order == nodes
@@ -0,0 +1,109 @@
+from datetime import datetime
+
+import pytest
+
+from lineapy.data.types import (
+    LiteralNode,
+    NodeValue,
+    SessionType,
+    ValueType,
+)
+from lineapy.db.background_writer import BackgroundDBWriter
+from lineapy.db.db import RelationalLineaDB
+from lineapy.instrumentation.tracer import Tracer
+from lineapy.transformer.transform_code import transform
+from lineapy.utils.utils import get_new_id
+
+CODE = """x = 1
+y = [x, 2]
+y.append(3)
+z = sum(y)
+"""
+
+
+@pytest.mark.parametrize("write_behind", [False, True])
+def test_background_writer_persists_graph(db_url, tmp_path, write_behind):
+    db = RelationalLineaDB(
+        db_url, write_behind=write_behind, background_writer=True
+    )
+    tracer = Tracer(db, SessionType.SCRIPT)
+    source_path = tmp_path / "source.py"
+    source_path.write_text(CODE)
+    transform(CODE, source_path, tracer)
+
+    # Reading waits on the writer
+    graph = tracer.graph
+    assert {
+        name
+        for _, name in db.get_variables_for_session(tracer.get_session_id())
+    } == {"x", "y", "z"}
+    db.close()
+
+    other_db = RelationalLineaDB(db_url)
+    assert len(other_db.get_nodes_for_session(tracer.get_session_id())) == len(
+        graph.nodes
+    )
+
+
+def test_background_writer_keeps_main_thread_writes(db_url):
+    """
+    Writes made on the main thread while the writer thread is committing
+    nodes should not be lost.
+    """
+    db = RelationalLineaDB(db_url, background_writer=True)
+    session_id = get_new_id()
+    nodes = [
+        LiteralNode(id=get_new_id(), session_id=session_id, value=i)
+        for i in range(300)
+    ]
+    for node in nodes:
+        db.write_node(node)
+    execution_id = get_new_id()
+    now = datetime.now()
+    db.write_node_value(
+        NodeValue(
+            node_id=nodes[0].id,
+            execution_id=execution_id,
+            value="0",
+            value_type=ValueType.value,
+            start_time=now,
+            end_time=now,
+        )
+    )
+    db.flush_writes()
+    db.commit()
+    db.close()
+
+    other_db = RelationalLineaDB(db_url)
+    assert len(other_db.get_nodes_for_session(session_id)) == len(nodes)
+    assert (
+        other_db.get_node_value_from_db(nodes[0].id, execution_id) is not None
+    )
+
+
+def test_background_writer_raises_on_flush():
+    def fail():
+        raise ValueError("failed write")
+
+    writer = BackgroundDBWriter()
+    writer.submit(fail)
+    with pytest.raises(ValueError, match="failed write"):
+        writer.flush()
+    # The error is only raised once
+    writer.flush()
+    writer.close()
+
+
+def test_background_writer_error_raised_in_next_cell(tmp_path):
+    db = RelationalLineaDB("sqlite:///:memory:", background_writer=True)
+    tracer = Tracer(db, SessionType.SCRIPT)
+
+    def fail():
+        raise ValueError("failed write")
+
+    db._background_writer.submit(fail)  # type: ignore
+    db._background_writer._queue.join()  # type: ignore
+    source_path = tmp_path / "source.py"
+    source_path.write_text(CODE)
+    with pytest.raises(ValueError, match="failed write"):
+        transform(CODE, source_path, tracer)
@@ -0,0 +1,109 @@
+import time
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from lineapy.api.models.linea_artifact_store import LineaArtifactStore
+from lineapy.data.types import LiteralType, NodeType, SessionType
+from lineapy.db.db import RelationalLineaDB
+from lineapy.db.relational import (
+    ArtifactORM,
+    BaseNodeORM,
+    ExecutionORM,
+    LiteralNodeORM,
+    SessionContextORM,
+)
+
+N_SESSIONS = 1000
+NODES_PER_SESSION = 100
+ARTIFACTS_PER_SESSION = 10
+
+
+def populate(db: RelationalLineaDB) -> None:
+    """
+    Bulk insert 100k literal nodes and 10k artifacts, spread over 1k
+    sessions.
+    """
+    now = datetime.now()
+    sessions, nodes, literals, artifacts = [], [], [], []
+    for s in range(N_SESSIONS):
+        sessions.append(
+            dict(
+                id=f"session-{s}",
+                environment_type=SessionType.SCRIPT,
+                creation_time=now,
+                working_directory="",
+                execution_id="execution",
+            )
+        )
+        for n in range(NODES_PER_SESSION):
+            node_id = f"node-{s}-{n}"
+            nodes.append(
+                dict(
+                    id=node_id,
+                    session_id=f"session-{s}",
+                    node_type=NodeType.LiteralNode,
+                )
+            )
+            literals.append(
+                dict(id=node_id, value_type=LiteralType.Integer, value=str(n))
+            )
+        for a in range(ARTIFACTS_PER_SESSION):
+            artifacts.append(
+                dict(
+                    node_id=f"node-{s}-{a}",
+                    execution_id="execution",
+                    name=f"artifact-{s}",
+                    version=a,
+                    date_created=now,
+                )
+            )
+
+    with db.engine.begin() as conn:
+        conn.execute(ExecutionORM.__table__.insert(), [dict(id="execution")])
+        conn.execute(SessionContextORM.__table__.insert(), sessions)
+        conn.execute(BaseNodeORM.__table__.insert(), nodes)
+        conn.execute(LiteralNodeORM.__table__.insert(), literals)
+        conn.execute(ArtifactORM.__table__.insert(), artifacts)
+
+
+def time_queries(db: RelationalLineaDB):
+    def timed(f, repeat=20):
+        if repeat > 1:
+            # warm up
+            f(repeat)
+        start = time.perf_counter()
+        for i in range(repeat):
+            f(i)
+        return (time.perf_counter() - start) / repeat
+
+    session = lambda i: f"session-{i * 37 % N_SESSIONS}"
+    return {
+        "get": timed(
+            lambda i: db.get_artifactorm_by_name(f"artifact-{i * 37 % N_SESSIONS}")
+        ),
+        "latest_version": timed(
+            lambda i: db.get_latest_artifact_version(f"artifact-{i * 37 % N_SESSIONS}")
+        ),
+        "nodes_for_session": timed(lambda i: db.get_nodes_for_session(session(i))),
+        "catalog": timed(lambda i: LineaArtifactStore(db), repeat=1),
+    }
+
+
+@pytest.mark.slow
+def test_db_query_benchmark(tmp_path):
+    db = RelationalLineaDB(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    populate(db)
+    with_indexes = time_queries(db)
+
+    with db.engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_node_session_id"))
+    db.session.expunge_all()
+    without_indexes = time_queries(db)
+
+    for name, duration in with_indexes.items():
+        print(
+            f"{name}: {without_indexes[name] * 1000:.2f}ms without indexes, "
+            f"{duration * 1000:.2f}ms with indexes"
+        )
@@ -0,0 +1,98 @@
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+
+from lineapy.data.types import SessionType
+from lineapy.db.db import RelationalLineaDB
+from lineapy.instrumentation.tracer import Tracer
+from lineapy.transformer.transform_code import transform
+
+
+def trace(db_url, tmp_path, code):
+    db = RelationalLineaDB(db_url)
+    tracer = Tracer(db, SessionType.SCRIPT)
+    source_path = tmp_path / "source.py"
+    source_path.write_text(code)
+    transform(code, Path(source_path), tracer)
+    db.commit()
+    return tracer
+
+
+def repeated_code(n: int) -> str:
+    return "import math\nx = [1]\n" + "".join(
+        f"y{i} = math.floor(sum(x), *[]) + {i}\n"
+        f"x.append(y{i})\n"
+        f"z = dict(a=y{i})\n"
+        for i in range(n)
+    )
+
+
+def load_nodes(db_url, session_id):
+    """
+    Load the session's nodes from a new connection, so none of them are
+    cached in the session, returning them and the number of queries run.
+    """
+    db = RelationalLineaDB(db_url)
+    queries = 0
+
+    def count(*args):
+        nonlocal queries
+        queries += 1
+
+    event.listen(db.engine, "before_cursor_execute", count)
+    nodes = db.get_nodes_for_session(session_id)
+    event.remove(db.engine, "before_cursor_execute", count)
+    return nodes, queries
+
+
+def test_get_nodes_for_session_matches_traced_graph(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'db.sqlite'}"
+    tracer = trace(db_url, tmp_path, repeated_code(5))
+    nodes, _ = load_nodes(db_url, tracer.get_session_id())
+
+    assert sorted(nodes, key=lambda n: n.id) == sorted(
+        tracer.graph.nodes, key=lambda n: n.id
+    )
+
+
+def test_get_nodes_for_session_shares_source_code(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'db.sqlite'}"
+    tracer = trace(db_url, tmp_path, repeated_code(5))
+    nodes, _ = load_nodes(db_url, tracer.get_session_id())
+
+    source_codes = {
+        id(node.source_location.source_code)
+        for node in nodes
+        if node.source_location is not None
+    }
+    assert len(source_codes) == 1
+
+
+def test_get_nodes_for_session_query_count(tmp_path):
+    """
+    The number of queries should not grow with the number of nodes.
+    """
+    counts = []
+    for n in [1, 20]:
+        db_url = f"sqlite:///{tmp_path / f'db_{n}.sqlite'}"
+        tracer = trace(db_url, tmp_path, repeated_code(n))
+        _, queries = load_nodes(db_url, tracer.get_session_id())
+        counts.append(queries)
+    assert counts[0] == counts[1]
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("n", [100, 300])
+def test_get_nodes_for_session_benchmark(tmp_path, n):
+    db_url = f"sqlite:///{tmp_path / 'db.sqlite'}"
+    tracer = trace(db_url, tmp_path, repeated_code(n))
+
+    start = time.perf_counter()
+    nodes, queries = load_nodes(db_url, tracer.get_session_id())
+    duration = time.perf_counter() - start
+    print(
+        f"get_nodes_for_session: {len(nodes)} nodes in {queries} queries, "
+        f"{duration:.3f}s"
+    )
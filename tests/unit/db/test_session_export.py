@@ -0,0 +1,122 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from lineapy.data.graph import Graph
+from lineapy.data.types import SessionType
+from lineapy.db.db import RelationalLineaDB
+from lineapy.instrumentation.tracer import Tracer
+from lineapy.transformer.transform_code import transform
+
+pytest.importorskip("msgpack")
+
+from lineapy.db.session_export import (  # noqa: E402
+    export_session,
+    import_session,
+    load_session_export,
+)
+
+CODE = """import lineapy
+import math
+x = [1]
+if x:
+    x.append(2)
+y = math.floor(sum(x), *[]) + 0.5
+z = dict(a=[y, b"bytes", None])
+lineapy.save(z, "z")
+"""
+
+
+def trace(db_url, tmp_path, code):
+    db = RelationalLineaDB(db_url)
+    tracer = Tracer(db, SessionType.SCRIPT)
+    source_path = tmp_path / "source.py"
+    source_path.write_text(code)
+    transform(code, Path(source_path), tracer)
+    db.commit()
+    return db, tracer
+
+
+def sorted_nodes(nodes):
+    return sorted(nodes, key=lambda n: n.id)
+
+
+def test_load_session_export_matches_db(tmp_path):
+    db, tracer = trace(f"sqlite:///{tmp_path / 'db.sqlite'}", tmp_path, CODE)
+    session_id = tracer.get_session_id()
+    export_session(db, session_id, tmp_path / "session.linea")
+
+    export = load_session_export(tmp_path / "session.linea")
+    assert export.session_context == db.get_session_context(session_id)
+    assert sorted_nodes(export.graph.nodes) == sorted_nodes(
+        db.get_nodes_for_session(session_id)
+    )
+    assert export.variables == db.get_variables_for_session(session_id)
+    assert [(a.name, a.version) for a in export.artifacts] == [("z", 0)]
+    assert [v.node_id for v in export.node_values] == [export.artifacts[0].node_id]
+
+
+def test_import_session(tmp_path):
+    db, tracer = trace(f"sqlite:///{tmp_path / 'db.sqlite'}", tmp_path, CODE)
+    session_id = tracer.get_session_id()
+    export_session(db, session_id, tmp_path / "session.linea")
+
+    other_db = RelationalLineaDB(f"sqlite:///{tmp_path / 'other.sqlite'}")
+    import_session(other_db, tmp_path / "session.linea")
+    assert sorted_nodes(other_db.get_nodes_for_session(session_id)) == (
+        sorted_nodes(db.get_nodes_for_session(session_id))
+    )
+    assert other_db.get_variables_for_session(
+        session_id
+    ) == db.get_variables_for_session(session_id)
+    artifact = db.get_artifactorm_by_name("z")
+    assert other_db.get_artifactorm_by_name("z").node_id == artifact.node_id
+    assert other_db.get_node_value_path(
+        artifact.node_id, artifact.execution_id
+    ) == db.get_node_value_path(artifact.node_id, artifact.execution_id)
+
+    with pytest.raises(ValueError):
+        import_session(other_db, tmp_path / "session.linea")
+
+
+def test_import_session_bumps_taken_artifact_versions(tmp_path):
+    db, tracer = trace(f"sqlite:///{tmp_path / 'db.sqlite'}", tmp_path, CODE)
+    export_session(db, tracer.get_session_id(), tmp_path / "session.linea")
+
+    other_db, _ = trace(f"sqlite:///{tmp_path / 'other.sqlite'}", tmp_path, CODE)
+    export = import_session(other_db, tmp_path / "session.linea")
+    assert [(a.name, a.version) for a in export.artifacts] == [("z", 1)]
+    assert other_db.get_latest_artifact_version("z") == 1
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("n", [100, 300])
+def test_load_session_export_benchmark(tmp_path, n):
+    code = "import math\nx = [1]\n" + "".join(
+        f"y{i} = math.floor(sum(x), *[]) + {i}\n"
+        f"x.append(y{i})\n"
+        f"z = dict(a=y{i})\n"
+        for i in range(n)
+    )
+    db_url = f"sqlite:///{tmp_path / 'db.sqlite'}"
+    db, tracer = trace(db_url, tmp_path, code)
+    session_id = tracer.get_session_id()
+    export_session(db, session_id, tmp_path / "session.linea")
+
+    start = time.perf_counter()
+    other_db = RelationalLineaDB(db_url)
+    Graph(
+        other_db.get_nodes_for_session(session_id),
+        other_db.get_session_context(session_id),
+    )
+    from_db = time.perf_counter() - start
+
+    start = time.perf_counter()
+    export = load_session_export(tmp_path / "session.linea")
+    from_export = time.perf_counter() - start
+    print(
+        f"{len(export.graph.nodes)} nodes: {from_db:.3f}s from the DB, "
+        f"{from_export:.3f}s from a "
+        f"{(tmp_path / 'session.linea').stat().st_size} bytes export"
+    )
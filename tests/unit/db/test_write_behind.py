@@ -0,0 +1,47 @@
+from pathlib import Path
+
+from lineapy.data.types import SessionType
+from lineapy.db.db import RelationalLineaDB
+from lineapy.instrumentation.tracer import Tracer
+from lineapy.transformer.transform_code import transform
+
+CODE = """x = 1
+y = [x, 2]
+y.append(3)
+z = sum(y)
+z = sum(y)
+"""
+
+
+def test_write_behind_persists_on_commit(db_url, tmp_path):
+    """
+    Queued writes should be readable while pending, and be visible from a
+    separate connection once the cell boundary commits them.
+    """
+    db = RelationalLineaDB(db_url, write_behind=True)
+    tracer = Tracer(db, SessionType.SCRIPT)
+    source_path = tmp_path / "source.py"
+    source_path.write_text(CODE)
+    transform(CODE, Path(source_path), tracer)
+    assert db._pending_writes == 0
+
+    session_id = tracer.get_session_id()
+    other_db = RelationalLineaDB(db_url)
+    assert len(other_db.get_nodes_for_session(session_id)) == len(
+        tracer.graph.nodes
+    )
+    assert {
+        name for _, name in other_db.get_variables_for_session(session_id)
+    } == {"x", "y", "z"}
+
+
+def test_write_behind_bounded_queue():
+    db = RelationalLineaDB(
+        "sqlite:///:memory:", write_behind=True, max_pending_writes=3
+    )
+    tracer = Tracer(db, SessionType.SCRIPT)
+    for i in range(10):
+        tracer.literal(i)
+        assert db._pending_writes < 3
+    # Pending nodes are flushed before reads
+    assert len(db.get_nodes_for_session(tracer.get_session_id())) == 10
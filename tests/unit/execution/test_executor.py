@@ -9,6 +9,7 @@ This should cover `execution/executor.py`
 """
 
 import operator
+import time
 
 from pytest import fixture, mark, param, raises
 
@@ -172,9 +173,7 @@ def test_execute_call(executor: Executor):
     Verify that executing a call will return the side effects returned by the call, the timing, and the value.
     """
     # First lookup the `neg` operator
-    executor.execute_node(
-        LookupNode(id="neg", name="neg", session_id="unused")
-    )
+    executor.execute_node(LookupNode(id="neg", name="neg", session_id="unused"))
     # Then add the 1 literal
     executor.execute_node(LiteralNode(id="one", value=1, session_id="unused"))
 
@@ -230,29 +229,21 @@ def test_execute_call_mutable_input_vars(executor: Executor):
     """
     # Create a list
     assert not list(
-        executor.execute_node(
-            LookupNode(id="l_list", name="l_list", session_id="")
-        )
+        executor.execute_node(LookupNode(id="l_list", name="l_list", session_id=""))
     )
     assert not list(
-        executor.execute_node(
-            CallNode(id="list", function_id="l_list", session_id="")
-        )
+        executor.execute_node(CallNode(id="list", function_id="l_list", session_id=""))
     )
 
     # Use exec statement to re-assign the list to another variable
     assert not list(
         executor.execute_node(
-            LookupNode(
-                id="l_exec_statement", name="l_exec_statement", session_id=""
-            )
+            LookupNode(id="l_exec_statement", name="l_exec_statement", session_id="")
         )
     )
     assert not list(
         executor.execute_node(
-            LiteralNode(
-                id="assign_str", value="x.append(10); y = x", session_id=""
-            )
+            LiteralNode(id="assign_str", value="x.append(10); y = x", session_id="")
         )
     )
 
@@ -274,6 +265,54 @@ def test_execute_call_mutable_input_vars(executor: Executor):
     ]
 
 
+def test_execute_call_unaccessed_globals_not_inspected(executor: Executor):
+    """
+    Verify that the mutability of input globals is only computed for the ones
+    which are accessed, and then reused for later calls.
+    """
+
+    class CountHashes:
+        n_hashes = 0
+
+        def __hash__(self):
+            CountHashes.n_hashes += 1
+            return 0
+
+    executor._id_to_value[LineaID("counter")] = CountHashes()
+    executor.execute_node(LookupNode(id="l_list", name="l_list", session_id=""))
+    for i in range(3):
+        executor.execute_node(
+            CallNode(id=f"list_{i}", function_id="l_list", session_id=""),
+            {"counter": LineaID("counter")},
+        )
+    assert CountHashes.n_hashes == 0
+    assert executor._id_to_mutable == {}
+
+
+@mark.slow
+@mark.parametrize("n_globals", [0, 10, 100, 1000])
+def test_execute_call_overhead_benchmark(executor: Executor, n_globals):
+    """
+    Benchmark the per call overhead of setting up the execution context, with
+    a number of large immutable globals in scope which the call doesn't use.
+    """
+    executor.execute_node(LookupNode(id="l_list", name="l_list", session_id=""))
+    variables = {}
+    for i in range(n_globals):
+        executor._id_to_value[LineaID(f"value_{i}")] = tuple(range(1000))
+        variables[f"v_{i}"] = LineaID(f"value_{i}")
+
+    n_calls = 1000
+    node = CallNode(id="list", function_id="l_list", session_id="")
+    start = time.perf_counter()
+    for _ in range(n_calls):
+        executor.execute_node(node, variables)
+    duration = time.perf_counter() - start
+    print(
+        f"call overhead with {n_globals} globals: " f"{duration / n_calls * 1e6:.1f}us"
+    )
+
+
 # TODO
 def test_execute_call_immutable_input_vars(executor: Executor):
     """
@@ -333,21 +372,15 @@ def test_execute_mutate(executor: Executor):
 
     # Create the list
     assert not list(
-        executor.execute_node(
-            LookupNode(id="l_list", name="l_list", session_id="")
-        )
+        executor.execute_node(LookupNode(id="l_list", name="l_list", session_id=""))
     )
     assert not list(
-        executor.execute_node(
-            CallNode(id="list", function_id="l_list", session_id="")
-        )
+        executor.execute_node(CallNode(id="list", function_id="l_list", session_id=""))
     )
 
     # Get the append method
     assert not list(
-        executor.execute_node(
-            LookupNode(id="getattr", name="getattr", session_id="")
-        )
+        executor.execute_node(LookupNode(id="getattr", name="getattr", session_id=""))
     )
     assert not list(
         executor.execute_node(
@@ -419,9 +452,7 @@ def test_execute_global(executor: Executor):
     # Use exec statement to execute assigning a variable, then grabbing it
     assert not list(
         executor.execute_node(
-            LookupNode(
-                id="l_exec_statement", name="l_exec_statement", session_id=""
-            )
+            LookupNode(id="l_exec_statement", name="l_exec_statement", session_id="")
         )
     )
     assert not list(
@@ -448,9 +479,9 @@ def test_execute_global(executor: Executor):
         )
     )
     # Verify it has same timing as parent and has value
-    assert executor.get_execution_time(
-        LineaID("x")
-    ) == executor.get_execution_time(LineaID("assign_call"))
+    assert executor.get_execution_time(LineaID("x")) == executor.get_execution_time(
+        LineaID("assign_call")
+    )
     assert executor.get_value(LineaID("x")) == 1
 
 
@@ -464,3 +495,68 @@ def test_execute_node_includes_source_location(executor: Executor):
 
 
 # TOOD: Add tests for returning external state! many if statements here...
+
+
+PARALLEL_CODE = """import time
+x = [1]
+a = time.sleep(0.2)
+b = time.sleep(0.2)
+n = len(x)
+x.append(2)
+"""
+
+
+def test_execute_graph_parallel(execute, linea_db):
+    """
+    Verify that independent calls are executed at the same time, and that the
+    values are the same as when executing sequentially.
+    """
+    tracer = execute(PARALLEL_CODE, snapshot=False)
+    executor = Executor(db=linea_db, _globals=globals())
+    executor.execute_graph(tracer.graph, parallel=True)
+
+    def get_value(name):
+        node_id = tracer.variable_name_to_node[name].id
+        return executor.get_value(
+            tracer.mutation_tracker.get_latest_mutate_node(node_id)
+        )
+
+    assert get_value("x") == [1, 2]
+    # `len(x)` is executed before `x.append(2)`, since it reads `x` first
+    assert get_value("n") == 1
+
+    a_start, a_end = executor.get_execution_time(tracer.variable_name_to_node["a"].id)
+    b_start, b_end = executor.get_execution_time(tracer.variable_name_to_node["b"].id)
+    assert a_start < b_end and b_start < a_end
+
+
+def test_execute_graph_parallel_exception(execute, linea_db):
+    """
+    Verify that an exception raised by a call on the thread pool is raised
+    as a user exception.
+    """
+    tracer = execute('x = int("1")\n', snapshot=False)
+    node = tracer.variable_name_to_node["x"]
+    executor = Executor(db=linea_db, _globals=globals())
+    executor._id_to_value[node.function_id] = int
+    executor._id_to_value[node.positional_args[0].id] = "a"
+    with raises(UserException):
+        executor.execute_graph(tracer.graph.get_subgraph([node]), parallel=True)
+
+
+@mark.slow
+def test_execute_graph_parallel_benchmark(execute, linea_db):
+    """
+    Benchmark re-executing a wide graph, of independent calls which release
+    the GIL, sequentially and in parallel.
+    """
+    code = "import numpy as np\nm = np.ones((500, 500))\n" + "".join(
+        f"s{i} = np.linalg.svd(m)\n" for i in range(16)
+    )
+    tracer = execute(code, snapshot=False)
+    for parallel in [False, True]:
+        executor = Executor(db=linea_db, _globals=globals())
+        start = time.perf_counter()
+        executor.execute_graph(tracer.graph, parallel=parallel)
+        duration = time.perf_counter() - start
+        print(f"execute_graph(parallel={parallel}): {duration:.3f}s")
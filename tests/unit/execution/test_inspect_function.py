@@ -1,10 +1,14 @@
 """
 Tests FunctionInspector().inspect to verify the right side effects are the same.
 """
+import sys
+from abc import ABC
+from dataclasses import dataclass
 from operator import setitem
 from pickle import dump
 from tempfile import NamedTemporaryFile
-from types import SimpleNamespace
+from types import ModuleType, SimpleNamespace
+from unittest.mock import Mock
 
 import numpy
 import pandas
@@ -13,9 +17,15 @@ from pytest import fixture, mark, param
 from sklearn.ensemble import RandomForestClassifier
 from sqlalchemy import create_engine
 
-from lineapy.execution.inspect_function import FunctionInspector
+from lineapy.execution.inspect_function import (
+    FunctionInspector,
+    FunctionInspectorParsed,
+    is_mutable,
+)
 from lineapy.instrumentation.annotation_spec import (
+    Annotation,
     BoundSelfOfFunction,
+    ClassMethodName,
     ExternalState,
     ImplicitDependencyValue,
     MutatedValue,
@@ -196,3 +206,108 @@ def test_inspect(
 @fixture(scope="session")
 def function_inspector():
     return FunctionInspector()
+
+
+class Annotated:
+    def mutate(self):
+        pass
+
+
+class AnnotatedChild(Annotated):
+    pass
+
+
+class AnnotatedABC(ABC):
+    def mutate(self):
+        pass
+
+
+class Registered:
+    def mutate(self):
+        pass
+
+
+AnnotatedABC.register(Registered)
+
+
+def test_inspect_method_of_subclass():
+    parsed = FunctionInspectorParsed()
+    mutated_self = [
+        MutatedValue(mutated_value=BoundSelfOfFunction(self_ref="SELF_REF"))
+    ]
+    parsed.add_annotations(
+        SimpleNamespace(Annotated=Annotated, AnnotatedABC=AnnotatedABC),  # type: ignore
+        [
+            Annotation(
+                criteria=ClassMethodName(
+                    class_instance=class_name, class_method_name="mutate"
+                ),
+                side_effects=mutated_self,
+            )
+            for class_name in ("Annotated", "AnnotatedABC")
+        ],
+    )
+    assert parsed.inspect(AnnotatedChild().mutate, {}) == mutated_self
+    # Classes registered with an abstract base class are matched as well
+    assert parsed.inspect(Registered().mutate, {}) == mutated_self
+    assert parsed.inspect(SimpleNamespace(mutate=len).mutate, {}) is None
+    # The side effects are resolved once per type
+    assert parsed.method_dispatch_cache[(AnnotatedChild, "mutate")] == (
+        mutated_self
+    )
+
+
+def test_inspect_parses_specs_once_modules_imported(monkeypatch):
+    function_inspector = FunctionInspector()
+    parse = Mock(wraps=function_inspector._parse)
+    monkeypatch.setattr(function_inspector, "_parse", parse)
+    list(function_inspector.inspect(len, [[]], {}, 0))
+    assert parse.call_count == 0
+    monkeypatch.setitem(sys.modules, "imported_module", ModuleType("m"))
+    list(function_inspector.inspect(len, [[]], {}, 0))
+    list(function_inspector.inspect(len, [[]], {}, 0))
+    assert parse.call_count == 1
+
+
+@dataclass(frozen=True)
+class Frozen:
+    value: object
+
+
+class HashedByValue:
+    def __init__(self):
+        self.n_hashes = 0
+
+    def __hash__(self):
+        self.n_hashes += 1
+        return 0
+
+
+@mark.parametrize(
+    "obj,mutable",
+    [
+        param(1, False, id="int"),
+        param("a" * 1_000_000, False, id="str"),
+        param(frozenset(range(10)), False, id="frozenset"),
+        param(None, False, id="none"),
+        param(object(), False, id="object"),
+        param([], True, id="list"),
+        param({}, True, id="dict"),
+        param(ModuleType("m"), True, id="module"),
+        param(int, True, id="type"),
+        param(iter([]), True, id="iterator"),
+        param(RandomForestClassifier(), True, id="estimator"),
+        param((1, 2), False, id="tuple"),
+        param((1, []), True, id="tuple with list"),
+        param(Frozen(1), False, id="frozen dataclass"),
+        param(Frozen([]), True, id="frozen dataclass with list"),
+    ],
+)
+def test_is_mutable(obj, mutable):
+    assert is_mutable(obj) == mutable
+
+
+def test_is_mutable_hashes_objects_with_custom_hash():
+    obj = HashedByValue()
+    assert not is_mutable(obj)
+    assert obj.n_hashes == 1
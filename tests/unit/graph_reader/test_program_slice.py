@@ -106,3 +106,42 @@ def test_include_dependencies_for_indirectly_included_nodes_in_slice_recursive()
         graph, ancestors
     )
     assert ancestors == {"1", "2", "3", "4", "5", "6"}
+
+
+def test_include_dependencies_for_indirectly_included_nodes_multiline():
+    mocked_session = MagicMock()
+    # Graph being tested:
+    #
+    # line 1:   Instruction 1
+    # line 2:   Instruction 2 (
+    # line 3:   ); Instruction 3
+    # line 4:   Instruction 4
+    #
+    # Slice on Instruction 4
+    #
+    # Instruction 4 depends on Instruction 2, Instruction 3 depends on
+    # Instruction 1
+    #
+    # Instruction 2 spans lines 2 and 3, so Instruction 3 has to be included
+    # since it shares line 3, which in turn pulls in Instruction 1.
+    multiline_node = get_dummy_node("2", 2, None)
+    multiline_node.source_location.end_lineno = 3
+    nodes = [
+        get_dummy_node("1", 1, None),
+        multiline_node,
+        get_dummy_node("3", 3, "1"),
+        get_dummy_node("4", 4, "2"),
+    ]
+    graph = Graph(list(nodes), mocked_session)
+    ancestors = get_subgraph_nodelist(graph, [LineaID("4")], False)
+    assert ancestors == {"2", "4"}
+    ancestors = _include_dependencies_for_indirectly_included_nodes_in_slice(
+        graph, ancestors
+    )
+    assert ancestors == {"1", "2", "3", "4"}
+    assert graph.get_line_index()[source_1] == {
+        1: ["1"],
+        2: ["2"],
+        3: ["2", "3"],
+        4: ["4"],
+    }
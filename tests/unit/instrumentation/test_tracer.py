@@ -1,3 +1,5 @@
+from pathlib import Path
+
 from pytest import fixture
 
 from lineapy.data.types import (
@@ -11,6 +13,8 @@ from lineapy.data.types import (
     SessionType,
 )
 from lineapy.instrumentation.tracer import Tracer
+from lineapy.transformer.transform_code import transform
+from lineapy.utils.config import options
 from lineapy.utils.utils import get_new_id
 
 
@@ -121,3 +125,54 @@ def test_control_node_else(tracer: Tracer):
         get_new_id(),
     )
     assert isinstance(context.control_node, ElseNode)
+
+
+RELEASE_CODE = """a = [1, 2]
+b = sum([3, 4])
+append = a.append
+c = [a]
+append(3)
+a.append(4)
+d = len(c[0])
+"""
+
+
+def trace_code(tracer: Tracer, tmp_path, code: str) -> None:
+    source_path = tmp_path / "source.py"
+    source_path.write_text(code)
+    transform(code, Path(source_path), tracer)
+
+
+def test_release_unreachable_values(tracer: Tracer, tmp_path):
+    options.set("release_unreachable_values", True)
+    try:
+        trace_code(tracer, tmp_path, RELEASE_CODE)
+    finally:
+        options.set("release_unreachable_values", False)
+
+    # mutating through the bound method and the view still worked
+    assert tracer.values["c"] == [[1, 2, 3, 4]]
+    assert tracer.values["d"] == 4
+    # the intermediate list was released
+    assert [3, 4] not in tracer.executor._id_to_value.values()
+
+
+def test_release_unreachable_values_disabled(tracer: Tracer, tmp_path):
+    trace_code(tracer, tmp_path, RELEASE_CODE)
+    assert [3, 4] in tracer.executor._id_to_value.values()
+
+
+def test_release_unreachable_values_keeps_last_statement(
+    tracer: Tracer, tmp_path
+):
+    options.set("release_unreachable_values", True)
+    try:
+        trace_code(tracer, tmp_path, "x = 1\nx + 1\n")
+        trace_code(tracer, tmp_path, "y = x + 10\ny * 3\n")
+    finally:
+        options.set("release_unreachable_values", False)
+
+    # the result of the last statement is still there to display it
+    assert 33 in tracer.executor._id_to_value.values()
+    # but the one of the previous cell was released
+    assert 2 not in tracer.executor._id_to_value.values()
@@ -1,5 +1,8 @@
+from alembic import command
 from sqlalchemy import text
 
+from lineapy.db.relational import Base
+
 
 def test_38d5f834d3b7_orig(alembic_engine, alembic_runner):
     alembic_runner.migrate_up_to("38d5f834d3b7")
@@ -32,3 +35,35 @@ def test_38d5f834d3b7_orig(alembic_engine, alembic_runner):
                 "SELECT 1 FROM PRAGMA_TABLE_INFO('session_context') WHERE name='python_version';"
             )
         ).fetchall() == [(1,)]
+
+
+def session_indexes(conn):
+    return {
+        name
+        for (name,) in conn.execute(
+            text(
+                "SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'ix_%'"
+            )
+        )
+    }
+
+
+def test_9c7e5a3b1f24_session_indexes(alembic_engine, alembic_config):
+    # Earlier migrations can't all run on sqlite, so start from the current
+    # schema without the indexes, at the previous revision
+    Base.metadata.create_all(alembic_engine)
+    with alembic_engine.begin() as conn:
+        for name in session_indexes(conn):
+            conn.execute(text(f"DROP INDEX {name}"))
+    command.stamp(alembic_config, "07d0db31e15f")
+
+    command.upgrade(alembic_config, "9c7e5a3b1f24")
+    with alembic_engine.connect() as conn:
+        assert session_indexes(conn) == {
+            "ix_node_session_id",
+            "ix_source_code_jupyter_session_id_execution_count",
+        }
+
+    command.downgrade(alembic_config, "07d0db31e15f")
+    with alembic_engine.connect() as conn:
+        assert session_indexes(conn) == set()
@@ -1,6 +1,8 @@
 import operator
+import time
 from collections import Counter
 from dataclasses import dataclass
+from dis import findlinestarts
 from sys import version_info
 from tempfile import NamedTemporaryFile
 from types import FunctionType, SimpleNamespace, TracebackType
@@ -10,6 +12,7 @@ import numpy
 import pytest
 
 from lineapy.system_tracing.exec_and_record_function_calls import (
+    compile_traced_code,
     exec_and_record_function_calls,
 )
 from lineapy.system_tracing.function_call import FunctionCall
@@ -90,6 +93,8 @@ class ContextManager:
 large_for_loop_code = "for _ in x:\n  i = 1\n" + "  j = i\n" * 200
 
 PYTHON_39 = version_info >= (3, 9)
+# Python 3.12+ inlines comprehensions instead of calling a function
+PYTHON_312 = version_info >= (3, 12)
 
 # # Add this mark to bytecode ops which were removed in 3.9
 # removed_in_39 = pytest.mark.skipif(version_info > (3, 8))
@@ -354,11 +359,17 @@ PYTHON_39 = version_info >= (3, 9)
                 FunctionCall(l_set, [], res={1}),
                 FunctionCall(next, [is_list_iter], {}, 1),
                 FunctionCall(IsMethod({1}.add), [1]),
-                # This last call is to the function made internally by Python for the list iterator
-                FunctionCall(
-                    IsInstance(FunctionType), [is_list_iter], res={1}
-                ),
-            ],
+            ]
+            + (
+                []
+                if PYTHON_312
+                else [
+                    # This last call is to the function made internally by Python for the list iterator
+                    FunctionCall(
+                        IsInstance(FunctionType), [is_list_iter], res={1}
+                    ),
+                ]
+            ),
             id="SET_ADD",
         ),
         pytest.param(
@@ -370,11 +381,17 @@ PYTHON_39 = version_info >= (3, 9)
                 # First iteration
                 FunctionCall(next, [is_list_iter], {}, 1),
                 FunctionCall(IsMethod([1, 2].append), [1]),
-                # This last call is to the function made internally by Python for the list iterator
-                FunctionCall(
-                    IsInstance(FunctionType), [is_list_iter], res=[1, 2]
-                ),
-            ],
+            ]
+            + (
+                []
+                if PYTHON_312
+                else [
+                    # This last call is to the function made internally by Python for the list iterator
+                    FunctionCall(
+                        IsInstance(FunctionType), [is_list_iter], res=[1, 2]
+                    ),
+                ]
+            ),
             id="LIST_APPEND",
         ),
         pytest.param(
@@ -388,11 +405,17 @@ PYTHON_39 = version_info >= (3, 9)
                 FunctionCall(next, [is_list_iter], {}, 1),
                 FunctionCall(operator.add, [1, 1], res=2),
                 FunctionCall(operator.setitem, [{1: 2}, 1, 2]),
-                # Cleanup
-                FunctionCall(
-                    IsInstance(FunctionType), [is_list_iter], res={1: 2}
-                ),
-            ],
+            ]
+            + (
+                []
+                if PYTHON_312
+                else [
+                    # Cleanup
+                    FunctionCall(
+                        IsInstance(FunctionType), [is_list_iter], res={1: 2}
+                    ),
+                ]
+            ),
             id="MAP_ADD",
         ),
         pytest.param(
@@ -636,6 +659,12 @@ PYTHON_39 = version_info >= (3, 9)
             ],
             id="CALL_FUNCTION_EX_**",
         ),
+        pytest.param(
+            "f(*x)",
+            {"f": operator.add, "x": x_global},
+            [FunctionCall(operator.add, [1, 2], res=3)],
+            id="CALL_FUNCTION_EX positional",
+        ),
         pytest.param(
             "f.a()",
             {"f": method_property},
@@ -670,6 +699,40 @@ PYTHON_39 = version_info >= (3, 9)
             ],
             id="BUILD_SLICE 3",
         ),
+        pytest.param(
+            "x[0:2] = y",
+            {"x": [1, 2], "y": [3]},
+            [
+                FunctionCall(slice, [0, 2], res=slice(0, 2)),
+                FunctionCall(operator.setitem, [[3], slice(0, 2), [3]]),
+            ],
+            id="STORE_SLICE",
+        ),
+        pytest.param(
+            "for x in y:\n  z = f(x) if x else g(x)",
+            {"y": [1, 0], "f": operator.neg, "g": operator.pos},
+            [
+                FunctionCall(iter, [[1, 0]], res=is_list_iter),
+                FunctionCall(next, [is_list_iter], res=1),
+                FunctionCall(operator.neg, [1], res=-1),
+                # The call is recorded with its result, even though the next
+                # instruction was already traced in the first iteration
+                FunctionCall(operator.pos, [0], res=0),
+            ],
+            id="branches joining in a loop",
+        ),
+        pytest.param(
+            "for x in y:\n  f(x)\nz = g(x)",
+            {"y": [1, 2], "f": operator.neg, "g": operator.pos},
+            [
+                FunctionCall(iter, [[1, 2]], res=is_list_iter),
+                FunctionCall(next, [is_list_iter], res=1),
+                FunctionCall(operator.neg, [1], res=-1),
+                # The code is still traced after the loop, until this call
+                FunctionCall(operator.pos, [2], res=2),
+            ],
+            id="call after a loop",
+        ),
         pytest.param(
             "f'{x}'",
             {"x": "x"},
@@ -724,3 +787,75 @@ def test_exec_and_record_function_calls(
     trace_fn = exec_and_record_function_calls(code, globals_)
     assert not trace_fn.not_implemented_ops
     assert function_calls == trace_fn.function_calls
+
+
+def test_compile_traced_code_cached():
+    code, code_instructions = compile_traced_code("x = f(y)", "file.py", 3)
+    # The code is padded so that its line numbers match the file
+    assert [line for _, line in findlinestarts(code)][-1] == 3
+    assert compile_traced_code("x = f(y)", "file.py", 3) == (
+        code,
+        code_instructions,
+    )
+    assert compile_traced_code("x = f(y)", "file.py", 4)[0] is not code
+
+
+def test_exec_and_record_function_calls_reuses_instructions():
+    code, code_instructions = compile_traced_code(
+        "for x in y:\n  z = f(x)", "", 1
+    )
+    function_calls = [
+        FunctionCall(iter, [[1, 2]], res=is_list_iter),
+        FunctionCall(next, [is_list_iter], res=1),
+        FunctionCall(operator.neg, [1], res=-1),
+    ]
+    # Each run traces all the instructions again
+    for _ in range(2):
+        trace_fn = exec_and_record_function_calls(
+            code, {"y": [1, 2], "f": operator.neg}, code_instructions
+        )
+        assert trace_fn.code_instructions is code_instructions
+        assert function_calls == trace_fn.function_calls
+
+
+@pytest.mark.slow
+def test_exec_and_record_function_calls_loop_benchmark():
+    code = compile("total = 0\nfor row in rows:\n    total += row", "", "exec")
+    rows = list(range(1_000_000))
+
+    start = time.perf_counter()
+    exec(code, {"rows": rows})
+    native = time.perf_counter() - start
+
+    start = time.perf_counter()
+    trace_fn = exec_and_record_function_calls(code, {"rows": rows})
+    traced = time.perf_counter() - start
+    print(f"{len(rows)} rows: {native:.3f}s native, {traced:.3f}s traced")
+    assert not trace_fn.not_implemented_ops
+    # The loop is only traced during its first iteration with sys.monitoring
+    if version_info >= (3, 12):
+        assert traced < native * 2
+
+
+@pytest.mark.slow
+def test_exec_and_record_function_calls_nested_loop_benchmark():
+    code = compile(
+        "total = 0\nfor i in range(n):\n    for j in range(n):\n        total += i * j",
+        "",
+        "exec",
+    )
+    n = 1000
+
+    start = time.perf_counter()
+    exec(code, {"n": n})
+    native = time.perf_counter() - start
+
+    start = time.perf_counter()
+    trace_fn = exec_and_record_function_calls(code, {"n": n})
+    traced = time.perf_counter() - start
+    print(f"{n}x{n} nested loop: {native:.3f}s native, {traced:.3f}s traced")
+    assert not trace_fn.not_implemented_ops
+    # Every instruction is traced during the first iterations, after which
+    # the frame runs without tracing
+    assert trace_fn.is_code_traced(code)
+    assert traced < native * 3
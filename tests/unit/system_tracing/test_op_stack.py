@@ -1,8 +1,11 @@
 import inspect
+import sys
+from collections import defaultdict
+from dis import get_instructions
 
 import pytest
 
-from lineapy.system_tracing._op_stack import OpStack
+from lineapy.system_tracing._op_stack import OpStack, stack_depths
 
 
 def test_stack_access():
@@ -11,3 +14,38 @@ def test_stack_access():
     op_stack = OpStack(f)
     with pytest.raises(IndexError):
         op_stack[-1000]
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 11), reason="only used with Python 3.11+"
+)
+def test_stack_depths():
+    code = compile(
+        "x = [a, b]\nfor i in x:\n    try:\n        f(i)\n    except E:\n        pass",
+        "",
+        "exec",
+    )
+    depths = stack_depths(code)
+    opname_to_depths = defaultdict(list)
+    for instruction in get_instructions(code):
+        opname_to_depths[instruction.opname].append(
+            depths.get(instruction.offset)
+        )
+    assert opname_to_depths["BUILD_LIST"] == [2]
+    # The iterator stays on the stack during the loop
+    assert opname_to_depths["FOR_ITER"] == [1]
+    # The exception is pushed at the start of the handler
+    assert opname_to_depths["PUSH_EXC_INFO"] == [2]
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 11), reason="only used with Python 3.11+"
+)
+def test_stack_depths_generator():
+    code = compile("(i for i in x)", "", "exec").co_consts[0]
+    depths = stack_depths(code)
+    assert [
+        depths[instruction.offset]
+        for instruction in get_instructions(code)
+        if instruction.opname == "FOR_ITER"
+    ] == [1]
@@ -15,7 +15,7 @@ from lineapy.utils.analytics.usage_tracking import (
 from lineapy.utils.config import DEVICE_ID_FILE_NAME, options
 
 
-@patch("lineapy.utils.analytics.usage_tracking.requests.post")
+@patch("requests.post")
 @patch("lineapy.utils.analytics.usage_tracking.do_not_track")
 def test_send_usage(mock_do_not_track, mock_post):
     event_properties = SaveEvent(side_effect="file_system")
@@ -28,7 +28,7 @@ def test_send_usage(mock_do_not_track, mock_post):
     assert mock_post.called
 
 
-@patch("lineapy.utils.analytics.usage_tracking.requests.post")
+@patch("requests.post")
 @patch("lineapy.utils.analytics.usage_tracking.do_not_track")
 def test_do_not_track(mock_do_not_track, mock_post):
     event_properties = SaveEvent(side_effect="file_system")
@@ -42,7 +42,7 @@ def test_do_not_track(mock_do_not_track, mock_post):
 
 
 @patch("lineapy.utils.analytics.usage_tracking.logger")
-@patch("lineapy.utils.analytics.usage_tracking.requests.post")
+@patch("requests.post")
 @patch("lineapy.utils.analytics.usage_tracking.do_not_track")
 def test_send_usage_failure(mock_do_not_track, mock_post, mock_logger):
     event_properties = SaveEvent(side_effect="file_system")
@@ -54,12 +54,10 @@ def test_send_usage_failure(mock_do_not_track, mock_post, mock_logger):
     )
     assert mock_do_not_track.called
     assert mock_post.called
-    mock_logger.debug.assert_called_with(
-        "Tracking Error: something went wrong"
-    )
+    mock_logger.debug.assert_called_with("Tracking Error: something went wrong")
 
 
-@patch("lineapy.utils.analytics.usage_tracking.requests.post")
+@patch("requests.post")
 def test_send_amplitude_event_adds_userdata(mock_post):
     _send_amplitude_event("TestEvent", {})
     expected_event_data = [